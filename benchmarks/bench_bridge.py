@@ -0,0 +1,300 @@
+"""
+Throughput and latency benchmark for AIOBridge.
+
+Measures ops/sec and latency percentiles of the bridge's methods across database
+sizes, concurrency levels and storages, and writes the results as JSON. Runs
+locally without any services:
+
+    python benchmarks/bench_bridge.py --sizes 1000,10000 --output results.json
+
+Pass `--baseline` with a previous results file to fail (exit code 1) when a
+measurement's throughput dropped by more than `--tolerance`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from importlib import metadata
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from tinydb import where
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import JSONStorage, MemoryStorage
+
+# Import the package from this checkout, whether or not it is installed.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tinybridge import AIOBridge  # noqa: E402
+from tinybridge.storages import FastJSONStorage  # noqa: E402
+
+STORAGES = ("json", "memory", "caching", "fast")
+READS = ("get", "search", "count", "contains", "all")
+WRITES = ("insert", "update")
+METHODS = READS + WRITES
+
+
+def document(i: int) -> Dict[str, Any]:
+    return {"name": f"user{i}", "group": i % 100, "active": i % 2 == 0, "score": i}
+
+
+def open_bridge(storage: str, size: int, directory: str, **options: Any) -> AIOBridge:
+    """Create a bridge on a fresh database holding `size` documents."""
+
+    data = {"_default": {str(i): document(i) for i in range(1, size + 1)}}
+    if storage == "memory":
+        bridge = AIOBridge(None, storage=MemoryStorage, **options)
+        bridge.db.storage.write(data)
+        return bridge
+
+    path = os.path.join(directory, f"{storage}-{size}.json")
+    with open(path, "w") as file:
+        json.dump(data, file)
+    if storage == "caching":
+        return AIOBridge(path, storage=CachingMiddleware(JSONStorage), **options)
+    if storage == "fast":
+        return AIOBridge(path, storage=FastJSONStorage, **options)
+    return AIOBridge(path, **options)
+
+
+def operation(
+    bridge: AIOBridge, method: str, size: int, rng: random.Random
+) -> Callable[[], Awaitable]:
+    """Return a factory of awaitables exercising `method`."""
+
+    def doc_id() -> int:
+        return rng.randint(1, size)
+
+    operations = {
+        "get": lambda: bridge.get(doc_id=doc_id()),
+        "search": lambda: bridge.search(where("group") == rng.randrange(100)),
+        "count": lambda: bridge.count(where("active") == True),
+        "contains": lambda: bridge.contains(where("name") == f"user{doc_id()}"),
+        "all": lambda: bridge.all(),
+        "insert": lambda: bridge.insert(document(size + rng.randrange(size))),
+        "update": lambda: bridge.update({"score": rng.random()}, doc_ids=[doc_id()]),
+    }
+    return operations[method]
+
+
+async def measure(
+    make: Callable[[], Awaitable], ops: int, concurrency: int
+) -> Dict[str, Any]:
+    """Run `ops` operations with `concurrency` concurrent callers."""
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = ops
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            result = await make()
+            latencies.append(time.perf_counter() - started)
+            if result.is_err():
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "ops": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "ops_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def phases(bridge: AIOBridge, method: str) -> Dict[str, Dict[str, float]]:
+    """Split the bridge's own latency statistics into lock, queue and execution."""
+
+    stats = bridge.stats.snapshot()["methods"].get(method)
+    if stats is None:
+        return {}
+    return {
+        phase: {
+            "p50_ms": stats[phase]["p50"] * 1000,
+            "p99_ms": stats[phase]["p99"] * 1000,
+        }
+        for phase in ("lock_wait", "queue", "execution")
+    }
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of sorted `values`."""
+    return values[min(len(values) - 1, max(0, round(q * len(values)) - 1))]
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        for storage in args.storages:
+            for size in args.sizes:
+                bridge = open_bridge(storage, size, directory, execution=args.execution)
+                try:
+                    # Reads first, so writes do not change what they measure.
+                    for method in sorted(args.methods, key=WRITES.__contains__):
+                        if method == "all" and size > args.all_max_size:
+                            continue
+                        ops = args.write_ops if method in WRITES else args.ops
+                        for concurrency in args.concurrency:
+                            make = operation(bridge, method, size, rng)
+                            await make()  # warm up caches
+                            bridge.stats.reset()
+                            result = await measure(make, ops, concurrency)
+                            result["phases"] = phases(bridge, method)
+                            result.update(
+                                storage=storage,
+                                size=size,
+                                concurrency=concurrency,
+                                method=method,
+                                execution=args.execution,
+                            )
+                            results.append(result)
+                            report(result)
+                finally:
+                    await bridge.close()
+    return results
+
+
+def report(result: Dict[str, Any]):
+    print(
+        "{storage:>8} {size:>8} c={concurrency:<4} {method:<9}"
+        " {ops_per_sec:>10.1f} ops/s  p50 {p50_ms:>8.3f} ms"
+        "  p99 {p99_ms:>8.3f} ms".format(**result),
+        file=sys.stderr,
+    )
+
+
+def key(result: Dict[str, Any]) -> Tuple:
+    return (
+        result["storage"],
+        result["size"],
+        result["concurrency"],
+        result["method"],
+        result.get("execution", "thread"),
+    )
+
+
+def regressions(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float
+) -> List[str]:
+    """Describe every measurement whose throughput fell below the baseline."""
+
+    previous = {key(result): result for result in baseline}
+    found = []
+    for result in results:
+        before = previous.get(key(result))
+        if before is None or not before["ops_per_sec"]:
+            continue
+        change = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        if change < -tolerance:
+            found.append(
+                "{} {} c={} {} ({}): {:.1f} -> {:.1f} ops/s ({:+.0%})".format(
+                    *key(result),
+                    before["ops_per_sec"],
+                    result["ops_per_sec"],
+                    change,
+                )
+            )
+    return found
+
+
+def environment() -> Dict[str, Any]:
+    def version(package: str) -> str:
+        try:
+            return metadata.version(package)
+        except metadata.PackageNotFoundError:
+            return "unknown"
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "tinydb": version("tinydb"),
+        "tinybridge": version("tinybridge"),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    def numbers(value: str) -> List[int]:
+        return [int(item) for item in value.split(",")]
+
+    def choices(allowed: Tuple[str, ...]) -> Callable[[str], List[str]]:
+        def parse(value: str) -> List[str]:
+            items = value.split(",")
+            unknown = set(items) - set(allowed)
+            if unknown:
+                raise argparse.ArgumentTypeError(f"unknown: {', '.join(unknown)}")
+            return items
+
+        return parse
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sizes", type=numbers, default=[1000, 10000, 100000])
+    parser.add_argument("--concurrency", type=numbers, default=[1, 8, 64])
+    parser.add_argument("--storages", type=choices(STORAGES), default=list(STORAGES))
+    parser.add_argument("--methods", type=choices(METHODS), default=list(METHODS))
+    parser.add_argument("--ops", type=int, default=200, help="operations per read")
+    parser.add_argument(
+        "--write-ops", type=int, default=50, help="operations per write"
+    )
+    parser.add_argument(
+        "--all-max-size",
+        type=int,
+        default=100000,
+        help="skip all() on larger databases",
+    )
+    parser.add_argument(
+        "--execution", choices=("thread", "inline", "auto"), default="thread"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--baseline", help="previous JSON results to compare with")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="allowed relative throughput drop against the baseline",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+    output = {"environment": environment(), "results": results}
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(output, file, indent=2)
+    else:
+        json.dump(output, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)["results"]
+        found = regressions(results, baseline, args.tolerance)
+        for line in found:
+            print(f"regression: {line}", file=sys.stderr)
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -25,6 +25,8 @@ class InMemoryAIOBridge(AIOBridge):
     tinydb_class = InMemoryTinyDB
 
     def __init__(self, *, timeout: int = 10, **kwargs):
+        # Nothing touches the disk, so skip the worker thread hop.
+        kwargs.setdefault("execution", "inline")
         super().__init__(None, timeout=timeout, **kwargs)
 
     async def getmany(self, doc_ids: List[Any]) -> Result[List[Document], Exception]:
@@ -1,8 +1,49 @@
+import asyncio
 import json
 import os
+import time
 from typing import List, Mapping
+from unittest import mock
 
 import pytest
+from tinydb import TinyDB
+from tinydb.storages import JSONStorage
+
+
+class CountingStorage(JSONStorage):
+    """
+    JSON storage that counts how many times the file is rewritten.
+    """
+
+    writes = 0
+
+    def write(self, data):
+        CountingStorage.writes += 1
+        super().write(data)
+
+
+class CountingTinyDB(TinyDB):
+    default_storage_class = CountingStorage
+
+
+def slow(value, delay: float = 0.1) -> bool:
+    """
+    Query test that blocks its thread for `delay` seconds.
+    """
+    time.sleep(delay)
+    return True
+
+
+def count_hops():
+    """
+    Patch `asyncio.to_thread` to count the operations sent to a thread.
+    """
+    return mock.patch("asyncio.to_thread", wraps=asyncio.to_thread)
+
+
+@pytest.fixture(autouse=True)
+def reset_writes():
+    CountingStorage.writes = 0
 
 
 @pytest.fixture
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+from tinydb import where
+
+from tinybridge import AIOBridge, ShardedAIOBridge
+
+
+@pytest.mark.asyncio
+async def test_select(db_name, multitable_db):
+    async with AIOBridge(db_name) as bridge:
+        selected = (await bridge.select(["name", "zip"])).ok()
+        assert selected == [{"name": "John"}, {"name": "Jane"}, {"name": "Alice"}]
+        assert [doc.doc_id for doc in selected] == [1, 2, 3]
+
+        active = (await bridge.select("city", where("active") == True)).ok()
+        assert [(doc.doc_id, doc) for doc in active] == [
+            (1, {"city": "New York"}),
+            (3, {"city": "Wonderland"}),
+        ]
+
+        users = (await bridge.table("_users")).ok()
+        assert (await users.select(("name", "age"), where("age") > 36)).ok() == [
+            {"name": "Charlie", "age": 40}
+        ]
+
+
+@pytest.mark.asyncio
+async def test_aggregates(db_name, default_db):
+    async with AIOBridge(db_name, cache_size=10) as bridge:
+        await bridge.insert({"name": "Bob", "active": True, "tags": ["a"]})
+        await bridge.insert({"name": "Eve", "active": False, "tags": ["a"]})
+
+        assert (await bridge.count_by("active")).ok() == {True: 3, False: 2}
+        assert (await bridge.count_by("city", where("active") == True)).ok() == {
+            "New York": 1,
+            "Wonderland": 1,
+        }
+        assert (await bridge.sum("age")).ok() == 83
+        assert (await bridge.sum("age", where("name") == "Nobody")).ok() == 0
+        assert (await bridge.min("age")).ok() == 25
+        assert (await bridge.max("age", where("active") == True)).ok() == 30
+        assert (await bridge.max("missing")).ok() is None
+        assert (await bridge.distinct("active")).ok() == [True, False]
+        assert (await bridge.distinct("tags")).ok() == [["a"]]
+        assert isinstance((await bridge.sum("name")).err(), TypeError)
+
+        # Cached results cannot be changed through the returned value.
+        counts = (await bridge.count_by("active")).ok()
+        counts[True] = 0
+        assert (await bridge.count_by("active")).ok() == {True: 3, False: 2}
+
+
+@pytest.mark.asyncio
+async def test_aggregates_with_index_and_batch(db_name, default_db):
+    async with AIOBridge(db_name) as bridge:
+        await bridge.create_index("age", kind="sorted")
+        assert (await bridge.sum("age", where("age") >= 28)).ok() == 58
+
+        results = await (
+            bridge.batch()
+            .select("name", where("age") < 30)
+            .count_by("active")
+            .min("age")
+            .distinct("city", where("active") == False)
+            .execute()
+        )
+        assert [result.ok() for result in results] == [
+            [{"name": "Jane"}, {"name": "Alice"}],
+            {True: 2, False: 1},
+            25,
+            ["Los Angeles"],
+        ]
+
+
+@pytest.mark.asyncio
+async def test_sharded_aggregates(tmp_path, defaults, users):
+    paths = [os.path.join(tmp_path, f"shard{i}.json") for i in range(2)]
+    async with ShardedAIOBridge(paths) as bridge:
+        await bridge.insert_multiple(defaults + users)
+
+        selected = (await bridge.select("name", where("active") == True)).ok()
+        assert [(doc.doc_id, doc["name"]) for doc in selected] == [
+            (1, "John"),
+            (3, "Alice"),
+            (4, "Bob"),
+        ]
+        assert (await bridge.count_by("active")).ok() == {True: 3, False: 2}
+        assert (await bridge.sum("age")).ok() == 158
+        assert (await bridge.min("age")).ok() == 25
+        assert (await bridge.max("age")).ok() == 40
+        assert sorted((await bridge.distinct("active")).ok()) == [False, True]
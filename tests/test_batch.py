@@ -0,0 +1,89 @@
+import asyncio
+import json
+import time
+from unittest import mock
+
+import pytest
+from tinydb import where
+
+from tinybridge import AIOBridge
+
+
+@pytest.mark.asyncio
+async def test_batch_reads(db_name, multitable_db):
+    async with AIOBridge(db_name) as bridge:
+        batch = bridge.batch()
+        batch.get(doc_id=1).count(where("active") == True)
+        batch.table("_users").search(where("name") == "Bob")
+        assert len(batch) == 3
+
+        with mock.patch("asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            results = await batch.execute()
+        assert to_thread.call_count == 1
+
+    assert results[0].ok()["name"] == "John"
+    assert results[1].ok() == 2
+    assert [doc["city"] for doc in results[2].ok()] == ["Chicago"]
+    assert len(batch) == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_writes(db_name, default_db):
+    async with AIOBridge(db_name) as bridge:
+        results = await (
+            bridge.batch()
+            .insert({"name": "Bob"})
+            .update({"active": False}, where("name") == "John")
+            .remove(doc_ids=[99])
+            .count(where("active") == False)
+            .execute()
+        )
+
+        assert results[0].ok() == 4
+        assert results[1].ok() == [1]
+        assert isinstance(results[2].err(), KeyError)
+        assert results[3].ok() == 2
+        assert (await bridge.get(doc_id=4)).ok() == {"name": "Bob"}
+
+    with open(db_name, "r") as file:
+        data = json.load(file)
+    assert data["_default"]["4"] == {"name": "Bob"}
+    assert data["_default"]["1"]["active"] is False
+
+
+@pytest.mark.asyncio
+async def test_batch_discards_partial_updates(db_name, default_db):
+    def bump(document):
+        if document["name"] == "Jane":
+            raise ValueError("boom")
+        document["age"] += 100
+
+    async with AIOBridge(db_name) as bridge:
+        results = await (
+            bridge.batch()
+            .insert({"name": "Bob"})
+            .update(bump)
+            .update({"active": False}, doc_ids=[3])
+            .execute()
+        )
+        assert results[0].ok() == 4
+        assert isinstance(results[1].err(), ValueError)
+        assert results[2].ok() == [3]
+
+    with open(db_name, "r") as file:
+        data = json.load(file)["_default"]
+    assert [data[key]["age"] for key in ("1", "2", "3")] == [30, 25, 28]
+    assert data["3"]["active"] is False
+
+
+@pytest.mark.asyncio
+async def test_batch_timeout(db_name, default_db):
+    def slow(value):
+        time.sleep(0.2)
+        return True
+
+    async with AIOBridge(db_name, timeout=0.05) as bridge:
+        results = await bridge.batch().all().search(where("name").test(slow)).execute()
+
+    assert len(results) == 2
+    assert all(isinstance(result.err(), asyncio.TimeoutError) for result in results)
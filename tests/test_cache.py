@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from tinydb import where
+
+from tinybridge import AIOBridge
+
+from .conftest import count_hops
+
+
+@pytest.mark.asyncio
+async def test_cache_hit(db_name, default_db):
+    async with AIOBridge(db_name, cache_size=16) as bridge:
+        first = await bridge.search(where("active") == True)
+        with count_hops() as to_thread:
+            second = await bridge.search(where("active") == True)
+            assert (await bridge.get(doc_id=1)).is_ok()
+            assert (await bridge.get(doc_id=1)).ok()["name"] == "John"
+        assert to_thread.call_count == 1
+
+        first.ok()[0]["age"] = 999
+        (await bridge.get(doc_id=1)).ok()["age"] = 999
+        third = await bridge.search(where("active") == True)
+        assert [document["age"] for document in third.ok()] == [30, 28]
+        assert (await bridge.get(doc_id=1)).ok()["age"] == 30
+        assert third.ok()[0].doc_id == 1
+
+    assert second.ok() == third.ok()
+
+
+@pytest.mark.asyncio
+async def test_cache_invalidated_by_writes(db_name, multitable_db):
+    async with AIOBridge(db_name, cache_size=16) as bridge:
+        users = (await bridge.table("_users")).ok()
+        assert (await bridge.count(where("name") == "Bob")).ok() == 0
+        assert (await users.count(where("name") == "Bob")).ok() == 1
+
+        assert (await bridge.insert({"name": "Bob"})).is_ok()
+        with count_hops() as to_thread:
+            assert (await users.count(where("name") == "Bob")).ok() == 1
+            assert (await bridge.count(where("name") == "Bob")).ok() == 1
+        assert to_thread.call_count == 1
+
+        assert (await bridge.drop_tables()).is_ok()
+        assert (await users.count(where("name") == "Bob")).ok() == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_shared_path(db_name, default_db):
+    reader = AIOBridge(db_name, cache_size=16)
+    async with AIOBridge(db_name) as writer:
+        assert (await reader.contains(where("name") == "Bob")).ok() is False
+        assert (await writer.insert({"name": "Bob"})).is_ok()
+        # The reader's own TinyDB query cache does not know about the write.
+        reader.db.clear_cache()
+        assert (await reader.contains(where("name") == "Bob")).ok() is True
+    await reader.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_ttl_and_size(db_name, default_db):
+    async with AIOBridge(db_name, cache_size=1, cache_ttl=0.05) as bridge:
+        await bridge.get(doc_id=1)
+        await bridge.get(doc_id=2)
+        with count_hops() as to_thread:
+            await bridge.get(doc_id=2)
+            await bridge.get(doc_id=1)
+            await asyncio.sleep(0.06)
+            await bridge.get(doc_id=1)
+        assert to_thread.call_count == 2
@@ -0,0 +1,167 @@
+import asyncio
+import typing
+
+import pytest
+from tinydb import where
+from tinydb.storages import MemoryStorage
+
+from tinybridge import AIOBridge, Change
+from tinybridge.changes import Op
+
+
+def pending(subscription):
+    return [change for change in subscription._changes]
+
+
+@pytest.mark.asyncio
+async def test_change_events(db_name, default_db):
+    async with AIOBridge(db_name) as bridge:
+        async with bridge.subscribe() as changes:
+            await bridge.insert({"name": "Bob"})
+            await bridge.update({"age": 31}, where("name") == "John")
+            await bridge.update({"age": 0}, where("name") == "Nobody")
+            await bridge.remove(doc_ids=[2])
+            await bridge.truncate()
+
+            assert await changes.get() == Change(
+                "_default", "insert", [4], {4: {"name": "Bob"}}
+            )
+            update = await changes.get()
+            assert (update.op, update.doc_ids) == ("update", [1])
+            assert update.documents[1]["age"] == 31
+            remove = await changes.get()
+            assert (remove.op, remove.doc_ids) == ("remove", [2])
+            assert remove.documents[2]["name"] == "Jane"
+            truncate = await changes.get()
+            assert (truncate.op, sorted(truncate.doc_ids)) == ("truncate", [1, 3, 4])
+            assert pending(changes) == []
+
+        assert changes.closed
+        assert await changes.get() is None
+        await bridge.insert({"name": "Zoe"})
+        assert pending(changes) == []
+
+
+@pytest.mark.asyncio
+async def test_change_ops(db_name, default_db):
+    async def source():
+        yield {"name": "Ann"}
+
+    async with AIOBridge(db_name) as bridge:
+        subscription = bridge.subscribe()
+        await bridge.insert({"name": "Bob"})
+        await bridge.insert_multiple([{"name": "Eve"}])
+        await bridge.update({"age": 1}, doc_ids=[1])
+        await bridge.update_multiple([({"age": 2}, where("name") == "Bob")])
+        await bridge.upsert({"name": "Zoe"}, where("name") == "Zoe")
+        await bridge.remove(doc_ids=[2])
+        await bridge.import_ndjson(source())
+        await bridge.truncate()
+        ops = [change.op for change in pending(subscription)]
+        assert sorted(ops) == sorted(typing.get_args(Op))
+
+
+@pytest.mark.asyncio
+async def test_change_iteration(db_name, default_db):
+    async with AIOBridge(db_name) as bridge:
+        subscription = bridge.subscribe()
+
+        async def consume():
+            return [change.op async for change in subscription]
+
+        task = asyncio.create_task(consume())
+        await bridge.insert({"name": "Bob"})
+        await bridge.upsert({"name": "Bob", "age": 1}, where("name") == "Bob")
+        await asyncio.sleep(0)
+        subscription.close()
+        assert await task == ["insert", "upsert"]
+
+
+@pytest.mark.asyncio
+async def test_change_filter_and_overflow(db_name, default_db):
+    async with AIOBridge(db_name) as bridge:
+        adults = bridge.subscribe(where("age") >= 30, maxsize=2)
+        await bridge.update({"active": False}, doc_ids=[1, 2])
+        change = await adults.get()
+        assert (change.op, change.doc_ids) == ("update", [1])
+        assert list(change.documents) == [1]
+
+        await bridge.insert({"name": "Kid", "age": 3})
+        assert pending(adults) == []
+        await bridge.insert_multiple([{"age": 40}, {"age": 50}, {"age": 60}])
+        await bridge.insert({"age": 70})
+        assert [change.doc_ids for change in pending(adults)] == [[5, 6, 7], [8]]
+        assert adults.dropped == 0
+
+        await bridge.insert({"age": 80})
+        assert [change.doc_ids for change in pending(adults)] == [[8], [9]]
+        assert adults.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_change_scope(db_name, multitable_db):
+    async with AIOBridge(db_name) as bridge:
+        users = (await bridge.table("_users")).ok()
+        subscription = users.subscribe()
+        other = AIOBridge(db_name)
+        await other.insert({"name": "Bob"})
+        assert pending(subscription) == []
+
+        await (await other.table("_users")).ok().insert({"name": "Dan"})
+        await other.close()
+        assert [change.table for change in pending(subscription)] == ["_users"]
+
+
+@pytest.mark.asyncio
+async def test_change_batch(db_name, default_db):
+    async with AIOBridge(db_name) as bridge:
+        subscription = bridge.subscribe()
+        results = await (
+            bridge.batch()
+            .insert({"name": "Bob"})
+            .remove(doc_ids=[99])
+            .update({"active": False}, doc_ids=[1])
+            .count(where("active") == False)
+            .execute()
+        )
+        assert results[3].ok() == 2
+        changes = pending(subscription)
+        assert [(change.op, change.doc_ids) for change in changes] == [
+            ("insert", [4]),
+            ("update", [1]),
+        ]
+
+
+@pytest.mark.asyncio
+async def test_change_transaction(db_name, multitable_db):
+    async with AIOBridge(db_name) as bridge:
+        subscription = bridge.subscribe()
+        async with bridge.transaction() as tx:
+            await tx.insert({"name": "Bob"})
+            await tx.remove(doc_ids=[1])
+            assert pending(subscription) == []
+        changes = pending(subscription)
+        assert [(change.op, change.doc_ids) for change in changes] == [
+            ("insert", [4]),
+            ("remove", [1]),
+        ]
+
+        async with bridge.transaction() as tx:
+            await tx.insert({"name": "Zoe"})
+            tx.rollback()
+        with pytest.raises(RuntimeError):
+            async with bridge.transaction() as tx:
+                await tx.insert({"name": "Zoe"})
+                raise RuntimeError
+        assert len(pending(subscription)) == 2
+
+
+@pytest.mark.asyncio
+async def test_change_feed_of_in_memory_bridges():
+    async with AIOBridge(None, storage=MemoryStorage) as a:
+        async with AIOBridge(None, storage=MemoryStorage) as b:
+            subscription = a.subscribe()
+            await b.insert({"name": "Bob"})
+            assert pending(subscription) == []
+            await a.insert({"name": "Zoe"})
+            assert [change.op for change in pending(subscription)] == ["insert"]
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from tinydb import where
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import JSONStorage, MemoryStorage
+
+from tinybridge import AIOBridge
+
+from .conftest import count_hops
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("execution", ["inline", "auto"])
+async def test_inline_memory_storage(execution):
+    async with AIOBridge(None, storage=MemoryStorage, execution=execution) as bridge:
+        with count_hops() as to_thread:
+            assert (await bridge.insert({"name": "John"})).ok() == 1
+            assert (await bridge.search(where("name") == "John")).ok() == [
+                {"name": "John"}
+            ]
+            result = await bridge.remove(doc_ids=[99])
+        assert to_thread.call_count == 0
+
+    assert isinstance(result.err(), KeyError)
+
+
+@pytest.mark.asyncio
+async def test_auto_caching_middleware(db_name, default_db):
+    async with AIOBridge(
+        db_name, storage=CachingMiddleware(JSONStorage), execution="auto"
+    ) as bridge:
+        with count_hops() as to_thread:
+            assert (await bridge.count(where("active") == True)).ok() == 2
+            assert to_thread.call_count == 1
+            assert (await bridge.count(where("active") == False)).ok() == 1
+            assert to_thread.call_count == 1
+            assert (await bridge.insert({"name": "Bob"})).ok() == 4
+            assert to_thread.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_auto_json_storage(db_name, default_db):
+    async with AIOBridge(db_name, execution="auto") as bridge:
+        with count_hops() as to_thread:
+            assert (await bridge.get(doc_id=1)).ok()["name"] == "John"
+        assert to_thread.call_count == 1
+
+
+def test_execution_validation(db_name):
+    with pytest.raises(ValueError):
+        AIOBridge(db_name, execution="process")
+    with pytest.raises(ValueError):
+        AIOBridge(db_name, execution="inline", interprocess=True)
@@ -0,0 +1,48 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from tinydb import where
+
+from tinybridge import AIOBridge, BridgeBusyError
+
+
+@pytest.mark.asyncio
+async def test_custom_executor(db_name, default_db):
+    def thread_name(value):
+        return threading.current_thread().name.startswith("custom")
+
+    with ThreadPoolExecutor(1, thread_name_prefix="custom") as executor:
+        async with AIOBridge(db_name, executor=executor) as bridge:
+            result = await bridge.count(where("name").test(thread_name))
+            assert result.ok() == 3
+
+
+@pytest.mark.asyncio
+async def test_executor_shared_per_path(db_name):
+    bridge1 = AIOBridge(db_name, max_workers=2)
+    bridge2 = AIOBridge(db_name, max_workers=4)
+
+    async with bridge1, bridge2:
+        assert bridge1._executor is bridge2._executor
+        assert bridge1._executor._max_workers == 2
+        assert (await bridge2.insert({"name": "Jane"})).is_ok()
+
+
+@pytest.mark.asyncio
+async def test_max_pending(db_name, default_db):
+    def slow(value):
+        time.sleep(0.1)
+        return True
+
+    async with AIOBridge(db_name, max_workers=1, max_pending=2) as bridge:
+        results = await asyncio.gather(
+            *[bridge.count(where("name").test(slow)) for _ in range(3)]
+        )
+        assert [result.is_ok() for result in results] == [True, True, False]
+        assert isinstance(results[2].err(), BridgeBusyError)
+
+        result = await bridge.count(where("name").test(slow))
+        assert result.ok() == 3
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import os
+from unittest import mock
+
+import pytest
+from tinydb import TinyDB
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import JSONStorage
+
+from tinybridge import AIOBridge
+
+
+class CustomTinyDB(TinyDB):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, storage=CachingMiddleware(JSONStorage), **kwargs)
+
+
+class CustomAIOBridge(AIOBridge):
+    tinydb_class = CustomTinyDB
+
+
+def stored(db_name):
+    with open(db_name, "r") as file:
+        content = file.read()
+    return json.loads(content).get("_default", {}) if content else {}
+
+
+@pytest.mark.asyncio
+async def test_background_flush(db_name, default_db):
+    async with AIOBridge(db_name, flush_interval=0.05) as bridge:
+        assert isinstance(bridge.db.storage, CachingMiddleware)
+        for i in range(10):
+            assert (await bridge.insert({"value": i})).is_ok()
+        assert len(stored(db_name)) == 3
+
+        await asyncio.sleep(0.1)
+        assert len(stored(db_name)) == 13
+        assert bridge.stats.methods["flush"].calls == 1
+
+
+@pytest.mark.asyncio
+async def test_background_flush_of_own_middleware(db_name, default_db):
+    async with CustomAIOBridge(db_name, flush_interval=0.05) as bridge:
+        storage = bridge.db.storage
+        assert isinstance(storage, CachingMiddleware)
+        assert isinstance(storage.storage, JSONStorage)
+        await bridge.insert({"value": 1})
+        assert len(stored(db_name)) == 3
+
+        await asyncio.sleep(0.1)
+        assert len(stored(db_name)) == 4
+
+
+@pytest.mark.asyncio
+async def test_flush_max_writes(db_name, default_db):
+    async with AIOBridge(db_name, flush_interval=60, flush_max_writes=5) as bridge:
+        await bridge.insert_multiple([{"value": 1}, {"value": 2}])
+        for i in range(5):
+            await bridge.insert({"value": i})
+        await asyncio.sleep(0.05)
+        assert len(stored(db_name)) == 10
+
+        await bridge.insert({"value": 6})
+        await asyncio.sleep(0.05)
+        assert len(stored(db_name)) == 10
+    assert len(stored(db_name)) == 11
+
+
+@pytest.mark.asyncio
+async def test_flush_without_background(db_name, default_db):
+    async with AIOBridge(db_name, flush_interval=0.01, durability="none") as bridge:
+        await bridge.insert({"value": 1})
+        await asyncio.sleep(0.05)
+        assert len(stored(db_name)) == 3
+
+        with mock.patch("os.fsync", wraps=os.fsync) as fsync:
+            assert (await bridge.flush()).is_ok()
+        assert len(stored(db_name)) == 4
+        # JSONStorage syncs every write on its own.
+        assert fsync.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_flush_fsync(db_name, default_db):
+    async with AIOBridge(db_name, flush_interval=0.01, durability="fsync") as bridge:
+        with mock.patch("os.fsync", wraps=os.fsync) as fsync:
+            await bridge.insert({"value": 1})
+            await asyncio.sleep(0.05)
+        assert fsync.call_count == 2
+        assert len(stored(db_name)) == 4
+
+
+def test_flush_options(db_name):
+    with pytest.raises(ValueError):
+        AIOBridge(db_name, durability="always")
+    with pytest.raises(ValueError):
+        AIOBridge(db_name, flush_interval=1, interprocess=True)
@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+import pytest
+from tinydb import where
+from tinydb.storages import JSONStorage
+
+from tinybridge import AIOBridge
+
+from .conftest import CountingStorage, CountingTinyDB
+
+
+@pytest.mark.asyncio
+async def test_group_commit_single_write(db_name):
+    async with AIOBridge(
+        db_name, tinydb_class=CountingTinyDB, commit_window=0.05
+    ) as bridge:
+        results = await asyncio.gather(
+            *[bridge.insert({"value": i}) for i in range(50)]
+        )
+        assert all(result.is_ok() for result in results)
+        assert sorted(result.ok() for result in results) == list(range(1, 51))
+        assert CountingStorage.writes == 1
+
+    with open(db_name, "r") as file:
+        assert len(json.load(file)["_default"]) == 50
+
+
+class FailingStorage(JSONStorage):
+    """
+    JSON storage whose writes fail while `fail` is set.
+    """
+
+    fail = False
+
+    def write(self, data):
+        if FailingStorage.fail:
+            raise OSError("disk full")
+        super().write(data)
+
+
+@pytest.mark.asyncio
+async def test_group_commit_failed_write_keeps_indexes(db_name, default_db):
+    async with AIOBridge(db_name, storage=FailingStorage, commit_window=0.01) as bridge:
+        await bridge.create_index("name")
+        FailingStorage.fail = True
+        try:
+            results = await asyncio.gather(
+                bridge.update({"name": "Bob"}, where("name") == "John"),
+                bridge.insert({"name": "Zoe"}),
+            )
+        finally:
+            FailingStorage.fail = False
+        assert all(isinstance(result.err(), OSError) for result in results)
+
+        assert [
+            doc.doc_id for doc in (await bridge.search(where("name") == "John")).ok()
+        ] == [1]
+        assert (await bridge.count(where("name") == "Bob")).ok() == 0
+
+
+@pytest.mark.asyncio
+async def test_group_commit_max_ops(db_name):
+    async with AIOBridge(
+        db_name, tinydb_class=CountingTinyDB, commit_window=60, commit_max_ops=10
+    ) as bridge:
+        results = await asyncio.wait_for(
+            asyncio.gather(*[bridge.insert({"value": i}) for i in range(30)]),
+            timeout=5,
+        )
+        assert all(result.is_ok() for result in results)
+        assert CountingStorage.writes == 3
+
+
+@pytest.mark.asyncio
+async def test_group_commit_per_operation_results(db_name, default_db):
+    def fail(document):
+        raise ValueError("boom")
+
+    async with AIOBridge(db_name, commit_window=0.05) as bridge:
+        inserted, failed, updated = await asyncio.gather(
+            bridge.insert({"name": "Bob"}),
+            bridge.update(fail, where("name") == "John"),
+            bridge.update({"age": 29}, where("name") == "Alice"),
+        )
+        assert inserted.ok() == 4
+        assert isinstance(failed.err(), ValueError)
+        assert updated.ok() == [3]
+
+        result = await bridge.get(where("name") == "Alice")
+        assert result.ok()["age"] == 29
+
+
+@pytest.mark.asyncio
+async def test_group_commit_discards_partial_updates(db_name, default_db):
+    def bump(document):
+        if document["name"] == "Jane":
+            raise ValueError("boom")
+        document["age"] += 100
+
+    async with AIOBridge(db_name, commit_window=0.05) as bridge:
+        inserted, failed = await asyncio.gather(
+            bridge.insert({"name": "Bob"}), bridge.update(bump)
+        )
+        assert inserted.ok() == 4
+        assert isinstance(failed.err(), ValueError)
+        assert (await bridge.get(doc_id=1)).ok()["age"] == 30
+
+    with open(db_name, "r") as file:
+        data = json.load(file)["_default"]
+    assert [data[key]["age"] for key in ("1", "2", "3")] == [30, 25, 28]
+    assert data["4"] == {"name": "Bob"}
+
+
+@pytest.mark.asyncio
+async def test_group_commit_drained_on_exit(db_name):
+    async with AIOBridge(db_name, commit_window=60) as bridge:
+        task = asyncio.ensure_future(bridge.insert({"name": "Jane"}))
+        await asyncio.sleep(0)
+
+    assert (await task).ok() == 1
+    with open(db_name, "r") as file:
+        assert json.load(file)["_default"] == {"1": {"name": "Jane"}}
@@ -0,0 +1,136 @@
+import pytest
+from tinydb import where
+from tinydb.storages import MemoryStorage
+
+from tinybridge import AIOBridge
+from tinybridge.indexes import HashIndex, SortedIndex, TableIndexes
+
+
+def test_hash_index():
+    index = HashIndex("city")
+    index.add("1", {"city": "Paris"})
+    index.add("2", {"city": "Rome"})
+    index.add("3", {"city": ["Paris"]})
+    index.add("4", {"name": "No city"})
+
+    assert index.lookup("==", "Paris") == {"1", "3"}
+    assert index.lookup("one_of", ("Rome", "Oslo")) == {"2", "3"}
+    assert index.lookup("<", "Paris") is None
+
+    index.discard("1")
+    index.discard("3")
+    assert index.lookup("==", "Paris") == set()
+
+
+def test_sorted_index():
+    index = SortedIndex("age")
+    for doc_id, age in enumerate([30, 25, 28, 25], start=1):
+        index.add(str(doc_id), {"age": age})
+
+    assert index.lookup("==", 25) == {"2", "4"}
+    assert index.lookup("<", 28) == {"2", "4"}
+    assert index.lookup("<=", 28) == {"2", "3", "4"}
+    assert index.lookup(">", 28) == {"1"}
+    assert index.lookup(">=", 28) == {"1", "3"}
+
+    index.discard("4")
+    assert index.lookup("==", 25) == {"2"}
+
+    index.add("5", {"age": "unknown"})
+    assert index.lookup("==", 25) is None
+
+
+def test_table_indexes_plan():
+    documents = {
+        "1": {"city": "Paris", "age": 30},
+        "2": {"city": "Rome", "age": 25},
+        "3": {"city": "Paris", "age": 20},
+    }
+    indexes = TableIndexes()
+    indexes.create("city", "hash", documents)
+    indexes.create("age", "sorted", documents)
+
+    def plan(cond):
+        return indexes.candidates(cond, documents)
+
+    assert plan(where("city") == "Paris") == {"1", "3"}
+    assert plan((where("city") == "Paris") & (where("age") < 25)) == {"3"}
+    assert plan((where("city") == "Rome") | (where("age") >= 30)) == {"1", "2"}
+    assert plan((where("city") == "Rome") | (where("name") == "Bob")) is None
+    assert plan(where("city").matches("P.*")) is None
+    assert plan(~(where("city") == "Rome")) is None
+
+
+@pytest.mark.asyncio
+async def test_indexed_queries(db_name, default_db):
+    evaluated = []
+
+    def track(value):
+        evaluated.append(value)
+        return True
+
+    async with AIOBridge(db_name) as bridge:
+        assert (await bridge.create_index("city")).is_ok()
+        assert (await bridge.create_index("age", kind="sorted")).is_ok()
+
+        result = await bridge.search(
+            (where("city") == "Wonderland") & where("name").test(track)
+        )
+        assert [doc["name"] for doc in result.ok()] == ["Alice"]
+        assert evaluated == ["Alice"]
+
+        result = await bridge.search(where("age") >= 28)
+        assert [doc.doc_id for doc in result.ok()] == [1, 3]
+
+        assert (await bridge.get(where("city") == "New York")).ok()["name"] == "John"
+        assert (await bridge.get(where("city") == "Paris")).ok() is None
+        assert (await bridge.contains(where("age") < 26)).ok() is True
+        assert (await bridge.count(where("age") > 26)).ok() == 2
+
+
+@pytest.mark.asyncio
+async def test_indexes_follow_mutations(db_name, default_db):
+    async with AIOBridge(db_name) as bridge:
+        await bridge.create_index("city")
+
+        await bridge.insert({"name": "Bob", "city": "Paris"})
+        await bridge.insert_multiple([{"name": "Eve", "city": "Paris"}])
+        assert (await bridge.count(where("city") == "Paris")).ok() == 2
+
+        await bridge.update({"city": "Rome"}, where("name") == "Bob")
+        await bridge.upsert({"name": "Zoe", "city": "Rome"}, where("name") == "Zoe")
+        result = await bridge.search(where("city") == "Rome")
+        assert [doc["name"] for doc in result.ok()] == ["Bob", "Zoe"]
+
+        await bridge.remove(where("name") == "Eve")
+        assert (await bridge.count(where("city") == "Paris")).ok() == 0
+
+        await bridge.truncate()
+        assert (await bridge.count(where("city") == "Rome")).ok() == 0
+
+        await bridge.insert({"name": "Ann", "city": "Rome"})
+        await bridge.drop_index("city")
+        assert (await bridge.count(where("city") == "Rome")).ok() == 1
+
+
+@pytest.mark.asyncio
+async def test_indexes_with_group_commit(db_name, default_db):
+    async with AIOBridge(db_name, commit_window=0.01) as bridge:
+        await bridge.create_index("city")
+        await bridge.insert({"name": "Bob", "city": "Paris"})
+        await bridge.update({"city": "Paris"}, where("name") == "John")
+        result = await bridge.search(where("city") == "Paris")
+        assert [doc["name"] for doc in result.ok()] == ["John", "Bob"]
+
+
+@pytest.mark.asyncio
+async def test_indexes_of_in_memory_bridges():
+    async with AIOBridge(None, storage=MemoryStorage) as a:
+        async with AIOBridge(None, storage=MemoryStorage) as b:
+            await a.insert({"city": "X"})
+            await b.insert_multiple([{"city": "Y"}, {"city": "X"}])
+            assert (await a.create_index("city")).is_ok()
+
+            assert (await b.search(where("city") == "X")).ok() == [{"city": "X"}]
+            assert (await a.search(where("city") == "X")).ok() == [{"city": "X"}]
+            assert a.lock is not b.lock
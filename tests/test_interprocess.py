@@ -0,0 +1,61 @@
+import asyncio
+import json
+import multiprocessing
+
+import pytest
+from tinydb import TinyDB, where
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import JSONStorage
+
+from tinybridge import AIOBridge
+
+
+class CachingTinyDB(TinyDB):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, storage=CachingMiddleware(JSONStorage), **kwargs)
+
+
+def write_documents(db_name, worker):
+    async def main():
+        async with AIOBridge(
+            db_name, interprocess=True, tinydb_class=CachingTinyDB
+        ) as bridge:
+            for i in range(20):
+                result = await bridge.insert({"worker": worker, "i": i})
+                assert result.is_ok()
+
+    asyncio.run(main())
+
+
+def test_interprocess_writers(db_name):
+    processes = [
+        multiprocessing.Process(target=write_documents, args=(db_name, worker))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+        assert process.exitcode == 0
+
+    with open(db_name, "r") as file:
+        documents = json.load(file)["_default"]
+    assert len(documents) == 80
+    assert sorted(map(int, documents)) == list(range(1, 81))
+
+
+@pytest.mark.asyncio
+async def test_interprocess_reload_on_change(db_name, default_db):
+    reader = AIOBridge(db_name, interprocess=True, tinydb_class=CachingTinyDB)
+    writer = AIOBridge(db_name, interprocess=True, tinydb_class=CachingTinyDB)
+
+    async with reader, writer:
+        assert (await reader.count(where("name") == "Bob")).ok() == 0
+        assert (await writer.insert({"name": "Bob"})).ok() == 4
+        assert (await reader.count(where("name") == "Bob")).ok() == 1
+        assert (await reader.insert({"name": "Eve"})).ok() == 5
+
+
+def test_interprocess_requires_path():
+    with pytest.raises(ValueError):
+        AIOBridge(None, interprocess=True)
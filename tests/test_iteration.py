@@ -0,0 +1,67 @@
+import pytest
+from tinydb import where
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import JSONStorage
+
+from tinybridge import AIOBridge
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_size,expected", [(1, [1, 1, 1]), (2, [2, 1]), (5, [3])])
+async def test_iter_all(db_name, default_db, defaults, batch_size, expected):
+    async with AIOBridge(db_name) as bridge:
+        batches = [batch async for batch in bridge.iter_all(batch_size=batch_size)]
+
+    assert [len(batch.ok()) for batch in batches] == expected
+    assert [doc for batch in batches for doc in batch.ok()] == defaults
+
+
+@pytest.mark.asyncio
+async def test_iter_search(db_name, default_db):
+    async with AIOBridge(db_name) as bridge:
+        names = []
+        async for batch in bridge.iter_search(where("active") == True, batch_size=1):
+            names.extend(doc["name"] for doc in batch.ok())
+
+    assert names == ["John", "Alice"]
+
+
+@pytest.mark.asyncio
+async def test_iter_search_snapshot(db_name, default_db):
+    async with AIOBridge(db_name) as bridge:
+        await bridge.create_index("city")
+        seen = []
+        async for batch in bridge.iter_search(where("city") != "Paris", batch_size=1):
+            seen.extend(doc.doc_id for doc in batch.ok())
+            await bridge.insert({"name": "Bob", "city": "Rome"})
+
+    assert seen == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage", [JSONStorage, CachingMiddleware(JSONStorage)])
+async def test_iter_all_reads_each_batch(db_name, default_db, storage):
+    async with AIOBridge(db_name, storage=storage) as bridge:
+        ages = []
+        async for batch in bridge.iter_all(batch_size=1):
+            ages.extend(doc["age"] for doc in batch.ok())
+            batch.ok()[0]["age"] = -1
+            await bridge.update({"age": 0}, doc_ids=[2])
+            await bridge.remove(doc_ids=[3])
+        assert (await bridge.get(doc_id=1)).ok()["age"] == 30
+
+    assert ages == [30, 0]
+
+
+@pytest.mark.asyncio
+async def test_iter_search_error(db_name, default_db):
+    def fail(value):
+        raise ValueError("boom")
+
+    async with AIOBridge(db_name) as bridge:
+        batches = [
+            batch async for batch in bridge.iter_search(where("name").test(fail))
+        ]
+
+    assert len(batches) == 1
+    assert isinstance(batches[0].err(), ValueError)
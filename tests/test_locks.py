@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+from tinydb import where
+
+from tinybridge import AIOBridge
+from tinybridge.locks import RWLock
+
+
+@pytest.mark.asyncio
+async def test_rwlock_readers_share():
+    lock = RWLock()
+    await lock.acquire_read()
+    await asyncio.wait_for(lock.acquire_read(), timeout=1)
+    assert lock.readers == 2
+    lock.release_read()
+    lock.release_read()
+    assert not lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_rwlock_writer_preference():
+    lock = RWLock()
+    order = []
+
+    async def reader(name):
+        async with lock.shared():
+            order.append(name)
+
+    async def writer(name):
+        async with lock.exclusive():
+            order.append(name)
+
+    await lock.acquire_read()
+    tasks = [
+        asyncio.ensure_future(writer("writer")),
+        asyncio.ensure_future(reader("late reader")),
+    ]
+    await asyncio.sleep(0)
+    assert order == []
+
+    lock.release_read()
+    await asyncio.gather(*tasks)
+    assert order == ["writer", "late reader"]
+
+
+@pytest.mark.asyncio
+async def test_rwlock_cancelled_waiter():
+    lock = RWLock()
+    await lock.acquire_write()
+    waiter = asyncio.ensure_future(lock.acquire_write())
+    reader = asyncio.ensure_future(lock.acquire_read())
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    lock.release_write()
+    await asyncio.wait_for(reader, timeout=1)
+    assert lock.readers == 1 and not lock._writer
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads(db_name, default_db):
+    def slow(value, _):
+        time.sleep(0.05)
+        return value == "Alice"
+
+    async with AIOBridge(db_name, concurrent_reads=True) as bridge:
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *[bridge.search(where("name").test(slow, i)) for i in range(4)]
+        )
+        elapsed = time.perf_counter() - started
+
+    assert all(len(result.ok()) == 1 for result in results)
+    # Serialized searches would take 4 * 3 * 0.05 seconds.
+    assert elapsed < 0.45
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_exclude_writers(db_name, default_db):
+    async with AIOBridge(db_name, concurrent_reads=True) as bridge:
+        results = await asyncio.gather(
+            bridge.insert({"name": "Bob"}),
+            bridge.count(where("name") == "Bob"),
+            bridge.remove(where("name") == "Bob"),
+            bridge.count(where("name") == "Bob"),
+        )
+        assert [result.ok() for result in results] == [4, 1, [4], 0]
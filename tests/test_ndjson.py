@@ -0,0 +1,82 @@
+import io
+import json
+
+import pytest
+from tinydb import where
+
+from tinybridge import AIOBridge
+
+
+@pytest.fixture
+def ndjson_file(tmp_path):
+    path = tmp_path / "import.ndjson"
+    lines = [json.dumps({"n": i, "id": 10 + i}) for i in range(25)]
+    lines.insert(5, "")
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.mark.asyncio
+async def test_import_file(db_name, default_db, ndjson_file):
+    progress = []
+    async with AIOBridge(db_name) as bridge:
+        result = await bridge.import_ndjson(
+            ndjson_file, chunk_size=10, progress=progress.append
+        )
+        assert result.ok() == 25
+        assert progress == [10, 20, 25]
+        assert (await bridge.count(where("n").exists())).ok() == 25
+        assert (await bridge.get(doc_id=4)).ok() == {"n": 0, "id": 10}
+
+
+@pytest.mark.asyncio
+async def test_import_ids_and_async_source(db_name):
+    async def source():
+        yield {"id": 7, "name": "Bob"}
+        yield '{"id": 3, "name": "Eve"}'
+        yield b'{"name": "Ann"}'
+
+    async with AIOBridge(db_name) as bridge:
+        users = (await bridge.table("users")).ok()
+        assert (await users.import_ndjson(source(), 2, id_field="id")).ok() == 3
+        assert (await users.get(doc_id=7)).ok() == {"name": "Bob"}
+        assert (await users.get(doc_id=3)).ok() == {"name": "Eve"}
+        assert (await users.get(doc_id=8)).ok() == {"name": "Ann"}
+
+
+@pytest.mark.asyncio
+async def test_import_invalid_line(db_name, tmp_path):
+    path = tmp_path / "broken.ndjson"
+    path.write_text('{"n": 1}\n{"n": 2}\n[3]\n')
+    async with AIOBridge(db_name) as bridge:
+        result = await bridge.import_ndjson(path, chunk_size=2)
+        assert "Line 3" in str(result.err())
+        # Chunks before the failing one stay imported.
+        assert (await bridge.count(where("n").exists())).ok() == 2
+
+        async with bridge.transaction() as tx:
+            result = await tx.import_ndjson(path, chunk_size=2)
+            assert result.is_err()
+            tx.rollback()
+        assert (await bridge.count(where("n").exists())).ok() == 2
+
+
+@pytest.mark.asyncio
+async def test_export_roundtrip(db_name, default_db, defaults, tmp_path):
+    path = tmp_path / "export.ndjson"
+    progress = []
+    async with AIOBridge(db_name) as bridge:
+        result = await bridge.export_ndjson(
+            path, chunk_size=2, id_field="_id", progress=progress.append
+        )
+        assert result.ok() == 3
+        assert progress == [2, 3]
+
+        target = io.StringIO()
+        assert (await bridge.export_ndjson(target, where("active") == True)).ok() == 2
+        names = [json.loads(line)["name"] for line in target.getvalue().splitlines()]
+        assert names == ["John", "Alice"]
+
+        copy = (await bridge.table("copy")).ok()
+        assert (await copy.import_ndjson(path, id_field="_id")).ok() == 3
+        assert (await copy.get(doc_id=2)).ok() == defaults[1]
@@ -5,9 +5,8 @@ from typing import Awaitable, Callable, List, Tuple, TypeVar
 import pytest
 from result import Result
 from tinydb import where
-from tinydb.table import Table
 
-from tinybridge import AIOBridge
+from tinybridge import AIOBridge, AIOTable
 
 T = TypeVar("T")
 
@@ -46,7 +45,8 @@ async def test_table(db_name):
     async with AIOBridge(db_name) as bridge:
         for result in await run_concurrently(bridge.table, "_default"):
             assert result.is_ok()
-            assert isinstance(result.ok(), Table)
+            assert isinstance(result.ok(), AIOTable)
+            assert result.ok().name == "_default"
 
 
 @pytest.mark.asyncio
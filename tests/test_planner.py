@@ -0,0 +1,108 @@
+import itertools
+
+import pytest
+from tinydb import Query, where
+
+from tinybridge import AIOBridge
+from tinybridge.planner import plan
+
+DOCUMENTS = [
+    {"name": "John", "age": 30, "tags": ["a"], "address": {"city": "Paris"}},
+    {"name": "Jane", "age": 25.5, "address": "unknown"},
+    {"name": "Alice", "age": None, "address": {"city": "Rome", "zip": 1}},
+    {"name": 7, "active": True},
+    {"age": 30, "active": 1},
+    {},
+]
+
+
+def leaves():
+    return [
+        where("name") == "John",
+        where("name") != "Jane",
+        where("age") >= 30,
+        where("age") < 28,
+        where("address").city == "Rome",
+        where("address").zip.exists(),
+        where("name").one_of(["Alice", 7]),
+        where("active") == True,
+        where("name").test(lambda value, prefix: str(value).startswith(prefix), "J"),
+    ]
+
+
+def safe(cond, document):
+    try:
+        return bool(cond(document))
+    except TypeError:
+        return TypeError
+
+
+def test_plan_matches_tinydb():
+    conds = leaves()
+    for a, b in itertools.combinations(conds, 2):
+        conds.extend([a & b, a | b, ~(a & ~b)])
+    conds.append(conds[0] & (conds[1] | conds[2]) & ~conds[3] & conds[8])
+
+    for cond in conds:
+        planned = plan(cond)
+        assert planned is not cond
+        assert planned == cond and hash(planned) == hash(cond)
+        for document in DOCUMENTS:
+            expected, actual = safe(cond, document), safe(planned, document)
+            # Reordering may skip a comparison that would have raised.
+            if expected is not TypeError:
+                assert actual == expected, (cond, document)
+
+
+def test_plan_passthrough():
+    User = Query()
+    unsupported = [
+        where("name").matches("J.*"),
+        where("tags").any(["a"]),
+        where("tags") == ["a"],
+        where("name").one_of([["a"]]),
+        Query().fragment({"age": 30}),
+        where("address").fragment({"city": "Rome"}),
+        User.name.map(str.lower) == "john",
+        (where("age") == 30) & where("name").search("o"),
+    ]
+    for cond in unsupported:
+        assert plan(cond) is cond
+    assert plan(None) is None
+    func = lambda document: True
+    assert plan(func) is func
+
+
+def test_plan_keeps_fragment_paths():
+    # TinyDB leaves the path out of a fragment's hash value.
+    cond = where("address").fragment({"city": "X"}) & (where("age") == 30)
+    nested = {"address": {"city": "X"}, "city": "Y", "age": 30}
+    top_level = {"address": {}, "city": "X", "age": 30}
+    assert plan(cond)(nested) is cond(nested) is True
+    assert plan(cond)(top_level) is cond(top_level) is False
+
+
+def test_plan_reorders_branches():
+    calls = []
+
+    def test(value):
+        calls.append(value)
+        return True
+
+    cond = where("name").test(test) & (where("age") == 30)
+    assert plan(cond)({"name": "Jane", "age": 25}) is False
+    assert calls == []
+    assert plan(cond)({"name": "John", "age": 30}) is True
+    assert calls == ["John"]
+
+
+@pytest.mark.asyncio
+async def test_planned_operations(db_name, default_db):
+    async with AIOBridge(db_name) as bridge:
+        cond = (where("active") == True) & (where("age") > 28)
+        assert [doc["name"] for doc in (await bridge.search(cond)).ok()] == ["John"]
+        assert (await bridge.count(cond | (where("city") == "Wonderland"))).ok() == 2
+        assert (await bridge.contains(~cond)).ok() is True
+        assert (await bridge.update({"age": 31}, cond)).ok() == [1]
+        assert (await bridge.remove(where("age") < 26)).ok() == [2]
+        assert (await bridge.count(where("age").exists())).ok() == 2
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from tinydb import where
+
+from tinybridge import AIOBridge, priority
+from tinybridge.locks import RWLock
+
+from .conftest import slow
+
+
+@pytest.mark.asyncio
+async def test_rwlock_priority():
+    lock = RWLock()
+    order = []
+
+    async def writer(name, rank):
+        await lock.acquire_write(rank)
+        order.append(name)
+        lock.release_write()
+
+    await lock.acquire_write()
+    tasks = [
+        asyncio.ensure_future(writer("low", -1)),
+        asyncio.ensure_future(writer("normal", 0)),
+        asyncio.ensure_future(writer("high", 1)),
+        asyncio.ensure_future(writer("high 2", 1)),
+    ]
+    await asyncio.sleep(0)
+    with pytest.raises(asyncio.TimeoutError):
+        await lock.acquire_write(timeout=0.01)
+    lock.release_write()
+    await asyncio.gather(*tasks)
+    assert order == ["high", "high 2", "normal", "low"]
+    assert not lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_interactive_lane_first(db_name, default_db):
+    order = []
+
+    async def run(bridge, name, op):
+        await op
+        order.append(name)
+
+    async with AIOBridge(db_name, priority="batch") as bridge:
+        blocker = asyncio.ensure_future(bridge.count(where("name").test(slow)))
+        await asyncio.sleep(0.02)
+        tasks = [
+            asyncio.ensure_future(run(bridge, f"batch {i}", bridge.all()))
+            for i in range(3)
+        ]
+        with priority("interactive"):
+            tasks.append(
+                asyncio.ensure_future(run(bridge, "get", bridge.get(doc_id=1)))
+            )
+        await asyncio.gather(blocker, *tasks)
+    assert order == ["get", "batch 0", "batch 1", "batch 2"]
+
+    with pytest.raises(ValueError):
+        AIOBridge(db_name, priority="urgent")
+    with pytest.raises(ValueError):
+        with priority("urgent"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_lane_limits(db_name, default_db):
+    running = {"batch": 0, "normal": 0}
+    peak = {"batch": 0, "normal": 0}
+    mutex = threading.Lock()
+
+    def tracked(lane):
+        def test(value):
+            with mutex:
+                running[lane] += 1
+                peak[lane] = max(peak[lane], running[lane])
+            time.sleep(0.05)
+            with mutex:
+                running[lane] -= 1
+            return True
+
+        return test
+
+    async with AIOBridge(
+        db_name, concurrent_reads=True, lane_limits={"batch": 1}
+    ) as bridge:
+        count = lambda lane: bridge.count(where("age").test(tracked(lane)))
+        calls = [asyncio.ensure_future(count("normal")) for _ in range(3)]
+        with priority("batch"):
+            calls += [asyncio.ensure_future(count("batch")) for _ in range(3)]
+        results = await asyncio.gather(*calls)
+    assert all(result.ok() == 3 for result in results)
+    assert peak == {"batch": 1, "normal": 3}
+
+    with pytest.raises(ValueError):
+        AIOBridge(db_name, lane_limits={"batch": 0})
+
+
+@pytest.mark.asyncio
+async def test_drop_expired(db_name, default_db):
+    calls = []
+
+    def record(value):
+        calls.append(value)
+        return True
+
+    async with AIOBridge(db_name) as bridge:
+        impatient = AIOBridge(db_name, timeout=0.05, drop_expired=True)
+        blocker = asyncio.ensure_future(bridge.count(where("name").test(slow)))
+        await asyncio.sleep(0.02)
+        result = await impatient.count(where("name").test(record))
+        assert isinstance(result.err(), asyncio.TimeoutError)
+        assert (await blocker).ok() == 3
+        assert calls == []
+        assert bridge.stats.methods["count"].expired == 1
+        await impatient.close()
@@ -0,0 +1,126 @@
+import json
+import os
+
+import pytest
+from tinydb import where
+from tinydb.storages import MemoryStorage
+from tinydb.table import Document
+
+from tinybridge import ShardedAIOBridge
+
+
+@pytest.fixture
+def shard_paths(tmp_path):
+    return [os.path.join(tmp_path, f"shard{i}.json") for i in range(3)]
+
+
+def stored(path):
+    with open(path, "r") as file:
+        return json.load(file).get("_default", {})
+
+
+@pytest.mark.asyncio
+async def test_sharded_round_robin(shard_paths, defaults, users):
+    async with ShardedAIOBridge(shard_paths) as bridge:
+        doc_ids = (await bridge.insert_multiple(defaults + users)).ok()
+        assert doc_ids == [1, 2, 3, 4, 5]
+        assert [len(stored(path)) for path in shard_paths] == [2, 2, 1]
+
+        assert (await bridge.all()).ok() == defaults + users
+        assert (await bridge.get(doc_id=5)).ok() == users[1]
+        found = (await bridge.get(doc_ids=[4, 1, 9])).ok()
+        assert [doc.doc_id for doc in found] == [4, 1]
+        assert (await bridge.count(where("active") == True)).ok() == 3
+        assert (await bridge.insert({"name": "Zoe"})).ok() == 6
+
+        assert (await bridge.update({"age": 1}, doc_ids=[2, 6])).ok() == [2, 6]
+        assert (await bridge.remove(where("age") == 1)).ok() == [2, 6]
+        assert (await bridge.contains(doc_id=2)).ok() is False
+        assert (await bridge.get(where("city") == "Chicago")).ok().doc_id == 4
+
+
+@pytest.mark.asyncio
+async def test_sharded_by_key(shard_paths, defaults):
+    async with ShardedAIOBridge(shard_paths, shard_key="name") as bridge:
+        doc_ids = (await bridge.insert_multiple(defaults * 4)).ok()
+        assert len(set(doc_ids)) == 12
+
+        john = (await bridge.search(where("name") == "John")).ok()
+        assert len(john) == 4
+        shards = {(doc.doc_id - 1) % 3 for doc in john}
+        assert len(shards) == 1
+        # Equality on the shard key only queries the shard holding the key.
+        other = [bridge.shards[i] for i in range(3) if i not in shards]
+        assert all("search" not in shard.stats.methods for shard in other)
+
+        assert isinstance((await bridge.insert({"age": 1})).err(), KeyError)
+        upserted = await bridge.upsert(
+            {"name": "John", "age": 99}, where("name") == "John"
+        )
+        assert sorted(upserted.ok()) == sorted(doc.doc_id for doc in john)
+
+
+@pytest.mark.asyncio
+async def test_sharded_by_numeric_key(shard_paths):
+    async with ShardedAIOBridge(shard_paths, shard_key="k") as bridge:
+        values = [1, 1.0, True, 2, 2.0, [1, True], [1.0, 1]]
+        await bridge.insert_multiple([{"k": value} for value in values])
+
+        assert (await bridge.count(where("k") == 1)).ok() == 3
+        assert (await bridge.count(where("k") == 2.0)).ok() == 2
+        assert (await bridge.count(where("k") == [1, 1])).ok() == 2
+
+
+@pytest.mark.asyncio
+async def test_sharded_in_memory():
+    async with ShardedAIOBridge([None] * 3, storage=MemoryStorage) as bridge:
+        await bridge.insert_multiple([{"c": "X"}, {"c": "Y"}, {"c": "X"}])
+        assert (await bridge.create_index("c")).is_ok()
+        assert [
+            doc.doc_id for doc in (await bridge.search(where("c") == "X")).ok()
+        ] == [
+            1,
+            3,
+        ]
+        assert len({id(shard.lock) for shard in bridge.shards}) == 3
+
+
+@pytest.mark.asyncio
+async def test_sharded_tables_and_ids(shard_paths):
+    async with ShardedAIOBridge(shard_paths) as bridge:
+        users = (await bridge.table("users")).ok()
+        assert (await users.insert(Document({"name": "Bob"}, doc_id=8))).ok() == 8
+        assert (await users.get(doc_id=8)).ok() == {"name": "Bob"}
+        assert (await bridge.tables()).ok() == {"users"}
+
+        batches = [batch.ok() async for batch in users.iter_all(batch_size=1)]
+        assert [doc.doc_id for batch in batches for doc in batch] == [8]
+
+        assert (await bridge.drop_tables()).is_ok()
+        assert (await users.count(where("name") == "Bob")).ok() == 0
+
+
+@pytest.mark.asyncio
+async def test_sharded_explicit_id_checks_key(shard_paths):
+    async with ShardedAIOBridge(shard_paths, shard_key="name") as bridge:
+        doc_id = (await bridge.insert({"name": "John"})).ok()
+        wrong = Document({"name": "John"}, doc_id=doc_id + 1)
+        assert isinstance((await bridge.insert(wrong)).err(), ValueError)
+        result = await bridge.insert_multiple([{"name": "Jane"}, wrong])
+        assert isinstance(result.err(), ValueError)
+
+        right = Document({"name": "John"}, doc_id=doc_id + 3)
+        assert (await bridge.insert(right)).ok() == doc_id + 3
+        john = (await bridge.search(where("name") == "John")).ok()
+        assert [doc.doc_id for doc in john] == [doc_id, doc_id + 3]
+        assert (await bridge.count(where("name") == "John")).ok() == 2
+        assert len((await bridge.all()).ok()) == 2
+
+
+@pytest.mark.asyncio
+async def test_sharded_unhashable_key(shard_paths):
+    async with ShardedAIOBridge(shard_paths, shard_key="k") as bridge:
+        assert isinstance((await bridge.insert({"k": {1, 2}})).err(), TypeError)
+        result = await bridge.insert_multiple([{"k": 1}, {"k": object()}])
+        assert isinstance(result.err(), TypeError)
+        assert (await bridge.count(where("k") == 1)).ok() == 0
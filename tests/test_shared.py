@@ -0,0 +1,83 @@
+import pytest
+from tinydb import TinyDB, where
+
+from tinybridge import AIOBridge
+
+from .conftest import count_hops
+
+
+class CountingTinyDB(TinyDB):
+    """
+    TinyDB class that counts how many times it was instantiated.
+    """
+
+    opened = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingTinyDB.opened += 1
+        super().__init__(*args, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def reset_opened():
+    CountingTinyDB.opened = 0
+
+
+@pytest.mark.asyncio
+async def test_shared_instance(db_name, default_db):
+    first = AIOBridge(db_name, shared=True, tinydb_class=CountingTinyDB)
+    second = AIOBridge(db_name, shared=True, tinydb_class=CountingTinyDB)
+    assert CountingTinyDB.opened == 0
+
+    async with first, second:
+        assert (await first.count(where("name") == "Bob")).ok() == 0
+        assert (await second.insert({"name": "Bob"})).ok() == 4
+        # No stale query cache or document ID in the other bridge.
+        assert (await first.count(where("name") == "Bob")).ok() == 1
+        assert (await first.insert({"name": "Eve"})).ok() == 5
+
+        assert first.db is second.db
+        assert CountingTinyDB.opened == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_instance_closed_by_last_bridge(db_name, default_db):
+    first = AIOBridge(db_name, shared=True)
+    async with AIOBridge(db_name, shared=True) as second:
+        db = second.db
+        assert (await first.close()).is_ok()
+        assert (await first.close()).is_ok()
+        assert not db.storage._handle.closed
+        assert (await second.count(where("name") == "John")).ok() == 1
+
+    assert db.storage._handle.closed
+    async with AIOBridge(db_name, shared=True) as third:
+        assert third.db is not db
+        assert (await third.count(where("name") == "John")).ok() == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_instance_closed_before_use(db_name, default_db):
+    bridge = AIOBridge(db_name, shared=True)
+    assert (await bridge.close()).is_ok()
+
+    assert isinstance((await bridge.insert({"name": "Bob"})).err(), RuntimeError)
+    assert isinstance((await bridge.tables()).err(), RuntimeError)
+    batches = [batch async for batch in bridge.iter_all()]
+    assert [type(batch.err()) for batch in batches] == [RuntimeError]
+    results = await bridge.batch().count(where("name") == "John").execute()
+    assert isinstance(results[0].err(), RuntimeError)
+
+
+@pytest.mark.asyncio
+async def test_shared_instance_opened_in_thread(db_name, default_db):
+    async with AIOBridge(db_name, shared=True, tinydb_class=CountingTinyDB) as bridge:
+        with count_hops() as to_thread:
+            assert (await bridge.count(where("name") == "John")).ok() == 1
+        assert CountingTinyDB.opened == 1
+        assert to_thread.call_count == 2
+
+
+def test_shared_requires_path():
+    with pytest.raises(ValueError):
+        AIOBridge(None, shared=True)
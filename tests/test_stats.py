@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from tinydb import where
+
+from tinybridge import AIOBridge
+
+from .conftest import slow
+
+
+@pytest.mark.asyncio
+async def test_stats_counts(db_name, default_db):
+    async with AIOBridge(db_name) as bridge:
+        await bridge.insert({"name": "Bob"})
+        await bridge.search(where("name") == "Bob")
+        await bridge.search(where("name").test(lambda value: 1 / 0))
+        await bridge.tables()
+
+        stats = bridge.stats.snapshot()
+
+    methods = stats["methods"]
+    assert methods["insert"]["calls"] == 1
+    assert methods["search"]["calls"] == 2
+    assert methods["search"]["errors"] == 1
+    assert methods["tables"]["calls"] == 1
+    for phase in ("lock_wait", "queue", "execution"):
+        assert methods["search"][phase]["count"] == 2
+    assert stats["waiting"] == stats["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stats_lock_wait_and_timeouts(db_name, default_db):
+    async with AIOBridge(db_name, timeout=0.05) as bridge:
+        results = await asyncio.gather(
+            bridge.count(where("name").test(slow)),
+            bridge.count(where("name") == "John"),
+        )
+        assert isinstance(results[0].err(), asyncio.TimeoutError)
+        assert results[1].ok() == 1
+
+        count = bridge.stats.methods["count"]
+        assert count.calls == 2 and count.timeouts == 1
+        assert count.lock_wait.max >= 0.04
+        # The timed out operation reports its execution time once it ends.
+        await asyncio.sleep(0.4)
+        assert count.execution.count == 2
+        assert count.execution.max >= 0.3
+
+
+@pytest.mark.asyncio
+async def test_stats_hooks(db_name, default_db):
+    records = []
+
+    def broken(record):
+        raise RuntimeError("hook failure")
+
+    async with AIOBridge(db_name, max_workers=1, max_pending=1) as bridge:
+        bridge.stats.add_hook(broken)
+        bridge.stats.add_hook(records.append)
+        results = await asyncio.gather(
+            bridge.count(where("name").test(slow)), bridge.get(doc_id=1)
+        )
+        assert results[0].ok() == 3
+        bridge.stats.remove_hook(records.append)
+        bridge.stats.remove_hook(broken)
+        await bridge.all()
+
+    assert [(record.method, record.outcome) for record in records] == [
+        ("get", "rejected"),
+        ("count", "ok"),
+    ]
+    assert records[0].lock_wait is None
+    assert records[1].execution >= 0.1
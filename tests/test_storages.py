@@ -0,0 +1,273 @@
+import importlib.util
+import json
+import os
+from typing import Type, cast
+
+import pytest
+from tinydb import TinyDB, where
+from tinydb.operations import add
+from tinydb.storages import JSONStorage
+
+from tinybridge import AIOBridge, storages
+from tinybridge.storages import AppendLogStorage, FastJSONStorage, MMapStorage
+
+BACKENDS = [
+    "json",
+    pytest.param(
+        "orjson",
+        marks=pytest.mark.skipif(
+            not importlib.util.find_spec("orjson"), reason="orjson is not installed"
+        ),
+    ),
+    pytest.param(
+        "msgspec",
+        marks=pytest.mark.skipif(
+            not importlib.util.find_spec("msgspec"), reason="msgspec is not installed"
+        ),
+    ),
+]
+
+
+def read_log(db_name):
+    with open(f"{db_name}.log", "r") as file:
+        return [json.loads(line) for line in file]
+
+
+@pytest.mark.asyncio
+async def test_append_log_storage(db_name, default_db, defaults):
+    async with AIOBridge(db_name, storage=AppendLogStorage) as bridge:
+        size = os.path.getsize(db_name)
+        assert (await bridge.all()).ok() == defaults
+
+        assert (await bridge.insert({"name": "Bob", "tags": []})).ok() == 4
+        assert (await bridge.update(add("tags", ["new"]), doc_ids=[4])).is_ok()
+        assert (await bridge.remove(where("name") == "Jane")).ok() == [2]
+
+        assert os.path.getsize(db_name) == size
+        assert read_log(db_name) == [
+            {"t": "_default", "set": {"4": {"name": "Bob", "tags": []}}},
+            {"t": "_default", "set": {"4": {"name": "Bob", "tags": ["new"]}}},
+            {"t": "_default", "del": ["2"]},
+        ]
+
+    with TinyDB(db_name, storage=AppendLogStorage) as db:
+        assert [doc["name"] for doc in db.all()] == ["John", "Alice", "Bob"]
+        assert db.get(doc_id=4)["tags"] == ["new"]
+
+
+def test_append_log_tables(db_name, multitable_db):
+    with TinyDB(db_name, storage=AppendLogStorage) as db:
+        db.table("_users").insert({"name": "Dan"})
+        db.drop_table("_default")
+        db.table("empty", persist_empty=True)
+
+    assert read_log(db_name) == [
+        {"t": "_users", "set": {"3": {"name": "Dan"}}},
+        {"t": "_default", "drop": True},
+        {"t": "empty", "set": {}},
+    ]
+    with TinyDB(db_name, storage=AppendLogStorage) as db:
+        assert db.tables() == {"_users", "empty"}
+        assert len(db.table("_users")) == 3
+
+
+def test_append_log_compaction(db_name):
+    with TinyDB(db_name, storage=AppendLogStorage, compact_threshold=200) as db:
+        for i in range(20):
+            db.insert({"value": i})
+
+    # Compacted in the background once the log passed 200 bytes.
+    with open(db_name, "r") as file:
+        assert len(json.load(file)["_default"]) > 0
+    with TinyDB(db_name, storage=AppendLogStorage) as db:
+        assert len(db) == 20
+        db.storage.compact()
+        assert os.path.getsize(f"{db_name}.log") == 0
+
+    with open(db_name, "r") as file:
+        assert len(json.load(file)["_default"]) == 20
+
+
+def test_append_log_failed_update(db_name, default_db):
+    def bump(document):
+        document["age"] = 99
+        if document["name"] == "Jane":
+            raise ValueError("boom")
+
+    with TinyDB(db_name, storage=AppendLogStorage) as db:
+        with pytest.raises(ValueError):
+            db.update(bump)
+        assert [document["age"] for document in db.all()] == [30, 25, 28]
+        db.insert({"name": "Bob", "age": 40})
+
+    with TinyDB(db_name, storage=AppendLogStorage) as db:
+        assert [document["age"] for document in db.all()] == [30, 25, 28, 40]
+
+
+def test_append_log_torn_write(db_name, default_db):
+    with TinyDB(db_name, storage=AppendLogStorage) as db:
+        db.insert({"name": "Bob"})
+
+    with open(f"{db_name}.log", "a") as file:
+        file.write('{"t": "_default", "set": {"5"')
+
+    with TinyDB(db_name, storage=AppendLogStorage) as db:
+        assert len(db) == 4
+        db.insert({"name": "Eve"})
+
+    assert len(read_log(db_name)) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", BACKENDS)
+async def test_fast_json_storage(db_name, multitable_db, defaults, backend):
+    async with AIOBridge(db_name, storage=FastJSONStorage, backend=backend) as bridge:
+        assert bridge.db.storage.backend == backend
+        assert (await bridge.all()).ok() == defaults
+
+        users = (await bridge.table("_users")).ok()
+        assert (await users.insert({"name": "Zoë"})).ok() == 3
+        assert (await bridge.remove(doc_ids=[1])).ok() == [1]
+
+    with open(db_name, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    assert data["_users"]["3"] == {"name": "Zoë"}
+    assert list(data["_default"]) == ["2", "3"]
+
+
+def test_fast_json_storage_encodes_changed_tables(db_name, multitable_db):
+    with TinyDB(db_name, storage=FastJSONStorage) as db:
+        encoded = []
+        dumps = db.storage._dumps
+        db.storage._dumps = lambda obj: encoded.append(obj) or dumps(obj)
+
+        # The first write after loading the file encodes every table.
+        db.table("_users").insert({"name": "Dan"})
+        assert len([obj for obj in encoded if isinstance(obj, dict)]) == 2
+
+        encoded.clear()
+        db.table("_users").update({"active": True}, where("name") == "Dan")
+        db.table("_users").insert({"name": "Eve"})
+
+    tables = [obj for obj in encoded if isinstance(obj, dict)]
+    assert [sorted(table) for table in tables] == [
+        ["1", "2", "3"],
+        ["1", "2", "3", "4"],
+    ]
+
+
+def test_fast_json_storage_outside_changes(db_name, default_db):
+    with TinyDB(db_name, storage=FastJSONStorage) as db:
+        assert len(db) == 3
+        with TinyDB(db_name) as other:
+            other.insert({"name": "Bob", "note": "written elsewhere"})
+        assert db.get(doc_id=4)["name"] == "Bob"
+
+
+def test_fast_json_storage_read_only(db_name, default_db):
+    with TinyDB(db_name, storage=FastJSONStorage, access_mode="r") as db:
+        with pytest.raises(IOError):
+            db.insert({"name": "Bob"})
+        assert len(db) == 3
+
+    with pytest.raises(ValueError):
+        FastJSONStorage(db_name, backend="yaml")
+
+
+def test_fast_json_storage_failed_update(db_name, default_db):
+    def bump(document):
+        if document["name"] == "Jane":
+            raise ValueError("boom")
+        document["age"] += 100
+
+    with TinyDB(db_name, storage=FastJSONStorage) as db:
+        with pytest.raises(ValueError):
+            db.update(bump)
+        assert [document["age"] for document in db.all()] == [30, 25, 28]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_fast_json_storage_matches_json_storage(db_name, backend):
+    documents = [{"counts": {1: 10}}, {"big": 2**70}, {"ratio": float("nan")}]
+    with TinyDB(db_name, storage=FastJSONStorage, backend=backend) as db:
+        db.insert_multiple(documents)
+        db.insert({"name": "Bob", "note": None})
+        fast = db.all()
+    with open(db_name, "r", encoding="utf-8") as file:
+        content = file.read()
+    with TinyDB(db_name) as db:
+        plain = db.all()
+
+    assert "NaN" in content
+    assert plain[:2] == [{"counts": {"1": 10}}, {"big": 2**70}]
+    assert fast[:2] == plain[:2]
+    assert fast[2]["ratio"] != fast[2]["ratio"]
+    assert plain[2]["ratio"] != plain[2]["ratio"]
+    assert fast[3] == plain[3] == {"name": "Bob", "note": None}
+
+
+@pytest.mark.parametrize("binary", ["msgpack", "pickle"])
+def test_non_finite_detection(monkeypatch, binary):
+    if binary == "pickle":
+        monkeypatch.setattr(storages, "msgspec", None)
+    elif storages.msgspec is None:
+        pytest.skip("msgspec is not installed")
+
+    assert not storages._non_finite({"a": [None, "nullable", 1.5, 2**62, 1e308]})
+    for value in (float("nan"), float("inf"), -float("inf")):
+        assert storages._non_finite({"a": {"b": [None, value]}})
+
+
+class MMapTinyDB(TinyDB):
+    # TinyDB declares the attribute as `JSONStorage`, though any storage works.
+    default_storage_class = cast(Type[JSONStorage], MMapStorage)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", BACKENDS)
+async def test_mmap_storage(db_name, multitable_db, defaults, users, backend):
+    async with AIOBridge(db_name, tinydb_class=MMapTinyDB, backend=backend) as bridge:
+        assert os.path.exists(f"{db_name}.mmap")
+        table = bridge.db.storage.read()["_default"]
+        assert (await bridge.get(doc_id=2)).ok() == defaults[1]
+        assert list(table._documents) == ["2"]
+
+        assert (await bridge.tables()).ok() == {"_default", "_users"}
+        assert (await bridge.count(where("active") == True)).ok() == 2
+        assert (await bridge.get(doc_id=9)).ok() is None
+        other = (await bridge.table("_users")).ok()
+        assert (await other.all()).ok() == users
+
+        assert isinstance((await bridge.insert({"name": "Bob"})).err(), IOError)
+
+
+def test_mmap_storage_bounded_cache(db_name, default_db, defaults):
+    with TinyDB(db_name, storage=MMapStorage, cache_size=2) as db:
+        assert db.all() == defaults
+        table = db.storage.read()["_default"]
+        assert list(table._documents) == ["2", "3"]
+        assert db.get(doc_id=1) == defaults[0]
+        assert list(table._documents) == ["3", "1"]
+
+
+def test_mmap_storage_failed_update(db_name, default_db):
+    with TinyDB(db_name, storage=MMapStorage) as db:
+        assert db.get(doc_id=1)["age"] == 30
+        with pytest.raises(OSError):
+            db.update({"age": 99}, doc_ids=[1])
+        with pytest.raises(OSError):
+            db.update(add("age", 1), where("name") == "Jane")
+
+        assert db.get(doc_id=1)["age"] == 30
+        assert db.search(where("age") == 99) == []
+        assert db.get(doc_id=2)["age"] == 25
+
+
+def test_mmap_storage_rebuilds_stale_file(db_name, default_db):
+    MMapStorage.build(db_name)
+    with TinyDB(db_name) as db:
+        db.insert({"name": "Bob"})
+
+    with TinyDB(db_name, storage=MMapStorage) as db:
+        assert len(db) == 4
+        assert db.get(doc_id=4)["name"] == "Bob"
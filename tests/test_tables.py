@@ -0,0 +1,80 @@
+import asyncio
+import json
+import time
+
+import pytest
+from tinydb import where
+
+from tinybridge import AIOBridge
+
+
+@pytest.mark.asyncio
+async def test_table_proxy(db_name, multitable_db, users):
+    async with AIOBridge(db_name) as bridge:
+        users_table = (await bridge.table("_users")).ok()
+        assert users_table is (await bridge.table("_users")).ok()
+
+        assert (await users_table.all()).ok() == users
+        assert (await users_table.insert({"name": "Dan"})).ok() == 3
+        assert (await users_table.count(where("active") == True)).ok() == 1
+        assert (await bridge.count(where("name") == "Dan")).ok() == 0
+
+    with open(db_name, "r") as file:
+        data = json.load(file)
+    assert data["_users"]["3"] == {"name": "Dan"}
+    assert len(data["_default"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_table_proxy_after_drop(db_name, multitable_db):
+    async with AIOBridge(db_name) as bridge:
+        users_table = (await bridge.table("_users")).ok()
+        assert (await users_table.search(where("name") == "Bob")).ok()
+
+        assert (await bridge.drop_tables()).is_ok()
+        assert (await users_table.search(where("name") == "Bob")).ok() == []
+        assert (await users_table.insert({"name": "Bob"})).ok() == 1
+        assert (await bridge.insert({"name": "Eve"})).ok() == 1
+
+
+@pytest.mark.asyncio
+async def test_table_locks_parallel_reads(db_name, multitable_db):
+    def slow(value, _):
+        time.sleep(0.05)
+        return False
+
+    async with AIOBridge(db_name, table_locks=True) as bridge:
+        users_table = (await bridge.table("_users")).ok()
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            bridge.search(where("name").test(slow, 1)),
+            users_table.search(where("name").test(slow, 2)),
+        )
+        elapsed = time.perf_counter() - started
+
+    assert all(result.ok() == [] for result in results)
+    # Serialized searches would take 5 * 0.05 seconds.
+    assert elapsed < 0.2
+
+
+@pytest.mark.asyncio
+async def test_table_locks_writes(db_name, multitable_db):
+    async with AIOBridge(db_name, table_locks=True) as bridge:
+        users_table = (await bridge.table("_users")).ok()
+        results = await asyncio.gather(
+            *[bridge.insert({"name": f"default {i}"}) for i in range(10)],
+            *[users_table.insert({"name": f"user {i}"}) for i in range(10)],
+            bridge.count(where("name").exists()),
+        )
+        assert all(result.is_ok() for result in results)
+        assert (await bridge.drop_table("_users")).is_ok()
+        assert (await bridge.tables()).ok() == {"_default"}
+
+    with open(db_name, "r") as file:
+        data = json.load(file)
+    assert len(data["_default"]) == 13
+
+
+def test_table_locks_interprocess(db_name):
+    with pytest.raises(ValueError):
+        AIOBridge(db_name, table_locks=True, interprocess=True)
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from tinydb import where
+
+from tinybridge import AIOBridge
+
+from .conftest import slow
+
+
+@pytest.mark.asyncio
+async def test_timeout(db_name, default_db):
+    async with AIOBridge(db_name, timeout=0.05) as bridge:
+        result = await bridge.count(where("name").test(slow, 0.3))
+        assert isinstance(result.err(), asyncio.TimeoutError)
+        assert not bridge.lock.locked()
+        assert bridge.zombies == 1
+
+        # The query keeps sleeping in its thread, once per document.
+        for _ in range(40):
+            if not bridge.zombies:
+                break
+            await asyncio.sleep(0.05)
+        assert bridge.zombies == 0
+
+
+@pytest.mark.asyncio
+async def test_safe_timeout_keeps_lock(db_name, default_db):
+    async with AIOBridge(db_name, timeout=0.05, safe_timeout=True) as bridge:
+        result = await bridge.update({"age": 50}, where("name").test(slow, 0.3))
+        assert isinstance(result.err(), asyncio.TimeoutError)
+        assert bridge.lock.locked()
+        assert bridge.zombies == 1
+
+        async with bridge.lock:
+            assert bridge.zombies == 0
+
+        result = await bridge.count(where("age") == 50)
+        assert result.ok() == 3
+
+
+@pytest.mark.asyncio
+async def test_safe_timeout_on_cancellation(db_name, default_db):
+    async with AIOBridge(db_name, safe_timeout=True) as bridge:
+        task = asyncio.ensure_future(bridge.count(where("name").test(slow, 0.3)))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert bridge.lock.locked()
+        assert bridge.zombies == 1
+        result = await bridge.count(where("name") == "John")
+        assert result.ok() == 1
+        assert bridge.zombies == 0
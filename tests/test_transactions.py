@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+import pytest
+from tinydb import where
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import JSONStorage, MemoryStorage
+
+from tinybridge import AIOBridge, AIOTable
+
+from .conftest import CountingStorage, CountingTinyDB, slow
+
+
+@pytest.mark.asyncio
+async def test_transaction_commit(db_name, multitable_db):
+    async with AIOBridge(db_name, tinydb_class=CountingTinyDB) as bridge:
+        async with bridge.transaction() as tx:
+            assert not isinstance(tx, AIOTable)
+            assert (await tx.insert({"name": "Bob"})).ok() == 4
+            assert (await tx.update({"age": 31}, where("name") == "John")).ok() == [1]
+            users = (await tx.table("_users")).ok()
+            assert isinstance(users, AIOTable)
+            assert (await users.remove(doc_ids=[1])).ok() == [1]
+            # Operations see the staged writes.
+            assert (await tx.count(where("name") == "Bob")).ok() == 1
+            assert (await users.count(where("name") == "Bob")).ok() == 0
+            assert CountingStorage.writes == 0
+        assert CountingStorage.writes == 1
+
+        assert (await bridge.get(doc_id=1)).ok()["age"] == 31
+
+    with open(db_name, "r") as file:
+        data = json.load(file)
+    assert data["_default"]["4"] == {"name": "Bob"}
+    assert list(data["_users"]) == ["2"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("storage", [JSONStorage, CachingMiddleware(JSONStorage)])
+async def test_transaction_rollback_on_error(db_name, default_db, storage):
+    async with AIOBridge(db_name, storage=storage) as bridge:
+        await bridge.get(doc_id=1)
+        with pytest.raises(RuntimeError):
+            async with bridge.transaction() as tx:
+                await tx.insert({"name": "Bob"})
+                await tx.update({"age": 99}, doc_ids=[1])
+                raise RuntimeError("abort")
+
+        assert (await bridge.get(doc_id=1)).ok()["age"] == 30
+        assert (await bridge.count(where("name") == "Bob")).ok() == 0
+        # The discarded insert does not leave a gap in document IDs.
+        assert (await bridge.insert({"name": "Eve"})).ok() == 4
+
+
+@pytest.mark.asyncio
+async def test_transaction_rollback_in_memory():
+    async with AIOBridge(None, storage=MemoryStorage, execution="auto") as bridge:
+        await bridge.insert({"name": "John", "tags": ["a"]})
+        async with bridge.transaction() as tx:
+            await tx.update(lambda doc: doc["tags"].append("b"), doc_ids=[1])
+            assert (await tx.get(doc_id=1)).ok()["tags"] == ["a", "b"]
+            tx.rollback()
+
+        assert (await bridge.get(doc_id=1)).ok()["tags"] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_transaction_isolation(db_name, default_db):
+    async with AIOBridge(db_name) as bridge:
+
+        async def increment():
+            async with bridge.transaction() as tx:
+                age = (await tx.get(doc_id=1)).ok()["age"]
+                await asyncio.sleep(0.01)
+                await tx.update({"age": age + 1}, doc_ids=[1])
+
+        async def read():
+            await asyncio.sleep(0.005)
+            return (await bridge.get(doc_id=1)).ok()["age"]
+
+        results = await asyncio.gather(*[increment() for _ in range(5)], read())
+        assert results[-1] in (30, 31, 32, 33, 34, 35)
+        assert (await bridge.get(doc_id=1)).ok()["age"] == 35
+
+
+@pytest.mark.asyncio
+async def test_transaction_timeout_rolls_back(db_name, default_db):
+    async with AIOBridge(db_name, timeout=0.05) as bridge:
+        async with bridge.transaction() as tx:
+            await tx.insert({"name": "Bob"})
+            result = await tx.count(where("name").test(slow))
+            assert isinstance(result.err(), asyncio.TimeoutError)
+            assert (await tx.all()).err() is result.err()
+            assert tx.rolled_back
+
+        assert (await bridge.count(where("name") == "Bob")).ok() == 0
+        assert bridge.stats.methods["transaction"].calls == 1
@@ -1,3 +1,22 @@
-from .aiobridge import AIOBridge
+from .aiobridge import AIOBridge, BridgeBusyError
+from .batch import Batch
+from .changes import Change, Subscription
+from .locks import RWLock
+from .scheduler import priority
+from .sharding import ShardedAIOBridge, ShardedTable
+from .table import AIOTable
+from .transaction import Transaction
 
-__all__ = ["AIOBridge"]
+__all__ = [
+    "AIOBridge",
+    "AIOTable",
+    "Batch",
+    "BridgeBusyError",
+    "Change",
+    "RWLock",
+    "ShardedAIOBridge",
+    "ShardedTable",
+    "Subscription",
+    "Transaction",
+    "priority",
+]
@@ -1,10 +1,19 @@
 # AIOBridge implementation
 
 import asyncio
+import contextlib
+import contextvars
 import functools
+import os
+import threading
 import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
     Callable,
+    Dict,
     Hashable,
     Iterable,
     List,
@@ -13,18 +22,94 @@ from typing import (
     Sequence,
     Set,
     Tuple,
+    Type,
     TypeVar,
     Union,
 )
 
 from result import Err, Ok, Result
 from tinydb import TinyDB
+from tinydb.middlewares import CachingMiddleware
 from tinydb.queries import QueryLike
-from tinydb.table import Document, Table
+from tinydb.table import Document
+
+from .batch import IN_PLACE, READS, Batch, Operation
+from .cache import Generations, ResultCache
+from .changes import Change, ChangeFeed, Subscription
+from .indexes import TableIndexes
+from .locks import FileLock, RWLock
+from .ndjson import Source, Target
+from .planner import plan
+from .scheduler import LANES, LaneLimits, check_lane, current_lane
+from .stats import OperationRecord, PathStats
+from .table import AIOTable
+from .transaction import Transaction
+from .utils import (
+    StagingBuffer,
+    WriteBuffer,
+    cache_writes,
+    guard_query_cache,
+    in_memory,
+    reload_db,
+    serialize_storage,
+)
 
 T = TypeVar("T")
 
 
+class BridgeBusyError(Exception):
+    """Raised when a path already has `max_pending` operations in flight."""
+
+
+def _open(tinydb_class: Type[TinyDB], cache: bool, **kwargs) -> TinyDB:
+    """Open a TinyDB instance, keeping its writes in memory if `cache` is set."""
+    db = tinydb_class(**kwargs)
+    if cache:
+        cache_writes(db)
+    return db
+
+
+class _PathState:
+    """State shared by every bridge on the same path, or of a bridge without one."""
+
+    def __init__(self):
+        self.lock = RWLock()
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.inflight = 0
+        self.zombies = 0
+        self.file_lock: Optional[FileLock] = None
+        self.indexes: Dict[str, TableIndexes] = {}
+        self.writer = RWLock()
+        self.tables: Dict[str, RWLock] = {}
+        self.generations = Generations()
+        self.stats = PathStats()
+        self.feed = ChangeFeed()
+        self.lanes = LaneLimits()
+        self.db: Optional[TinyDB] = None
+        self.opener: Optional[Callable[[], TinyDB]] = None
+        self.refs = 0
+        self.opening = threading.Lock()
+
+    def open_db(self) -> TinyDB:
+        """Return the shared TinyDB instance, opening it on first use."""
+        with self.opening:
+            if self.db is None:
+                if self.opener is None:
+                    raise RuntimeError("The shared database has been closed")
+                self.db = self.opener()
+                serialize_storage(self.db.storage)
+            return self.db
+
+    def release_db(self):
+        """Drop a reference to the shared instance, closing it after the last one."""
+        self.refs -= 1
+        if self.refs == 0:
+            if self.db is not None:
+                self.db.close()
+            self.db = None
+            self.opener = None
+
+
 class AIOBridge:
     """
     Async-safe proxy adapter for TinyDB.
@@ -34,16 +119,97 @@ class AIOBridge:
     with a timeout, and returns a `Result` (`Ok` or `Err`) to encourage safe functional error handling.
     """
 
-    __locks = weakref.WeakValueDictionary()
+    __paths: "weakref.WeakValueDictionary[str, _PathState]"
+    __paths = weakref.WeakValueDictionary()
 
     tinydb_class = TinyDB
 
-    def __init__(self, path: Union[str, None], *, timeout: int = 10, **kwargs):
+    def __init__(
+        self,
+        path: Union[str, None],
+        *,
+        timeout: int = 10,
+        safe_timeout: bool = False,
+        concurrent_reads: bool = False,
+        table_locks: bool = False,
+        shared: bool = False,
+        execution: str = "thread",
+        interprocess: bool = False,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        commit_window: Optional[float] = None,
+        commit_max_ops: int = 100,
+        cache_size: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
+        flush_interval: Optional[float] = None,
+        flush_max_writes: int = 100,
+        durability: str = "flush",
+        priority: str = "normal",
+        lane_limits: Optional[Mapping[str, int]] = None,
+        drop_expired: bool = False,
+        **kwargs,
+    ):
         """Initialize AIOBridge.
 
         Args:
             path (Union[str, None]): Path to the TinyDB file or None.
             timeout (int): Operation timeout in seconds.
+            safe_timeout (bool): Keep the path locked after a timeout until the
+                worker thread has actually finished, instead of letting the next
+                operation run alongside it.
+            concurrent_reads (bool): Let read-only methods run in parallel threads,
+                while writes keep exclusive access to the path.
+            table_locks (bool): Lock tables instead of the whole path, so reads of
+                one table run alongside reads and writes of another. Writes to any
+                table are still applied one at a time. All bridges on a path should
+                use the same setting.
+            shared (bool): Share one TinyDB instance with every other shared bridge
+                on the same path. It is opened on first use, with the options of
+                the bridge that opened it, and closed when the last bridge closes.
+            execution (str): "thread" runs every operation in a worker thread.
+                "inline" runs them on the event loop, still under the bridge's
+                locks, which suits in-memory storages. "auto" runs operations
+                inline when they need no disk I/O and in a thread otherwise.
+                Inline operations cannot be interrupted by the timeout.
+            interprocess (bool): Also lock the file against other processes, with
+                shared locks for reads and exclusive locks for writes. Caches are
+                dropped whenever another process has changed the file.
+            executor (Executor, optional): Executor that runs TinyDB operations
+                instead of the event loop's default one.
+            max_workers (int, optional): Create a dedicated thread pool of this size,
+                shared by all bridges on the same path. Ignored if `executor` is given.
+            max_pending (int, optional): Maximum number of operations queued or
+                running on the path; further calls return `Err(BridgeBusyError)`.
+            commit_window (float, optional): Enables group commit. Mutations queued
+                within this many seconds are applied in one thread hop and flushed
+                with a single storage write. Each bridge groups its own mutations,
+                other bridges on the same path commit separately.
+            commit_max_ops (int): Flush the group commit queue early once it holds
+                this many mutations.
+            cache_size (int, optional): Enables the result cache. Up to this many
+                results of `all`, `search`, `get`, `contains` and `count` are served
+                from the event loop until a write to their table.
+            cache_ttl (float, optional): Seconds a cached result stays valid, which
+                bounds staleness against writes that bypass the bridges on this path.
+            flush_interval (float, optional): Enables background flushing. Writes
+                are kept in a `CachingMiddleware` (added if the storage has none)
+                and written to the storage at most this many seconds after the
+                first unflushed one, which bounds what a crash can lose.
+            flush_max_writes (int): Flush in the background early once this many
+                writes are buffered.
+            durability (str): What background flushes and `flush` guarantee.
+                "none" never flushes in the background, "flush" hands the data
+                to the storage, "fsync" also syncs the file to disk.
+            priority (str): Lane of the bridge's operations, unless overridden with
+                `tinybridge.priority`. Operations of the "interactive" lane are
+                served before queued "normal" ones, which go before "batch" ones.
+            lane_limits (Mapping[str, int], optional): Maximum number of operations
+                of a lane queued or running on the path at once, e.g.
+                `{"batch": 1}`. Shared by all bridges on the same path.
+            drop_expired (bool): Drop operations still waiting for the path's
+                locks when their `timeout` expires, returning
+                `Err(asyncio.TimeoutError)` without running them.
             tinydb_class (Type[TinyDB], optional): Custom TinyDB class to use (e.g., in-memory).
             **kwargs: Passed to TinyDB constructor.
         """
@@ -58,28 +224,120 @@ class AIOBridge:
         # If not None, it's passed explicitly to the TinyDB constructor.
 
         self._timeout = timeout
+        self._safe_timeout = safe_timeout
+        self._concurrent_reads = concurrent_reads
+        self._max_pending = max_pending
+        self._commit_window = commit_window
+        self._commit_max_ops = commit_max_ops
+        self._pending: List[Tuple[Callable[[], object], asyncio.Future]] = []
+        self._pending_timer: Optional[asyncio.TimerHandle] = None
+        self._commits: Set[asyncio.Task] = set()
+        self._flush_interval = flush_interval
+        self._flush_max_writes = flush_max_writes
+        self._durability = durability
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task] = set()
 
+        if interprocess and path is None:
+            raise ValueError("Inter-process locking requires a database path")
+        if shared and path is None:
+            raise ValueError("Sharing a TinyDB instance requires a database path")
+        if execution not in ("thread", "inline", "auto"):
+            raise ValueError(f"Unknown execution mode {execution!r}")
+        if interprocess and execution == "inline":
+            raise ValueError("Inline execution cannot take inter-process locks")
+        if interprocess and table_locks:
+            raise ValueError(
+                "Table locks cannot be combined with inter-process locking"
+            )
+        if durability not in ("none", "flush", "fsync"):
+            raise ValueError(f"Unknown durability level {durability!r}")
+        if interprocess and flush_interval is not None:
+            raise ValueError(
+                "Background flushing cannot be combined with inter-process locking"
+            )
+        self._priority = check_lane(priority)
+        self._drop_expired = drop_expired
+        self._table_locks = table_locks
+        self._execution = "thread" if interprocess else execution
+
+        self._path = path
         if path is not None:
             kwargs["path"] = path
         tinydb_class = kwargs.pop("tinydb_class", self.tinydb_class)
-        self._db = tinydb_class(**kwargs)
+        self._default_table = tinydb_class.default_table_name
+        # Subclasses may pass their own storage to TinyDB, so the middleware
+        # is only added once the instance exists.
+        opener = functools.partial(
+            _open, tinydb_class, flush_interval is not None, **kwargs
+        )
+
+        # Bridges on the same path share one reader-writer lock, whatever mode
+        # they run in. Without `concurrent_reads` it is only taken exclusively.
+        # Without a path every bridge has its own database, so its own state.
+        if path is None:
+            state = _PathState()
+        else:
+            state = AIOBridge.__paths.get(path) or _PathState()
+            AIOBridge.__paths[path] = state
+        self._state = state
+        self.lock = state.lock
+        if lane_limits:
+            state.lanes.configure(lane_limits)
 
-        path = path or "default"
-        if path not in AIOBridge.__locks:
-            self.lock = asyncio.Lock()
-            AIOBridge.__locks[path] = self.lock
+        self._shared = shared
+        self._attached = True
+        if shared:
+            if state.opener is None:
+                state.opener = opener
+            state.refs += 1
+            self._db: Optional[TinyDB] = None
         else:
-            self.lock = AIOBridge.__locks[path]
+            self._db = opener()
+            if concurrent_reads or table_locks:
+                serialize_storage(self._db.storage)
+
+        if interprocess and state.file_lock is None:
+            state.file_lock = FileLock(f"{path}.lock")
+        self._file_lock = state.file_lock if interprocess else None
+        self._file_stat: Optional[Tuple[int, int, int]] = None
+        self._file_mutex = threading.Lock()
+
+        if executor is None and max_workers is not None:
+            if state.executor is None:
+                state.executor = ThreadPoolExecutor(
+                    max_workers, thread_name_prefix="tinybridge"
+                )
+            executor = state.executor
+        self._executor = executor
+
+        self._cache = (
+            None
+            if cache_size is None
+            else ResultCache(state.generations, cache_size, cache_ttl)
+        )
+        self._tables: Dict[str, AIOTable] = {}
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
-        if self._db is not None:
-            self._db.close()
+        await self.__drain()
+        self.__cancel_flush()
+        self.__close()
+
+    def __close(self):
+        """Close the TinyDB instance, or this bridge's share of it."""
+
+        if not self._shared:
+            if self._db is not None:
+                self._db.close()
+        elif self._attached:
+            self._attached = False
+            self._state.release_db()
 
     async def __execute(
-        self, op: Callable[..., T], *args, **kwargs
+        self, method: str, op: Callable[..., T], *args, **kwargs
     ) -> Result[T, Exception]:
         """Run a TinyDB operation in a thread-safe, async-safe context."""
 
@@ -91,60 +349,831 @@ class AIOBridge:
         # logic—gives us the best trade-off: clean runtime behavior with full
         # static typing support and LSP compatibility.
 
-        async with self.lock:
-            try:
-                result = await asyncio.wait_for(
-                    asyncio.to_thread(functools.partial(op, *args, **kwargs)),
-                    timeout=self._timeout,
+        return await self.__run(
+            method, functools.partial(op, *args, **kwargs), write=True
+        )
+
+    async def __query(
+        self, method: str, op: Callable[..., T], *args, **kwargs
+    ) -> Result[T, Exception]:
+        """Run a read-only TinyDB operation, alongside other reads if enabled."""
+        return await self.__run(
+            method, functools.partial(op, *args, **kwargs), write=False
+        )
+
+    async def __run(
+        self,
+        method: str,
+        fn: Callable[[], T],
+        write: bool,
+        table: Optional[str] = None,
+        changes: bool = True,
+    ) -> Result[T, Exception]:
+        """Run `fn` in a thread while holding the locks it needs.
+
+        Operations on a single `table` take that table's lock when table locks
+        are enabled; everything else takes the path lock. `method` names the
+        operation in the path's statistics. Writes that leave the documents
+        alone pass `changes=False` to keep cached results. With `drop_expired`,
+        operations still waiting for their locks when the timeout expires are
+        dropped.
+        """
+
+        state = self._state
+        stats = state.stats
+        record = stats.begin(method, table)
+        try:
+            if self._max_pending is not None and state.inflight >= self._max_pending:
+                record.outcome = "rejected"
+                record.error = BridgeBusyError(
+                    f"{state.inflight} operations already in flight"
                 )
+                return Err(record.error)
+
+            if write and changes:
+                fn = functools.partial(self.__invalidating, fn, table)
+            if self._file_lock is not None:
+                fn = functools.partial(self.__with_file_lock, fn, not write)
+            fn = functools.partial(stats.timed, record, fn)
+
+            state.inflight += 1
+            try:
+                stats.acquiring(record)
+                lane = current_lane(self._priority)
+                deadline = None
+                if self._drop_expired:
+                    deadline = asyncio.get_running_loop().time() + self._timeout
+                try:
+                    release = await self.__acquire(write, table, lane, deadline)
+                except asyncio.TimeoutError as e:
+                    record.outcome, record.error = "expired", e
+                    return Err(e)
+                stats.acquired(record)
+                future = self.__dispatch(fn, self.__inline(write))
+                try:
+                    # Worker threads cannot be interrupted: the future is never
+                    # cancelled, so an abandoned one can be tracked until it ends.
+                    if not future.done():
+                        await asyncio.wait({future}, timeout=self._timeout)
+                        if not future.done():
+                            raise asyncio.TimeoutError()
+                    result = future.result()
+                except asyncio.TimeoutError as e:
+                    record.outcome, record.error = "timeout", e
+                    return Err(e)
+                except Exception as e:
+                    record.outcome, record.error = "error", e
+                    return Err(e)
+                finally:
+                    if future.done():
+                        release()
+                    else:
+                        self.__abandon(future, release)
+                    if write and changes:
+                        self.__schedule_flush()
+                record.outcome = "ok"
                 return Ok(result)
+            finally:
+                state.inflight -= 1
+        finally:
+            stats.finish(record)
+
+    async def __acquire(
+        self,
+        write: bool,
+        table: Optional[str],
+        lane: str,
+        deadline: Optional[float] = None,
+    ) -> Callable[[], None]:
+        """Take the locks for an operation and return the matching release function.
+
+        The operation first takes a slot of its `lane`, then the locks, with
+        the lane's priority. Raises `asyncio.TimeoutError` once the loop time
+        passes `deadline`.
+        """
+
+        shared = not write and self._concurrent_reads
+        if table is None or not self._table_locks:
+            locks = [(self.lock, shared)]
+        else:
+            # Table operations share the path with each other and only exclude
+            # database level ones. Writers also take the path's writer lock, as
+            # TinyDB rewrites every table on each write.
+            locks = [(self.lock, True)]
+            if write:
+                locks.append((self._state.writer, False))
+            locks.append((self._state.tables.setdefault(table, RWLock()), shared))
+
+        releases: List[Callable[[], None]] = []
+        try:
+            lanes = self._state.lanes
+            releases.append(await lanes.enter(lane, self.__remaining(deadline)))
+            for lock, lock_shared in locks:
+                releases.append(
+                    await self.__take(
+                        lock, lock_shared, LANES[lane], self.__remaining(deadline)
+                    )
+                )
+        except BaseException:
+            for release in reversed(releases):
+                release()
+            raise
+
+        def release_all():
+            for release in reversed(releases):
+                release()
+
+        return release_all
+
+    @staticmethod
+    async def __take(
+        lock: RWLock, shared: bool, priority: int, timeout: Optional[float]
+    ) -> Callable[[], None]:
+        """Acquire `lock` and return the matching release function."""
+
+        if shared:
+            await lock.acquire_read(priority, timeout)
+            return lock.release_read
+        await lock.acquire_write(priority, timeout)
+        return lock.release_write
+
+    @staticmethod
+    def __remaining(deadline: Optional[float]) -> Optional[float]:
+        if deadline is None:
+            return None
+        return deadline - asyncio.get_running_loop().time()
+
+    def __abandon(self, future: asyncio.Future, release: Callable[[], None]):
+        """Count an abandoned worker thread as a zombie until it finishes.
+
+        With `safe_timeout` the path also stays locked until then.
+        """
+
+        state = self._state
+        state.zombies += 1
+        safe = self._safe_timeout
+        if not safe:
+            release()
+
+        def finished(future: asyncio.Future):
+            state.zombies -= 1
+            if safe:
+                release()
+            if not future.cancelled():
+                future.exception()
+
+        future.add_done_callback(finished)
+
+    def __invalidating(self, fn: Callable[[], T], table: Optional[str]) -> T:
+        """Run a write and mark cached results of its table(s) as stale."""
+        try:
+            return fn()
+        finally:
+            self._state.generations.bump(table)
+
+    def __with_file_lock(self, fn: Callable[[], T], shared: bool) -> T:
+        """Run `fn` under the inter-process lock, reloading on outside changes."""
+
+        self.__lock_file(shared)
+        written = False
+        try:
+            result = fn()
+            written = not shared
+            return result
+        finally:
+            self.__unlock_file(written)
+
+    def __lock_file(self, shared: bool):
+        """Take the inter-process lock and drop caches if the file changed."""
+
+        lock = self._file_lock
+        if lock is None:
+            return
+        lock.acquire(shared)
+        try:
+            with self._file_mutex:
+                stat = self.__stat()
+                if self._file_stat is not None and stat != self._file_stat:
+                    reload_db(self.db)
+                    self._state.generations.bump()
+                    for indexes in self._state.indexes.values():
+                        indexes.invalidate()
+                self._file_stat = stat
+        except BaseException:
+            lock.release()
+            raise
+
+    def __unlock_file(self, written: bool):
+        """Release the inter-process lock, publishing a write first."""
+
+        try:
+            if written:
+                # Other processes must see the write before the lock is released.
+                if isinstance(self.db.storage, CachingMiddleware):
+                    self.db.storage.flush()
+                self._file_stat = self.__stat()
+        finally:
+            if self._file_lock is not None:
+                self._file_lock.release()
+
+    def __stat(self) -> Optional[Tuple[int, int, int]]:
+        """Return the identity, size and modification time of the DB file."""
+        if self._path is None:
+            return None
+        try:
+            stat = os.stat(self._path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def __inline(self, write: bool, loaded: bool = False) -> bool:
+        """Tell whether the execution mode runs an operation on the event loop.
+
+        `loaded` marks operations served from a write buffer that already holds
+        the database state.
+        """
+
+        if self._execution == "auto":
+            # A shared database that is not open yet is opened in a thread.
+            return loaded or (
+                self._db is not None and in_memory(self._db.storage, write)
+            )
+        return self._execution == "inline"
+
+    def __dispatch(self, fn: Callable[[], T], inline: bool) -> asyncio.Future:
+        """Start `fn`, inline or in a thread."""
+
+        if not inline:
+            return asyncio.ensure_future(self.__offload(fn))
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            future.set_result(fn())
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def __offload(self, fn: Callable[[], T]) -> Awaitable[T]:
+        """Hand `fn` over to the bridge's executor."""
+
+        if self._executor is None:
+            return asyncio.to_thread(fn)
+
+        # Same context propagation as `asyncio.to_thread`.
+        context = contextvars.copy_context()
+        return asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(context.run, fn)
+        )
+
+    async def __commit(
+        self, method: str, fn: Callable[[], T], table: Optional[str] = None
+    ) -> Result[T, Exception]:
+        """Run a mutation, queueing it for a group commit when enabled."""
+
+        if self._commit_window is None:
+            return await self.__run(method, fn, write=True, table=table)
+
+        if method in IN_PLACE:
+            fn = functools.partial(self.__isolated, fn)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((fn, future))
+
+        if len(self._pending) >= self._commit_max_ops:
+            self.__flush_pending()
+        elif self._pending_timer is None:
+            self._pending_timer = loop.call_later(
+                self._commit_window, self.__flush_pending
+            )
+        return await future
+
+    def __flush_pending(self):
+        """Hand the queued mutations over to a commit task."""
+
+        if self._pending_timer is not None:
+            self._pending_timer.cancel()
+            self._pending_timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self.__commit_batch(batch))
+            self._commits.add(task)
+            task.add_done_callback(self._commits.discard)
+
+    async def __commit_batch(
+        self, batch: List[Tuple[Callable[[], object], asyncio.Future]]
+    ):
+        """Apply a batch of mutations and resolve every caller's future."""
+
+        ops = [op for op, _ in batch]
+        result = await self.__execute("commit", self.__apply_batch, ops)
+        outcomes: List[Result[object, Exception]]
+        outcomes = result.ok() if isinstance(result, Ok) else [result] * len(batch)
+        for (_, future), outcome in zip(batch, outcomes):
+            if not future.done():
+                future.set_result(outcome)
+
+    def __apply_batch(
+        self, ops: List[Callable[[], object]]
+    ) -> List[Result[object, Exception]]:
+        """Apply mutations against a write buffer and flush it once."""
+
+        with WriteBuffer(self.db.storage) as buffer:
+            outcomes = self.__apply_ops(ops)
+            try:
+                buffer.commit()
+            except BaseException:
+                # The indexes already reflect documents that never got stored.
+                self.__discard()
+                raise
+        return outcomes
+
+    def __isolated(self, fn: Callable[[], T]) -> T:
+        """Run a mutation on copies of the tables it touches, kept if it succeeds."""
+
+        # Operations sharing a write buffer see each other's tables, so the
+        # partial changes of a failed one would be flushed with the rest.
+        with StagingBuffer(self.db.storage) as buffer:
+            result = fn()
+            buffer.commit()
+        return result
+
+    @staticmethod
+    def __apply_ops(ops: List[Callable[[], object]]) -> List[Result[object, Exception]]:
+        """Run operations one after another, capturing each outcome."""
+
+        outcomes: List[Result[object, Exception]] = []
+        for op in ops:
+            try:
+                outcomes.append(Ok(op()))
             except Exception as e:
-                return Err(e)
+                outcomes.append(Err(e))
+        return outcomes
+
+    async def __run_batch(
+        self, ops: List[Operation]
+    ) -> List[Result[object, Exception]]:
+        """Run the operations recorded by a `Batch` in one thread hop."""
+
+        # Mutations queued for a group commit were issued first.
+        await self.__drain()
+        connected = await self.__connect()
+        if isinstance(connected, Err):
+            return [connected] * len(ops)
+
+        changes: List[Change] = []
+        calls = [functools.partial(self.__batch_call, changes, *op) for op in ops]
+        if all(method in READS for _, method, _, _ in ops):
+            # Readers may run in parallel, so they must not shadow the storage.
+            result = await self.__query("batch", self.__apply_ops, calls)
+        else:
+            calls = [
+                functools.partial(self.__isolated, call) if op[1] in IN_PLACE else call
+                for op, call in zip(ops, calls)
+            ]
+            result = await self.__execute("batch", self.__apply_batch, calls)
+        if isinstance(result, Err):
+            return [result] * len(ops)
+        for change in changes:
+            self._state.feed.publish(change)
+        return result.ok()
+
+    def __batch_call(
+        self,
+        changes: List[Change],
+        table: str,
+        method: str,
+        args: tuple,
+        kwargs: dict,
+    ):
+        operation = self.__open_table(table)._operation(method, changes)
+        return operation(*args, **kwargs)
+
+    def __open_table(self, name: str, **kwargs) -> AIOTable:
+        """Return the table proxy for `name`, creating it on first use."""
+
+        table = self._tables.get(name)
+        if table is None:
+            raw = self.db.table(name, **kwargs)
+            if self._concurrent_reads:
+                guard_query_cache(raw)
+            table = self._tables[name] = AIOTable(
+                raw,
+                self._state.indexes,
+                read=functools.partial(self.__run, write=False, table=name),
+                write=functools.partial(self.__run, write=True, table=name),
+                commit=functools.partial(self.__commit, table=name),
+                cache=self._cache,
+                feed=self._state.feed,
+            )
+        return table
+
+    def __drop(self, op: Callable[..., T], *args) -> T:
+        """Drop tables and mark their indexes for a rebuild."""
+
+        result = op(*args)
+        for indexes in self._state.indexes.values():
+            indexes.invalidate()
+        # TinyDB forgets dropped tables, but the proxies keep using theirs.
+        for name, table in self._tables.items():
+            table.table.clear_cache()
+            table.table._next_id = None
+            self.db._tables.setdefault(name, table.table)
+        return result
+
+    async def __drain(self):
+        """Wait until every queued mutation has been committed."""
+
+        self.__flush_pending()
+        if self._commits:
+            await asyncio.gather(*self._commits)
+        if self._flushes:
+            await asyncio.gather(*self._flushes)
+
+    def __schedule_flush(self):
+        """Arrange for buffered writes to be flushed in the background."""
+
+        if self._flush_interval is None or self._durability == "none":
+            return
+        if self._db is None:
+            return
+        buffered = getattr(self._db.storage, "_cache_modified_count", 0)
+        if buffered >= self._flush_max_writes:
+            self.__start_flush()
+        elif buffered and self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self._flush_interval, self.__start_flush
+            )
+
+    def __start_flush(self):
+        """Hand a background flush over to a task."""
+
+        self.__cancel_flush()
+        task = asyncio.ensure_future(
+            self.__run("flush", self.__flush_storage, write=True, changes=False)
+        )
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    def __cancel_flush(self):
+        """Cancel the scheduled background flush, if any."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def __flush_storage(self):
+        """Write the buffered state to the storage, syncing it if required."""
+
+        storage = self.db.storage
+        if (
+            not isinstance(storage, CachingMiddleware)
+            or not storage._cache_modified_count
+        ):
+            return
+        storage.flush()
+        if self._durability == "fsync" and self._path is not None:
+            fd = os.open(self._path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    async def __settle(self, future: asyncio.Future) -> T:
+        """Wait for `future` up to the timeout, without ever abandoning it."""
+
+        if not future.done():
+            await asyncio.wait({future}, timeout=self._timeout)
+            if not future.done():
+                raise asyncio.TimeoutError()
+        return future.result()
+
+    async def __run_staged(
+        self,
+        buffer: StagingBuffer,
+        pending: Set[asyncio.Future],
+        method: str,
+        fn: Callable[[], T],
+    ) -> Result[T, Exception]:
+        """Run an operation of a transaction against its staging buffer."""
+
+        future = self.__dispatch(fn, self.__inline(False, buffer.loaded))
+        try:
+            return Ok(await self.__settle(future))
+        except Exception as e:
+            return Err(e)
+        finally:
+            if not future.done():
+                # The buffer may only be discarded once the thread is done.
+                pending.add(future)
+
+    @contextlib.asynccontextmanager
+    async def __staged(self, record: OperationRecord) -> AsyncIterator[Transaction]:
+        """Stage a transaction's writes and commit them, with the path locked."""
+
+        if self._file_lock is not None:
+            await self.__lock_file_async()
+        committed = False
+        pending: Set[asyncio.Future] = set()
+        try:
+            with StagingBuffer(self.db.storage) as buffer:
+                try:
+                    run = functools.partial(self.__run_staged, buffer, pending)
+                    feed = self._state.feed.deferred()
+                    tx = Transaction(self.db, self._state.indexes, run, feed)
+                    yield tx
+                    if not tx.rolled_back:
+                        commit = self.__dispatch(
+                            functools.partial(self.stats.timed, record, buffer.commit),
+                            self.__inline(True),
+                        )
+                        try:
+                            await self.__settle(commit)
+                            committed = True
+                            self.__schedule_flush()
+                            feed.commit()
+                        finally:
+                            self._state.generations.bump()
+                            if not commit.done():
+                                pending.add(commit)
+                    record.outcome = "ok"
+                except asyncio.TimeoutError as e:
+                    record.outcome, record.error = "timeout", e
+                    raise
+                except Exception as e:
+                    record.outcome, record.error = "error", e
+                    raise
+                finally:
+                    if pending:
+                        await asyncio.wait(pending)
+        finally:
+            if not committed:
+                self.__discard()
+            if self._file_lock is not None:
+                await self.__offload(functools.partial(self.__unlock_file, committed))
+
+    async def __lock_file_async(self):
+        """Take the inter-process lock for a transaction from a worker thread."""
+
+        future = asyncio.ensure_future(
+            self.__offload(functools.partial(self.__lock_file, False))
+        )
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(
+                lambda future: future.exception() or self._file_lock.release()
+            )
+            raise
+
+    def __discard(self):
+        """Forget everything TinyDB and the indexes learnt from staged writes."""
+
+        for table in self.db._tables.values():
+            table.clear_cache()
+            table._next_id = None
+        for indexes in self._state.indexes.values():
+            indexes.invalidate()
+
+    @property
+    def zombies(self) -> int:
+        """Number of timed out operations whose worker thread is still running."""
+        return self._state.zombies
+
+    @property
+    def stats(self) -> PathStats:
+        """Operation statistics of every bridge on this path."""
+        return self._state.stats
 
     @property
     def db(self) -> TinyDB:
         """Return the underlying `TinyDB` instance."""
+        if self._db is None:
+            self._db = self._state.open_db()
         return self._db
 
+    async def __connect(self) -> Result[TinyDB, Exception]:
+        """Return the TinyDB instance, opening a shared one in a thread first."""
+
+        if self._db is None:
+            try:
+                self._db = await self.__offload(self._state.open_db)
+            except Exception as e:
+                return Err(e)
+        return Ok(self._db)
+
+    async def _default(self) -> Result[AIOTable, Exception]:
+        """Return the proxy of the default table, opening the database first."""
+
+        db = await self.__connect()
+        if isinstance(db, Err):
+            return db
+        return Ok(self.__open_table(db.ok().default_table_name))
+
+    async def __on_default(
+        self, call: Callable[[AIOTable], Awaitable[Result[T, Exception]]]
+    ) -> Result[T, Exception]:
+        """Call a method of the default table."""
+
+        table = await self._default()
+        if isinstance(table, Err):
+            return table
+        return await call(table.ok())
+
+    async def __iterate_default(
+        self,
+        iterate: Callable[[AIOTable], AsyncIterator[Result[List[Document], Exception]]],
+    ) -> AsyncIterator[Result[List[Document], Exception]]:
+        """Iterate over the default table."""
+
+        table = await self._default()
+        if isinstance(table, Err):
+            yield table
+            return
+        async for batch in iterate(table.ok()):
+            yield batch
+
+    def batch(self) -> Batch:
+        """Start a batch of operations on the default table.
+
+        Use `Batch.table` to add operations on other tables, then
+        `await batch.execute()` to run them all in a single thread hop.
+        """
+        return Batch(self.__run_batch, self._default_table)
+
+    @contextlib.asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Transaction]:
+        """Run several operations as one atomic unit.
+
+        `async with bridge.transaction() as tx:` locks the path for the whole
+        block. Operations on `tx` read and write an in-memory copy of the
+        database, which is written to the storage once, when the block ends.
+        If the block raises, `tx.rollback()` was called or an operation timed
+        out, nothing is written and the storage is left as it was.
+
+        Other operations on the path, including those of this bridge, wait for
+        the transaction to end, so the block must not await them. Raises
+        `BridgeBusyError` if the path has `max_pending` operations in flight,
+        and the storage's exception if the final write fails, or opening a
+        shared database does.
+        """
+
+        await self.__drain()
+        connected = await self.__connect()
+        if isinstance(connected, Err):
+            raise connected.err()
+
+        state = self._state
+        stats = state.stats
+        record = stats.begin("transaction")
+        try:
+            if self._max_pending is not None and state.inflight >= self._max_pending:
+                record.outcome = "rejected"
+                record.error = BridgeBusyError(
+                    f"{state.inflight} operations already in flight"
+                )
+                raise record.error
+
+            state.inflight += 1
+            try:
+                stats.acquiring(record)
+                lane = current_lane(self._priority)
+                release = await self.__acquire(True, None, lane)
+                stats.acquired(record)
+                try:
+                    async with self.__staged(record) as tx:
+                        yield tx
+                finally:
+                    release()
+            finally:
+                state.inflight -= 1
+        finally:
+            stats.finish(record)
+
     # DB level methods
-    async def table(self, name: str, **kwargs) -> Result[Table, Exception]:
-        """Access or create a table by name."""
-        return await self.__execute(self.db.table, name, **kwargs)
+    async def table(self, name: str, **kwargs) -> Result[AIOTable, Exception]:
+        """Access or create a table by name, returning its async proxy."""
+        db = await self.__connect()
+        if isinstance(db, Err):
+            return db
+        return await self.__execute("table", self.__open_table, name, **kwargs)
 
     async def tables(self) -> Result[Set[str], Exception]:
         """Return the set of table names."""
-        return await self.__execute(self.db.tables)
+        db = await self.__connect()
+        if isinstance(db, Err):
+            return db
+        return await self.__query("tables", db.ok().tables)
 
     async def drop_tables(self) -> Result[None, Exception]:
         """Remove all tables."""
-        return await self.__execute(self.db.drop_tables)
+        db = await self.__connect()
+        if isinstance(db, Err):
+            return db
+        return await self.__execute("drop_tables", self.__drop, db.ok().drop_tables)
 
     async def drop_table(self, name: str) -> Result[None, Exception]:
         """Remove a specific table by name."""
-        return await self.__execute(self.db.drop_table, name)
+        db = await self.__connect()
+        if isinstance(db, Err):
+            return db
+        return await self.__execute("drop_table", self.__drop, db.ok().drop_table, name)
+
+    async def flush(self) -> Result[None, Exception]:
+        """Write the changes kept in a `CachingMiddleware` to the storage.
+
+        Also syncs the file to disk with `durability="fsync"`. Callers that need
+        their writes to survive a crash await this instead of the next
+        background flush.
+        """
+        self.__cancel_flush()
+        await self.__drain()
+        db = await self.__connect()
+        if isinstance(db, Err):
+            return db
+        return await self.__run(
+            "flush", self.__flush_storage, write=True, changes=False
+        )
 
     async def close(self) -> Result[None, Exception]:
         """Close the database (if not already closed)."""
-        return await self.__execute(self.db.close)
+        await self.__drain()
+        self.__cancel_flush()
+        return await self.__execute("close", self.__close)
 
-    # Table level methods
+    # Table level methods, applied to the default table
     async def insert(self, document: Mapping) -> Result[Hashable, Exception]:
         """Insert a single document."""
-        return await self.__execute(self.db.insert, document)
+        return await self.__on_default(lambda table: table.insert(document))
 
     async def insert_multiple(
         self, documents: Iterable[Mapping]
     ) -> Result[Sequence[Hashable], Exception]:
         """Insert multiple documents."""
-        return await self.__execute(self.db.insert_multiple, documents)
+        return await self.__on_default(lambda table: table.insert_multiple(documents))
 
     async def all(self) -> Result[List[Document], Exception]:
         """Return all documents in the table."""
-        return await self.__execute(self.db.all)
+        return await self.__on_default(lambda table: table.all())
 
     async def search(self, cond: QueryLike) -> Result[List[Document], Exception]:
         """Return documents matching the given query."""
-        return await self.__execute(self.db.search, cond)
+        return await self.__on_default(lambda table: table.search(cond))
+
+    def iter_all(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Result[List[Document], Exception]]:
+        """Iterate over all documents in batches of up to `batch_size`."""
+        return self.__iterate_default(lambda table: table.iter_all(batch_size))
+
+    def iter_search(
+        self, cond: QueryLike, batch_size: int = 500
+    ) -> AsyncIterator[Result[List[Document], Exception]]:
+        """Iterate over documents matching the query in batches of up to `batch_size`.
+
+        See `AIOTable.iter_search` for the consistency guarantees.
+        """
+        return self.__iterate_default(lambda table: table.iter_search(cond, batch_size))
+
+    async def import_ndjson(
+        self,
+        source: Source,
+        chunk_size: int = 1000,
+        *,
+        id_field: Optional[str] = None,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Result[int, Exception]:
+        """Insert documents from NDJSON, `chunk_size` at a time.
+
+        See `AIOTable.import_ndjson`.
+        """
+        return await self.__on_default(
+            lambda table: table.import_ndjson(
+                source, chunk_size, id_field=id_field, progress=progress
+            )
+        )
+
+    async def export_ndjson(
+        self,
+        target: Target,
+        cond: Optional[QueryLike] = None,
+        *,
+        chunk_size: int = 1000,
+        id_field: Optional[str] = None,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Result[int, Exception]:
+        """Write the table's documents, or those matching `cond`, as NDJSON.
+
+        See `AIOTable.export_ndjson`.
+        """
+        return await self.__on_default(
+            lambda table: table.export_ndjson(
+                target,
+                cond,
+                chunk_size=chunk_size,
+                id_field=id_field,
+                progress=progress,
+            )
+        )
 
     async def get(
         self,
@@ -153,13 +1182,13 @@ class AIOBridge:
         doc_ids: Optional[List[Hashable]] = None,
     ) -> Result[Optional[Union[Document, List[Document]]], Exception]:
         """Get a document by query, `doc_id`, or list of IDs."""
-        return await self.__execute(self.db.get, cond, doc_id, doc_ids)
+        return await self.__on_default(lambda table: table.get(cond, doc_id, doc_ids))
 
     async def contains(
         self, cond: Optional[QueryLike] = None, doc_id: Optional[Hashable] = None
     ) -> Result[bool, Exception]:
         """Check if a document exists by query or `doc_id`."""
-        return await self.__execute(self.db.contains, cond, doc_id)
+        return await self.__on_default(lambda table: table.contains(cond, doc_id))
 
     async def update(
         self,
@@ -168,20 +1197,22 @@ class AIOBridge:
         doc_ids: Optional[Iterable[Hashable]] = None,
     ) -> Result[Sequence[Hashable], Exception]:
         """Update documents by query or `doc_ids`."""
-        return await self.__execute(self.db.update, fields, cond, doc_ids)
+        return await self.__on_default(
+            lambda table: table.update(fields, cond, doc_ids)
+        )
 
     async def update_multiple(
         self,
         updates: Iterable[Tuple[Union[Mapping, Callable[[Mapping], None]], QueryLike]],
     ) -> Result[Sequence[Hashable], Exception]:
         """Update multiple document-query pairs."""
-        return await self.__execute(self.db.update_multiple, updates)
+        return await self.__on_default(lambda table: table.update_multiple(updates))
 
     async def upsert(
         self, document: Mapping, cond: Optional[QueryLike] = None
     ) -> Result[Sequence[Hashable], Exception]:
         """Update if match found, insert otherwise."""
-        return await self.__execute(self.db.upsert, document, cond)
+        return await self.__on_default(lambda table: table.upsert(document, cond))
 
     async def remove(
         self,
@@ -189,16 +1220,75 @@ class AIOBridge:
         doc_ids: Optional[Iterable[Hashable]] = None,
     ) -> Result[Sequence[Hashable], Exception]:
         """Remove documents by query or `doc_ids`."""
-        return await self.__execute(self.db.remove, cond, doc_ids)
+        return await self.__on_default(lambda table: table.remove(cond, doc_ids))
 
     async def truncate(self) -> Result[None, Exception]:
         """Remove all documents from the table."""
-        return await self.__execute(self.db.truncate)
+        return await self.__on_default(lambda table: table.truncate())
 
     async def count(self, cond: QueryLike) -> Result[int, Exception]:
         """Return the number of documents matching the query."""
-        return await self.__execute(self.db.count, cond)
+        return await self.__on_default(lambda table: table.count(cond))
+
+    async def select(
+        self, fields: Union[str, Iterable[str]], cond: Optional[QueryLike] = None
+    ) -> Result[List[Document], Exception]:
+        """Return only `fields` of the documents, see `AIOTable.select`."""
+        return await self.__on_default(lambda table: table.select(fields, cond))
+
+    async def count_by(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Dict[Any, int], Exception]:
+        """Count the documents per value of `field`, see `AIOTable.count_by`."""
+        return await self.__on_default(lambda table: table.count_by(field, cond))
+
+    async def sum(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Any, Exception]:
+        """Return the sum of `field`, see `AIOTable.sum`."""
+        return await self.__on_default(lambda table: table.sum(field, cond))
+
+    async def min(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Any, Exception]:
+        """Return the smallest value of `field`, see `AIOTable.min`."""
+        return await self.__on_default(lambda table: table.min(field, cond))
+
+    async def max(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Any, Exception]:
+        """Return the largest value of `field`, see `AIOTable.max`."""
+        return await self.__on_default(lambda table: table.max(field, cond))
+
+    async def distinct(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[List[Any], Exception]:
+        """Return the distinct values of `field`, see `AIOTable.distinct`."""
+        return await self.__on_default(lambda table: table.distinct(field, cond))
+
+    async def create_index(
+        self, field: str, *, kind: str = "hash"
+    ) -> Result[None, Exception]:
+        """Index a field for `search`, `get`, `contains` and `count`.
+
+        `kind="hash"` answers equality queries, `kind="sorted"` also answers
+        range queries. Indexes are shared by all bridges on the same path and
+        kept up to date by the bridge's mutation methods.
+        """
+        return await self.__on_default(
+            lambda table: table.create_index(field, kind=kind)
+        )
+
+    async def drop_index(self, field: str) -> Result[None, Exception]:
+        """Remove the index on a field."""
+        return await self.__on_default(lambda table: table.drop_index(field))
 
     async def clear_cache(self) -> Result[None, Exception]:
         """Clear the query cache."""
-        return await self.__execute(self.db.clear_cache)
+        return await self.__on_default(lambda table: table.clear_cache())
+
+    def subscribe(
+        self, cond: Optional[QueryLike] = None, *, maxsize: int = 100
+    ) -> Subscription:
+        """Receive the changes made to the table, see `AIOTable.subscribe`."""
+        return self._state.feed.subscribe(self._default_table, plan(cond), maxsize)
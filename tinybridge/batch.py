@@ -0,0 +1,184 @@
+# Batch implementation
+
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from result import Result
+from tinydb.queries import QueryLike
+
+from .planner import plan
+
+# (table name, method name, args, kwargs)
+Operation = Tuple[str, str, tuple, Dict[str, Any]]
+
+READS = frozenset(
+    {
+        "all",
+        "search",
+        "get",
+        "contains",
+        "count",
+        "select",
+        "count_by",
+        "sum",
+        "min",
+        "max",
+        "distinct",
+    }
+)
+
+# Mutations that change stored documents in place, so a failure part way
+# through leaves the documents it already visited modified.
+IN_PLACE = frozenset({"update", "update_multiple", "upsert"})
+
+
+class Batch:
+    """
+    Collects table operations and runs them in a single worker-thread hop.
+
+    Created by `AIOBridge.batch`. Recording methods mirror the bridge's table-level
+    API and return the batch, so calls can be chained; `execute` then runs every
+    recorded operation, in order, under one lock acquisition. Batches that only
+    read are run like any other read, anything else takes the path exclusively and
+    flushes all writes with a single storage write.
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[List[Operation]], Awaitable[List[Result[Any, Exception]]]],
+        table: str,
+        ops: Optional[List[Operation]] = None,
+    ):
+        self._execute = execute
+        self._table = table
+        self._ops: List[Operation] = [] if ops is None else ops
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    def __record(self, method: str, *args, **kwargs) -> "Batch":
+        self._ops.append((self._table, method, args, kwargs))
+        return self
+
+    def table(self, name: str) -> "Batch":
+        """Return a view of this batch that records operations on another table."""
+        return Batch(self._execute, name, self._ops)
+
+    async def execute(self) -> List[Result[Any, Exception]]:
+        """Run the recorded operations and return one `Result` per operation.
+
+        The timeout applies to the batch as a whole; if it expires, or the batch
+        cannot run at all, every operation gets the same `Err`. The batch is
+        emptied and can be reused afterwards.
+        """
+        ops = list(self._ops)
+        self._ops.clear()
+        if not ops:
+            return []
+        return await self._execute(ops)
+
+    def insert(self, document: Mapping) -> "Batch":
+        """Insert a single document."""
+        return self.__record("insert", document)
+
+    def insert_multiple(self, documents: Iterable[Mapping]) -> "Batch":
+        """Insert multiple documents."""
+        return self.__record("insert_multiple", documents)
+
+    def all(self) -> "Batch":
+        """Return all documents in the table."""
+        return self.__record("all")
+
+    def search(self, cond: QueryLike) -> "Batch":
+        """Return documents matching the given query."""
+        return self.__record("search", cond)
+
+    def get(
+        self,
+        cond: Optional[QueryLike] = None,
+        doc_id: Optional[Hashable] = None,
+        doc_ids: Optional[List[Hashable]] = None,
+    ) -> "Batch":
+        """Get a document by query, `doc_id`, or list of IDs."""
+        return self.__record("get", cond, doc_id, doc_ids)
+
+    def contains(
+        self, cond: Optional[QueryLike] = None, doc_id: Optional[Hashable] = None
+    ) -> "Batch":
+        """Check if a document exists by query or `doc_id`."""
+        return self.__record("contains", cond, doc_id)
+
+    def update(
+        self,
+        fields: Union[Mapping, Callable[[Mapping], None]],
+        cond: Optional[QueryLike] = None,
+        doc_ids: Optional[Iterable[Hashable]] = None,
+    ) -> "Batch":
+        """Update documents by query or `doc_ids`."""
+        return self.__record("update", fields, plan(cond), doc_ids)
+
+    def update_multiple(
+        self,
+        updates: Iterable[Tuple[Union[Mapping, Callable[[Mapping], None]], QueryLike]],
+    ) -> "Batch":
+        """Update multiple document-query pairs."""
+        updates = [(fields, plan(cond)) for fields, cond in updates]
+        return self.__record("update_multiple", updates)
+
+    def upsert(self, document: Mapping, cond: Optional[QueryLike] = None) -> "Batch":
+        """Update if match found, insert otherwise."""
+        return self.__record("upsert", document, plan(cond))
+
+    def remove(
+        self,
+        cond: Optional[QueryLike] = None,
+        doc_ids: Optional[Iterable[Hashable]] = None,
+    ) -> "Batch":
+        """Remove documents by query or `doc_ids`."""
+        return self.__record("remove", plan(cond), doc_ids)
+
+    def truncate(self) -> "Batch":
+        """Remove all documents from the table."""
+        return self.__record("truncate")
+
+    def count(self, cond: QueryLike) -> "Batch":
+        """Return the number of documents matching the query."""
+        return self.__record("count", cond)
+
+    def select(
+        self, fields: Union[str, Iterable[str]], cond: Optional[QueryLike] = None
+    ) -> "Batch":
+        """Return only `fields` of all documents, or of those matching `cond`."""
+        fields = (fields,) if isinstance(fields, str) else tuple(fields)
+        return self.__record("select", fields, cond)
+
+    def count_by(self, field: str, cond: Optional[QueryLike] = None) -> "Batch":
+        """Count the documents per value of `field`."""
+        return self.__record("count_by", field, cond)
+
+    def sum(self, field: str, cond: Optional[QueryLike] = None) -> "Batch":
+        """Return the sum of `field`."""
+        return self.__record("sum", field, cond)
+
+    def min(self, field: str, cond: Optional[QueryLike] = None) -> "Batch":
+        """Return the smallest value of `field`."""
+        return self.__record("min", field, cond)
+
+    def max(self, field: str, cond: Optional[QueryLike] = None) -> "Batch":
+        """Return the largest value of `field`."""
+        return self.__record("max", field, cond)
+
+    def distinct(self, field: str, cond: Optional[QueryLike] = None) -> "Batch":
+        """Return the distinct values of `field`."""
+        return self.__record("distinct", field, cond)
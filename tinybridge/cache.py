@@ -0,0 +1,120 @@
+# Result cache served on the event loop
+
+import collections
+import copy
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+MISSING = object()
+
+Token = Tuple[int, int]
+
+# (table, method, args)
+Key = Tuple[str, str, tuple]
+
+
+class Generations:
+    """
+    Per-table change counters of a database path.
+
+    Every mutation bumps the counter of the table it touched, or the epoch if
+    it may have touched any table. Cached results remember the counters seen
+    before their read started and are only served while those are unchanged.
+    Bumped from worker threads, read on the event loop.
+    """
+
+    def __init__(self):
+        self._epoch = 0
+        self._tables: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def token(self, table: str) -> Token:
+        """Return the current counters for `table`."""
+        return self._epoch, self._tables.get(table, 0)
+
+    def bump(self, table: Optional[str] = None):
+        """Record a change to `table`, or to every table if None."""
+        with self._lock:
+            if table is None:
+                self._epoch += 1
+            else:
+                self._tables[table] = self._tables.get(table, 0) + 1
+
+
+class ResultCache:
+    """
+    LRU cache of read results, with an optional time to live.
+
+    Only used from the event loop. Entries are keyed on (table, method, args)
+    and validated against the path's `Generations` on every lookup, so a write
+    through any bridge on the path invalidates them without touching the cache.
+    """
+
+    def __init__(
+        self, generations: Generations, maxsize: int, ttl: Optional[float] = None
+    ):
+        self._generations = generations
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: "collections.OrderedDict[Key, Tuple[Any, Token, float]]"
+        self._entries = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(table: str, method: str, args: tuple) -> Optional[Key]:
+        """Return the cache key for a call, or None if it cannot be cached."""
+
+        for arg in args:
+            is_cacheable = getattr(arg, "is_cacheable", None)
+            if is_cacheable is not None and not is_cacheable():
+                return None
+        key = (table, method, args)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def token(self, table: str) -> Token:
+        """Capture the table's counters before reading it."""
+        return self._generations.token(table)
+
+    def get(self, key: Key) -> Any:
+        """Return the cached value for `key`, or `MISSING`."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        value, token, expires = entry
+        if token != self._generations.token(key[0]) or expires < time.monotonic():
+            del self._entries[key]
+            return MISSING
+        self._entries.move_to_end(key)
+        return _copy(value)
+
+    def put(self, key: Key, token: Token, value: Any):
+        """Store a value read while the table's counters were `token`."""
+
+        if token != self._generations.token(key[0]):
+            # The table changed while reading, the value may already be stale.
+            return
+        expires = float("inf") if self._ttl is None else time.monotonic() + self._ttl
+        value = _copy(value)
+        self._entries[key] = (value, token, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry."""
+        self._entries.clear()
+
+
+def _copy(value: Any) -> Any:
+    """Copy a result with its documents, so callers cannot change cached values."""
+    if isinstance(value, (list, dict)):
+        return copy.deepcopy(value)
+    return value
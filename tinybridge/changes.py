@@ -0,0 +1,199 @@
+# Change feed of the mutations applied through bridges
+
+import asyncio
+import collections
+import logging
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Literal, Mapping, Optional
+
+from tinydb.queries import QueryLike
+
+logger = logging.getLogger(__name__)
+
+# The methods whose mutations are published.
+Op = Literal[
+    "insert",
+    "insert_multiple",
+    "update",
+    "update_multiple",
+    "upsert",
+    "remove",
+    "truncate",
+    "import_ndjson",
+]
+
+
+@dataclass
+class Change:
+    """
+    A mutation applied through a bridge, delivered to subscribers.
+
+    `op` is the method that made it, one of `Op`: "insert", "insert_multiple",
+    "update", "update_multiple", "upsert", "remove", "truncate" or
+    "import_ndjson". `documents` maps every ID in `doc_ids` to a copy of the
+    document: its new state, or its last one for removals.
+    """
+
+    table: str
+    op: Op
+    doc_ids: List[int]
+    documents: Dict[int, Mapping] = field(default_factory=dict)
+
+
+class Subscription:
+    """
+    Bounded queue of the changes made to a table, returned by `subscribe`.
+
+    Iterate over it with `async for`, or call `get`. When more than `maxsize`
+    changes are waiting, the oldest one is dropped and counted in `dropped`, so
+    consumers that fall behind can tell they have to read the table again.
+    Use it as an async context manager, or call `close`, to unsubscribe.
+    """
+
+    def __init__(
+        self,
+        feed: "ChangeFeed",
+        table: str,
+        cond: Optional[QueryLike],
+        maxsize: int,
+    ):
+        self.table = table
+        self.cond = cond
+        self.maxsize = maxsize
+        self.dropped = 0
+        self.closed = False
+        self._feed = feed
+        self._changes: Deque[Change] = collections.deque()
+        self._waiter: Optional[asyncio.Future] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Change:
+        change = await self.get()
+        if change is None:
+            raise StopAsyncIteration
+        return change
+
+    async def get(self) -> Optional[Change]:
+        """Wait for the next change; return None once the subscription is closed."""
+
+        while not self._changes:
+            if self.closed:
+                return None
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._changes.popleft()
+
+    def close(self):
+        """Stop receiving changes. Those already queued can still be read."""
+
+        if not self.closed:
+            self.closed = True
+            self._feed.unsubscribe(self)
+            self.__wake()
+
+    def _deliver(self, change: Change):
+        if self.cond is not None:
+            doc_ids = [
+                doc_id
+                for doc_id in change.doc_ids
+                if self.cond(change.documents[doc_id])
+            ]
+            if not doc_ids:
+                return
+            if len(doc_ids) != len(change.doc_ids):
+                change = Change(
+                    change.table,
+                    change.op,
+                    doc_ids,
+                    {doc_id: change.documents[doc_id] for doc_id in doc_ids},
+                )
+
+        if len(self._changes) >= self.maxsize:
+            self._changes.popleft()
+            self.dropped += 1
+        self._changes.append(change)
+        self.__wake()
+
+    def __wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+
+class ChangeFeed:
+    """
+    Publish changes to the subscriptions of their table.
+
+    Shared by all bridges on the same path. Changes are published on the event
+    loop once the mutation that made them has been written.
+    """
+
+    def __init__(self):
+        self._subscriptions: Dict[str, List[Subscription]] = {}
+
+    def watching(self, table: str) -> bool:
+        """Whether anyone subscribed to changes of `table`."""
+        return bool(self._subscriptions.get(table))
+
+    def subscribe(
+        self, table: str, cond: Optional[QueryLike] = None, maxsize: int = 100
+    ) -> Subscription:
+        subscription = Subscription(self, table, cond, maxsize)
+        self._subscriptions.setdefault(table, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscriptions.get(subscription.table, [])
+        if subscription in subscriptions:
+            subscriptions.remove(subscription)
+
+    def publish(self, change: Change):
+        """Deliver `change` to every matching subscription."""
+
+        for subscription in list(self._subscriptions.get(change.table, ())):
+            try:
+                subscription._deliver(change)
+            except Exception:
+                logger.exception(
+                    "tinybridge subscription filter %r failed", subscription.cond
+                )
+
+    def deferred(self) -> "DeferredFeed":
+        """Return a feed holding changes back until `DeferredFeed.commit`."""
+        return DeferredFeed(self)
+
+
+class DeferredFeed(ChangeFeed):
+    """Change feed of a transaction, published only when it commits."""
+
+    def __init__(self, feed: ChangeFeed):
+        super().__init__()
+        self._feed = feed
+        self._pending: List[Change] = []
+
+    def watching(self, table: str) -> bool:
+        return self._feed.watching(table)
+
+    def subscribe(
+        self, table: str, cond: Optional[QueryLike] = None, maxsize: int = 100
+    ) -> Subscription:
+        return self._feed.subscribe(table, cond, maxsize)
+
+    def publish(self, change: Change):
+        self._pending.append(change)
+
+    def commit(self):
+        """Publish the changes held back so far."""
+        pending, self._pending = self._pending, []
+        for change in pending:
+            self._feed.publish(change)
@@ -0,0 +1,253 @@
+# Secondary indexes on document fields
+
+import bisect
+import threading
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Set
+
+_MISSING = object()
+
+
+class HashIndex:
+    """
+    Equality index mapping field values to document IDs.
+
+    Answers `==` and `one_of` queries. Documents whose value is not hashable
+    (lists, objects) cannot be placed in the index and are always returned as
+    candidates.
+    """
+
+    kind = "hash"
+
+    def __init__(self, field: str):
+        self.field = field
+        self._ids: Dict[Hashable, Set[Any]] = {}
+        self._values: Dict[Any, Hashable] = {}
+        self._unhashable: Set[Any] = set()
+
+    def add(self, doc_id: Any, document: Mapping):
+        value = document.get(self.field, _MISSING)
+        if value is _MISSING:
+            return
+        try:
+            self._ids.setdefault(value, set()).add(doc_id)
+        except TypeError:
+            self._unhashable.add(doc_id)
+        else:
+            self._values[doc_id] = value
+
+    def discard(self, doc_id: Any):
+        if doc_id in self._unhashable:
+            self._unhashable.discard(doc_id)
+            return
+        value = self._values.pop(doc_id, _MISSING)
+        if value is _MISSING:
+            return
+        ids = self._ids[value]
+        ids.discard(doc_id)
+        if not ids:
+            del self._ids[value]
+
+    def clear(self):
+        self._ids.clear()
+        self._values.clear()
+        self._unhashable.clear()
+
+    def lookup(self, op: str, value: Any) -> Optional[Set[Any]]:
+        """Return candidate document IDs, or None if `op` is not supported."""
+        try:
+            if op == "==":
+                return self._ids.get(value, set()) | self._unhashable
+            if op == "one_of":
+                ids = set(self._unhashable)
+                for item in value:
+                    ids |= self._ids.get(item, set())
+                return ids
+        except TypeError:
+            pass
+        return None
+
+
+class SortedIndex:
+    """
+    Ordered index answering equality and range queries.
+
+    Values must be mutually comparable. As soon as they are not (e.g. numbers
+    mixed with strings or `None`), the index stops answering queries and
+    searches fall back to a full scan, which reports the comparison errors the
+    same way TinyDB does.
+    """
+
+    kind = "sorted"
+
+    def __init__(self, field: str):
+        self.field = field
+        self._keys: List[Any] = []
+        self._ids: List[Any] = []
+        self._values: Dict[Any, Any] = {}
+        self._usable = True
+
+    def add(self, doc_id: Any, document: Mapping):
+        value = document.get(self.field, _MISSING)
+        if value is _MISSING or not self._usable:
+            return
+        try:
+            position = bisect.bisect_right(self._keys, value)
+        except TypeError:
+            self._usable = False
+            return
+        self._keys.insert(position, value)
+        self._ids.insert(position, doc_id)
+        self._values[doc_id] = value
+
+    def discard(self, doc_id: Any):
+        value = self._values.pop(doc_id, _MISSING)
+        if value is _MISSING:
+            return
+        low = bisect.bisect_left(self._keys, value)
+        high = bisect.bisect_right(self._keys, value)
+        position = self._ids.index(doc_id, low, high)
+        del self._keys[position]
+        del self._ids[position]
+
+    def clear(self):
+        self._keys.clear()
+        self._ids.clear()
+        self._values.clear()
+        self._usable = True
+
+    def lookup(self, op: str, value: Any) -> Optional[Set[Any]]:
+        """Return candidate document IDs, or None if `op` is not supported."""
+        if not self._usable:
+            return None
+        keys = self._keys
+        try:
+            if op == "==":
+                low = bisect.bisect_left(keys, value)
+                high = bisect.bisect_right(keys, value)
+            elif op == "<":
+                low, high = 0, bisect.bisect_left(keys, value)
+            elif op == "<=":
+                low, high = 0, bisect.bisect_right(keys, value)
+            elif op == ">":
+                low, high = bisect.bisect_right(keys, value), len(keys)
+            elif op == ">=":
+                low, high = bisect.bisect_left(keys, value), len(keys)
+            else:
+                return None
+        except TypeError:
+            return None
+        return set(self._ids[low:high])
+
+
+INDEX_KINDS = {index.kind: index for index in (HashIndex, SortedIndex)}
+
+
+class TableIndexes:
+    """
+    Secondary indexes declared on one table.
+
+    Indexes are kept up to date by the bridge's mutation methods. Changes it
+    cannot follow (dropped tables, writes from other processes) mark them
+    stale, and they are rebuilt from the table on next use.
+    """
+
+    def __init__(self):
+        self._indexes: Dict[str, Any] = {}
+        self._stale = False
+        self._lock = threading.RLock()
+
+    def __bool__(self) -> bool:
+        return bool(self._indexes)
+
+    def __contains__(self, field: str) -> bool:
+        return field in self._indexes
+
+    def create(self, field: str, kind: str, documents: Mapping[Any, Mapping]):
+        """Declare an index on `field` and build it from `documents`."""
+        if kind not in INDEX_KINDS:
+            raise ValueError(f"Unknown index kind: {kind!r}")
+        index = INDEX_KINDS[kind](field)
+        for doc_id, document in documents.items():
+            index.add(doc_id, document)
+        with self._lock:
+            self._indexes[field] = index
+
+    def drop(self, field: str):
+        with self._lock:
+            del self._indexes[field]
+
+    def invalidate(self):
+        """Mark every index for a rebuild on next use."""
+        self._stale = True
+
+    def clear(self):
+        """Empty every index, e.g. after the table was truncated."""
+        with self._lock:
+            for index in self._indexes.values():
+                index.clear()
+            self._stale = False
+
+    def refresh(self, doc_ids: Iterable[Any], documents: Mapping[Any, Mapping]):
+        """Re-index the given documents, dropping those no longer present."""
+        with self._lock:
+            if self._stale:
+                self.__rebuild(documents)
+                return
+            for doc_id in doc_ids:
+                document = documents.get(doc_id)
+                for index in self._indexes.values():
+                    index.discard(doc_id)
+                    if document is not None:
+                        index.add(doc_id, document)
+
+    def candidates(
+        self, cond: Any, documents: Mapping[Any, Mapping]
+    ) -> Optional[Set[Any]]:
+        """
+        Return the IDs of documents that may match `cond`.
+
+        Returns None if the query cannot be answered from the indexes. The
+        candidates still have to be checked against the query itself.
+        """
+        with self._lock:
+            if self._stale:
+                self.__rebuild(documents)
+            return self.__plan(getattr(cond, "_hash", None))
+
+    def __rebuild(self, documents: Mapping[Any, Mapping]):
+        for index in self._indexes.values():
+            index.clear()
+            for doc_id, document in documents.items():
+                index.add(doc_id, document)
+        self._stale = False
+
+    def __plan(self, hashval: Any) -> Optional[Set[Any]]:
+        if not isinstance(hashval, tuple) or not hashval:
+            return None
+
+        op = hashval[0]
+        if op == "and":
+            plans = [self.__plan(part) for part in hashval[1]]
+            matches = sorted((ids for ids in plans if ids is not None), key=len)
+            if not matches:
+                return None
+            # Intersect from the smallest set and stop as soon as it is empty.
+            result = set(matches[0])
+            for other in matches[1:]:
+                if not result:
+                    break
+                result &= other
+            return result
+        if op == "or":
+            result = set()
+            for part in hashval[1]:
+                ids = self.__plan(part)
+                if ids is None:
+                    return None
+                result |= ids
+            return result
+        if len(hashval) == 3 and isinstance(hashval[1], tuple):
+            path = hashval[1]
+            if len(path) == 1 and path[0] in self._indexes:
+                return self._indexes[path[0]].lookup(op, hashval[2])
+        return None
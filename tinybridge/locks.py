@@ -0,0 +1,187 @@
+# Locking primitives shared by bridges on the same path
+
+import asyncio
+import collections
+import contextlib
+import threading
+from typing import AsyncIterator, Deque, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+class RWLock:
+    """
+    Asyncio reader-writer lock with writer preference.
+
+    Any number of readers may hold the lock at once, while a writer holds it
+    exclusively. Waiters are served in arrival order, so readers that arrive
+    after a waiting writer queue up behind it and writers are never starved.
+    Waiters passing a higher `priority` are served before those of lower ones,
+    still in arrival order among themselves.
+
+    Used as a plain async context manager the lock is taken exclusively, which
+    keeps it interchangeable with `asyncio.Lock`.
+    """
+
+    def __init__(self):
+        self._readers = 0
+        self._writer = False
+        self._waiters: Deque[Tuple[int, bool, asyncio.Future]] = collections.deque()
+
+    def locked(self) -> bool:
+        """Return True if the lock is held by a writer or any reader."""
+        return self._writer or self._readers > 0
+
+    @property
+    def readers(self) -> int:
+        """Number of readers currently holding the lock."""
+        return self._readers
+
+    async def acquire_read(self, priority: int = 0, timeout: Optional[float] = None):
+        """Acquire the lock in shared mode.
+
+        Raises `asyncio.TimeoutError` if it could not be acquired within
+        `timeout` seconds.
+        """
+        if not self._writer and not self.__queued(priority):
+            self._readers += 1
+            return
+        await self.__wait(False, priority, timeout)
+
+    async def acquire_write(self, priority: int = 0, timeout: Optional[float] = None):
+        """Acquire the lock in exclusive mode, see `acquire_read`."""
+        if not self.locked() and not self.__queued(priority):
+            self._writer = True
+            return
+        await self.__wait(True, priority, timeout)
+
+    def release_read(self):
+        """Release a shared hold of the lock."""
+        if self._readers <= 0:
+            raise RuntimeError("RWLock is not held by a reader")
+        self._readers -= 1
+        self.__wake()
+
+    def release_write(self):
+        """Release an exclusive hold of the lock."""
+        if not self._writer:
+            raise RuntimeError("RWLock is not held by a writer")
+        self._writer = False
+        self.__wake()
+
+    @contextlib.asynccontextmanager
+    async def shared(self) -> AsyncIterator[None]:
+        """Hold the lock in shared mode for the duration of the block."""
+        await self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextlib.asynccontextmanager
+    async def exclusive(self) -> AsyncIterator[None]:
+        """Hold the lock in exclusive mode for the duration of the block."""
+        await self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    async def __aenter__(self):
+        await self.acquire_write()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.release_write()
+
+    def __queued(self, priority: int) -> bool:
+        """Whether waiters of at least `priority` are queued."""
+        return bool(self._waiters) and self._waiters[0][0] >= priority
+
+    async def __wait(self, exclusive: bool, priority: int, timeout: Optional[float]):
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, exclusive, future)
+        position = len(self._waiters)
+        while position and self._waiters[position - 1][0] < priority:
+            position -= 1
+        self._waiters.insert(position, entry)
+        try:
+            if timeout is None:
+                await future
+            else:
+                await asyncio.wait_for(future, timeout)
+        except BaseException:
+            # Cancelled or timed out.
+            if future.done() and not future.cancelled():
+                # The lock was handed over right before the cancellation.
+                if exclusive:
+                    self.release_write()
+                else:
+                    self.release_read()
+            else:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                self.__wake()
+            raise
+
+    def __wake(self):
+        """Hand the lock over to waiters at the head of the queue."""
+        while self._waiters:
+            _, exclusive, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if exclusive:
+                if not self.locked():
+                    self._writer = True
+                    self._waiters.popleft()
+                    future.set_result(None)
+                break
+            if self._writer:
+                break
+            self._readers += 1
+            self._waiters.popleft()
+            future.set_result(None)
+
+
+class FileLock:
+    """
+    Advisory inter-process lock on a sidecar file, based on `fcntl.flock`.
+
+    The lock is meant to be taken from worker threads while the matching
+    `RWLock` is held, so within a process it is either held by a single writer
+    or by any number of readers. Holds are counted and the file lock is only
+    taken by the first holder and dropped by the last one, since `flock` locks
+    belong to the open file rather than to a thread.
+    """
+
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise RuntimeError("Inter-process locking requires fcntl (POSIX only)")
+        self.path = path
+        self._handle = open(path, "a+")
+        self._mutex = threading.Lock()
+        self._holders = 0
+
+    def acquire(self, shared: bool):
+        """Block until the lock is held in shared or exclusive mode."""
+        with self._mutex:
+            if self._holders == 0:
+                fcntl.flock(
+                    self._handle.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+                )
+            self._holders += 1
+
+    def release(self):
+        """Drop one hold of the lock."""
+        with self._mutex:
+            self._holders -= 1
+            if self._holders == 0:
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+
+    def __del__(self):
+        handle = getattr(self, "_handle", None)
+        if handle is not None:
+            handle.close()
@@ -0,0 +1,142 @@
+# Streaming NDJSON import and export helpers
+
+import collections.abc
+import functools
+import json
+import os
+from typing import (
+    IO,
+    AsyncGenerator,
+    AsyncIterable,
+    Callable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+# A path, an open text file, or an async iterable of documents or NDJSON lines.
+Source = Union[str, os.PathLike, IO[str], AsyncIterable[Union[Mapping, str, bytes]]]
+Target = Union[str, os.PathLike, IO[str]]
+
+
+def _open(target: Target, mode: str) -> IO[str]:
+    """Open a path as UTF-8 text, or return a file that is already open."""
+    if isinstance(target, (str, os.PathLike)):
+        return open(target, mode, encoding="utf-8")
+    return target
+
+
+def decode(line: Union[str, bytes], number: int) -> Mapping:
+    """Parse a single NDJSON line, which must hold a JSON object."""
+
+    try:
+        document = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON on line {number}: {e}") from e
+    if not isinstance(document, dict):
+        raise ValueError(f"Line {number} does not hold a JSON object")
+    return document
+
+
+def decode_all(items: List[Union[Mapping, str, bytes]], start: int) -> List[Mapping]:
+    """Parse the lines among `items`, numbered from `start`, skipping blank ones."""
+
+    documents: List[Mapping] = []
+    for number, item in enumerate(items, start=start):
+        if isinstance(item, Mapping):
+            documents.append(item)
+        elif item.strip():
+            documents.append(decode(item, number))
+    return documents
+
+
+class NDJSONReader:
+    """
+    Read documents from an NDJSON file, one chunk at a time.
+
+    Meant to be driven from worker threads: the file is only opened by the first
+    `read`. Files passed in open are left open.
+    """
+
+    def __init__(self, source: Union[str, os.PathLike, IO[str]]):
+        self._source = source
+        self._file: Optional[IO[str]] = None
+        self._line = 0
+        self.done = False
+
+    def read(self, size: int) -> List[Mapping]:
+        """Parse up to `size` documents, setting `done` at the end of the file."""
+
+        if self._file is None:
+            self._file = _open(self._source, "r")
+
+        documents: List[Mapping] = []
+        while len(documents) < size:
+            line = self._file.readline()
+            if not line:
+                self.done = True
+                break
+            self._line += 1
+            if line.strip():
+                documents.append(decode(line, self._line))
+        return documents
+
+    def close(self):
+        if self._file is not None and self._file is not self._source:
+            self._file.close()
+
+
+class NDJSONWriter:
+    """
+    Write documents to an NDJSON file, one chunk at a time.
+
+    Like `NDJSONReader`, the file is opened by the first write, from a worker
+    thread, and flushed after every chunk. Files passed in open are left open.
+    """
+
+    def __init__(self, target: Target):
+        self._target = target
+        self._file: Optional[IO[str]] = None
+
+    def open(self) -> IO[str]:
+        if self._file is None:
+            self._file = _open(self._target, "w")
+        return self._file
+
+    def write(self, documents: Sequence[Mapping]):
+        file = self.open()
+        file.write("".join(json.dumps(document) + "\n" for document in documents))
+        file.flush()
+
+    def close(self):
+        if self._file is not None and self._file is not self._target:
+            self._file.close()
+
+
+async def loaders(
+    source: Source, chunk_size: int
+) -> AsyncGenerator[Callable[[], List[Mapping]], None]:
+    """Yield callables that each parse the next chunk of `source` when called.
+
+    Callers must run each callable before asking for the next one.
+    """
+
+    if isinstance(source, collections.abc.AsyncIterable):
+        chunk, start = [], 1
+        async for item in source:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                yield functools.partial(decode_all, chunk, start)
+                chunk, start = [], start + len(chunk)
+        if chunk:
+            yield functools.partial(decode_all, chunk, start)
+        return
+
+    reader = NDJSONReader(source)
+    try:
+        while not reader.done:
+            yield functools.partial(reader.read, chunk_size)
+    finally:
+        reader.close()
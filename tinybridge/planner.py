@@ -0,0 +1,242 @@
+# Query planning: reorder and compile TinyDB query trees
+
+import functools
+import logging
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, overload
+
+from tinydb.queries import QueryInstance, QueryLike
+
+logger = logging.getLogger(__name__)
+
+_SCALARS = (str, int, float, bool, type(None))
+
+# Estimated share of documents matching a test, and relative cost of the test.
+_SELECTIVITY = {
+    "==": 0.1,
+    "one_of": 0.2,
+    "<": 0.5,
+    "<=": 0.5,
+    ">": 0.5,
+    ">=": 0.5,
+    "test": 0.5,
+    "!=": 0.9,
+    "exists": 0.9,
+}
+_COST = {"test": 10.0, "one_of": 1.5}
+
+
+class _Node:
+    """Compilable query node with its estimated selectivity and cost."""
+
+    # Set according to the kind: `children` of and/or, `child` of not, and the
+    # `path` plus `value` or `func` and `args` of tests.
+    children: List["_Node"]
+    child: "_Node"
+    path: Tuple[str, ...]
+    value: Any
+    func: Callable[..., bool]
+    args: tuple
+
+    def __init__(self, kind: str, selectivity: float, cost: float, **attrs: Any):
+        self.kind = kind
+        self.selectivity = selectivity
+        self.cost = cost
+        self.__dict__.update(attrs)
+
+
+def _leaf(op: str, path: Tuple[str, ...], **attrs: Any) -> _Node:
+    cost = _COST.get(op, 1.0) + 0.5 * len(path)
+    return _Node(op, _SELECTIVITY[op], cost, path=path, **attrs)
+
+
+def _parse(hashval: Any) -> Optional[_Node]:
+    """Turn a query's hash value into a node tree, None if it is not supported."""
+
+    if not isinstance(hashval, tuple) or not hashval:
+        return None
+    op = hashval[0]
+
+    if op in ("and", "or"):
+        children: List[_Node] = []
+        for part in hashval[1]:
+            child = _parse(part)
+            if child is None:
+                return None
+            # Flatten nested nodes of the same kind, TinyDB nests pairs.
+            children.extend(child.children if child.kind == op else [child])
+        return _order(op, children)
+    if op == "not":
+        child = _parse(hashval[1])
+        if child is None:
+            return None
+        return _Node("not", 1.0 - child.selectivity, child.cost, child=child)
+    if op not in _SELECTIVITY or len(hashval) < 2:
+        return None
+    path = hashval[1]
+    if not isinstance(path, tuple) or not path:
+        return None
+    if not all(isinstance(part, str) for part in path):
+        return None
+
+    if op == "exists":
+        return _leaf(op, path)
+    if op == "test":
+        return _leaf(op, path, func=hashval[2], args=hashval[3])
+    value = hashval[2]
+    if op == "one_of":
+        # `freeze` turned lists into tuples: only scalars compare the same way.
+        if not all(isinstance(item, _SCALARS) for item in value):
+            return None
+        return _leaf(op, path, value=frozenset(value))
+    if op in ("==", "!=") and not isinstance(value, _SCALARS):
+        return None
+    return _leaf(op, path, value=value)
+
+
+def _order(op: str, children: List[_Node]) -> _Node:
+    """Sort the branches of an and/or node so the cheapest decisive ones run first."""
+
+    if op == "and":
+        # Rank by the chance to rule a document out per unit of cost.
+        children.sort(key=lambda child: (child.selectivity - 1.0) / child.cost)
+        selectivity, cost, reach = 1.0, 0.0, 1.0
+        for child in children:
+            cost += reach * child.cost
+            reach *= child.selectivity
+        selectivity = reach
+    else:
+        children.sort(key=lambda child: -child.selectivity / child.cost)
+        miss, cost = 1.0, 0.0
+        for child in children:
+            cost += miss * child.cost
+            miss *= 1.0 - child.selectivity
+        selectivity = 1.0 - miss
+    return _Node(op, selectivity, cost, children=children)
+
+
+class _Emitter:
+    """Generate the source of a single function evaluating a node tree."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.names: Dict[str, Any] = {}
+        self.counter = 0
+
+    def constant(self, value: Any) -> str:
+        name = f"_c{len(self.names)}"
+        self.names[name] = value
+        return name
+
+    def variable(self) -> str:
+        self.counter += 1
+        return f"r{self.counter}"
+
+    def emit(self, node: _Node, indent: int) -> str:
+        """Emit statements computing `node`, return the variable holding it."""
+
+        pad = "    " * indent
+        result = self.variable()
+        if node.kind == "not":
+            inner = self.emit(node.child, indent)
+            self.lines.append(f"{pad}{result} = not {inner}")
+        elif node.kind in ("and", "or"):
+            decided = "False" if node.kind == "and" else "True"
+            self.lines.append(f"{pad}{result} = {decided}")
+            self.__chain(node, node.children, result, indent)
+        else:
+            self.__leaf(node, result, pad)
+        return result
+
+    def __chain(self, node: _Node, children: List[_Node], result: str, indent: int):
+        pad = "    " * indent
+        if not children:
+            self.lines.append(f"{pad}{result} = {node.kind == 'and'}")
+            return
+        inner = self.emit(children[0], indent)
+        test = inner if node.kind == "and" else f"not {inner}"
+        self.lines.append(f"{pad}if {test}:")
+        self.__chain(node, children[1:], result, indent + 1)
+
+    def __leaf(self, node: _Node, result: str, pad: str):
+        # Resolve the path like TinyDB: a missing key or a non-mapping
+        # along the way makes the test fail.
+        lookup = "".join(f"[{part!r}]" for part in node.path)
+        self.lines.append(f"{pad}try:")
+        self.lines.append(f"{pad}    value = document{lookup}")
+        self.lines.append(f"{pad}except (KeyError, TypeError):")
+        self.lines.append(f"{pad}    {result} = False")
+        self.lines.append(f"{pad}else:")
+        op = node.kind
+        if op == "exists":
+            self.lines.append(f"{pad}    {result} = True")
+        elif op == "test":
+            func = self.constant(node.func)
+            args = self.constant(node.args)
+            self.lines.append(f"{pad}    {result} = {func}(value, *{args})")
+        elif op == "one_of":
+            # Unhashable values cannot be equal to any of the scalars.
+            items = self.constant(node.value)
+            self.lines.append(f"{pad}    try:")
+            self.lines.append(f"{pad}        {result} = value in {items}")
+            self.lines.append(f"{pad}    except TypeError:")
+            self.lines.append(f"{pad}        {result} = False")
+        else:
+            value = self.constant(node.value)
+            self.lines.append(f"{pad}    {result} = value {op} {value}")
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(hashval: Any) -> Optional[Callable[[Mapping], bool]]:
+    node = _parse(hashval)
+    if node is None:
+        return None
+
+    emitter = _Emitter()
+    result = emitter.emit(node, 1)
+    source = "\n".join(
+        ["def match(document):", *emitter.lines, f"    return bool({result})"]
+    )
+    namespace = dict(emitter.names)
+    try:
+        exec(compile(source, "<tinybridge query>", "exec"), namespace)
+    except (SyntaxError, RecursionError, MemoryError):
+        # Very deep trees exceed the compiler's nesting limits.
+        logger.debug("tinybridge could not compile query %r", hashval)
+        return None
+    return namespace["match"]
+
+
+@overload
+def plan(cond: QueryLike) -> QueryLike: ...
+
+
+@overload
+def plan(cond: None) -> None: ...
+
+
+def plan(cond: Optional[QueryLike]) -> Optional[QueryLike]:
+    """
+    Return an equivalent query evaluated by a single compiled function.
+
+    TinyDB evaluates queries through one closure per test and per `&`, `|` and
+    `~`. Queries built from `==`, `!=`, `<`, `<=`, `>`, `>=`, `exists`,
+    `one_of` and `test` on plain field paths are compiled into one
+    flat function instead, with the branches of `&` and `|` reordered so the
+    cheapest, most selective tests run first. Comparisons that raise (e.g. `<`
+    between a number and a string) may therefore be skipped when another test
+    already decides the outcome. The result keeps the original query's hash,
+    so caches keyed on queries are unaffected. Other queries are returned as
+    they are.
+    """
+
+    hashval = getattr(cond, "_hash", None)
+    if hashval is None or not isinstance(cond, QueryInstance):
+        return cond
+    try:
+        match = _compile(hashval)
+    except TypeError:
+        # Unhashable comparison values, e.g. `where("tags") < ["a"]`.
+        return cond
+    if match is None:
+        return cond
+    return QueryInstance(match, hashval)
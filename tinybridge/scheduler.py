@@ -0,0 +1,117 @@
+# Priority lanes for the operations queued on a path
+
+import asyncio
+import collections
+import contextlib
+import contextvars
+import functools
+from typing import Callable, Deque, Dict, Iterator, Mapping, Optional
+
+# Lock priority of each lane: higher ones are served first.
+LANES = {"interactive": 1, "normal": 0, "batch": -1}
+
+_lane: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "tinybridge_lane", default=None
+)
+
+
+def check_lane(lane: str) -> str:
+    if lane not in LANES:
+        raise ValueError(f"Unknown priority lane {lane!r}")
+    return lane
+
+
+@contextlib.contextmanager
+def priority(lane: str) -> Iterator[None]:
+    """
+    Run the bridge operations started in this block in another lane.
+
+    `lane` is "interactive", "normal" or "batch" and overrides the `priority`
+    the bridges were created with. Operations take the lane of the context
+    they run in, so tasks must be created in the block to inherit it.
+    """
+
+    token = _lane.set(check_lane(lane))
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def current_lane(default: str) -> str:
+    """Return the lane set by `priority`, or `default` outside of it."""
+    lane = _lane.get()
+    return default if lane is None else lane
+
+
+class LaneLimits:
+    """
+    Per-lane concurrency limits of a path.
+
+    An operation holds a slot of its lane from the moment it starts waiting
+    for the path's locks until it has finished, so a lane limited to one slot
+    never has more than one operation queued ahead of the others. Lanes
+    without a limit are not tracked.
+    """
+
+    def __init__(self):
+        self.limits: Dict[str, int] = {}
+        self._active: Dict[str, int] = {}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {}
+
+    def configure(self, limits: Mapping[str, int]):
+        """Set the limits of the given lanes."""
+        for lane, limit in limits.items():
+            check_lane(lane)
+            if limit < 1:
+                raise ValueError(f"Lane {lane!r} needs at least one slot")
+        self.limits.update(limits)
+
+    async def enter(
+        self, lane: str, timeout: Optional[float] = None
+    ) -> Callable[[], None]:
+        """Take a slot of `lane` and return the function releasing it.
+
+        Raises `asyncio.TimeoutError` if no slot was free within `timeout`
+        seconds.
+        """
+
+        limit = self.limits.get(lane)
+        if limit is None:
+            return _nothing
+
+        release = functools.partial(self.__release, lane)
+        waiters = self._waiters.setdefault(lane, collections.deque())
+        if self._active.get(lane, 0) < limit and not waiters:
+            self._active[lane] = self._active.get(lane, 0) + 1
+            return release
+
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        try:
+            if timeout is None:
+                await future
+            else:
+                await asyncio.wait_for(future, timeout)
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # The slot was handed over right before the cancellation.
+                release()
+            elif future in waiters:
+                waiters.remove(future)
+            raise
+        return release
+
+    def __release(self, lane: str):
+        self._active[lane] -= 1
+        waiters = self._waiters.get(lane)
+        while waiters:
+            future = waiters.popleft()
+            if not future.done():
+                self._active[lane] += 1
+                future.set_result(None)
+                break
+
+
+def _nothing():
+    pass
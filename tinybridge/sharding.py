@@ -0,0 +1,812 @@
+# ShardedAIOBridge implementation
+
+import asyncio
+import json
+import zlib
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from result import Err, Ok, Result
+from tinydb.queries import QueryLike
+from tinydb.table import Document
+
+from .aiobridge import AIOBridge
+from .table import AIOTable
+
+T = TypeVar("T")
+
+IDs = Sequence[Hashable]
+
+
+async def _gather(
+    calls: Iterable[Awaitable[Result[T, Exception]]],
+) -> Result[List[T], Exception]:
+    """Await results concurrently, returning the first `Err` or all values."""
+
+    results = await asyncio.gather(*calls)
+    values = []
+    for result in results:
+        if isinstance(result, Err):
+            return result
+        values.append(result.ok())
+    return Ok(values)
+
+
+def _canonical(value: Any) -> Any:
+    """Map values that are equal in Python, like 1, 1.0 and True, to one form."""
+
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, Mapping):
+        return {str(_canonical(key)): _canonical(item) for key, item in value.items()}
+    return value
+
+
+class ShardedTable:
+    """
+    A logical table partitioned across the same table of several bridges.
+
+    Documents are placed by the hash of their `shard_key` field, or round-robin
+    without one. A `Document` inserted with an explicit ID goes to the shard of
+    that ID, which must match its shard key. Document IDs encode their shard: the document with ID `local`
+    on shard `i` of `n` has the ID `(local - 1) * n + i + 1`, so operations by
+    ID only touch the shards holding those documents. Queries fan out to every
+    shard concurrently, except equality queries on the shard key, which are
+    routed to a single shard. Results are merged in document ID order.
+
+    Operations spanning several shards are not atomic: if one shard fails, the
+    others keep their changes and the first `Err` is returned.
+    """
+
+    def __init__(self, tables: Sequence[AIOTable], shard_key: Optional[str] = None):
+        """Initialize ShardedTable.
+
+        Args:
+            tables (Sequence[AIOTable]): The table of every shard, in shard order.
+            shard_key (str, optional): Field whose value picks a document's shard.
+        """
+        self._tables = list(tables)
+        self._shard_key = shard_key
+        self._next = 0
+
+    @property
+    def name(self) -> str:
+        """Return the table name."""
+        return self._tables[0].name
+
+    @property
+    def shards(self) -> List[AIOTable]:
+        """Return the table of every shard."""
+        return list(self._tables)
+
+    def __global(self, shard: int, doc_id: Hashable) -> int:
+        return (cast(int, doc_id) - 1) * len(self._tables) + shard + 1
+
+    def __split(self, doc_id: Hashable) -> Tuple[int, int]:
+        """Return the shard and the shard-local ID of a document ID."""
+        index = cast(int, doc_id) - 1
+        return index % len(self._tables), index // len(self._tables) + 1
+
+    def __group(self, doc_ids: Iterable[Hashable]) -> Dict[int, List[Hashable]]:
+        """Group document IDs by shard, as shard-local IDs."""
+
+        groups: Dict[int, List[Hashable]] = {}
+        for doc_id in doc_ids:
+            shard, local = self.__split(doc_id)
+            groups.setdefault(shard, []).append(local)
+        return groups
+
+    def __document(self, shard: int, document: Document) -> Document:
+        return Document(document, self.__global(shard, document.doc_id))
+
+    def __merge(self, shards: List[int], batches: List[List[Document]]):
+        documents = [
+            self.__document(shard, document)
+            for shard, batch in zip(shards, batches)
+            for document in batch
+        ]
+        documents.sort(key=lambda document: document.doc_id)
+        return documents
+
+    def __hash(self, value: Any) -> int:
+        # Equal values must land on the same shard, as queries compare with `==`.
+        encoded = json.dumps(_canonical(value), sort_keys=True).encode()
+        return zlib.crc32(encoded) % len(self._tables)
+
+    def __place(self, document: Mapping) -> Tuple[int, Mapping]:
+        """Pick the shard of a new document, translating an explicit ID."""
+
+        if self._shard_key is not None:
+            if self._shard_key not in document:
+                raise KeyError(f"Document has no shard key {self._shard_key!r}")
+            # Raises TypeError for values JSON cannot encode.
+            shard = self.__hash(document[self._shard_key])
+        if isinstance(document, Document):
+            owner, local = self.__split(document.doc_id)
+            if self._shard_key is not None and owner != shard:
+                # Queries on the shard key would only look on `shard`.
+                raise ValueError(
+                    f"Document ID {document.doc_id} is on shard {owner}, "
+                    f"but its shard key belongs to shard {shard}"
+                )
+            return owner, Document(document, local)
+        if self._shard_key is not None:
+            return shard, document
+        shard = self._next
+        self._next = (shard + 1) % len(self._tables)
+        return shard, document
+
+    def __candidates(self, cond: Optional[QueryLike]) -> List[int]:
+        """Return the shards that can hold documents matching `cond`."""
+
+        key = getattr(cond, "_hash", None)
+        if self._shard_key is not None and key:
+            clauses = key[1] if key[0] == "and" else (key,)
+            for clause in clauses:
+                if (
+                    isinstance(clause, tuple)
+                    and len(clause) == 3
+                    and clause[0] == "=="
+                    and clause[1] == (self._shard_key,)
+                ):
+                    try:
+                        return [self.__hash(clause[2])]
+                    except TypeError:
+                        break
+        return list(range(len(self._tables)))
+
+    async def __fan_out(
+        self,
+        shards: List[int],
+        call: Callable[[AIOTable], Awaitable[Result[T, Exception]]],
+    ) -> Result[List[T], Exception]:
+        return await _gather(call(self._tables[shard]) for shard in shards)
+
+    async def __by_ids(
+        self,
+        doc_ids: Iterable[Hashable],
+        call: Callable[[AIOTable, List[Hashable]], Awaitable[Result[IDs, Exception]]],
+    ) -> Result[IDs, Exception]:
+        """Run a mutation on the shards holding `doc_ids`, returning global IDs."""
+
+        groups = self.__group(doc_ids)
+        shards = list(groups)
+        result = await _gather(
+            call(self._tables[shard], groups[shard]) for shard in shards
+        )
+        if isinstance(result, Err):
+            return result
+        return Ok(
+            [
+                self.__global(shard, doc_id)
+                for shard, ids in zip(shards, result.ok())
+                for doc_id in ids
+            ]
+        )
+
+    async def __by_query(
+        self,
+        cond: Optional[QueryLike],
+        call: Callable[[AIOTable], Awaitable[Result[IDs, Exception]]],
+    ) -> Result[IDs, Exception]:
+        """Run a mutation on the shards `cond` can match, returning global IDs."""
+
+        shards = self.__candidates(cond)
+        result = await self.__fan_out(shards, call)
+        if isinstance(result, Err):
+            return result
+        return Ok(
+            sorted(
+                self.__global(shard, doc_id)
+                for shard, ids in zip(shards, result.ok())
+                for doc_id in ids
+            )
+        )
+
+    async def insert(self, document: Mapping) -> Result[Hashable, Exception]:
+        """Insert a single document into its shard."""
+
+        try:
+            shard, document = self.__place(document)
+        except (KeyError, TypeError, ValueError) as e:
+            return Err(e)
+        result = await self._tables[shard].insert(document)
+        return result.map(lambda doc_id: self.__global(shard, doc_id))
+
+    async def insert_multiple(
+        self, documents: Iterable[Mapping]
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Insert multiple documents, one `insert_multiple` per shard."""
+
+        groups: Dict[int, List[Tuple[int, Mapping]]] = {}
+        count = 0
+        try:
+            for position, document in enumerate(documents):
+                shard, document = self.__place(document)
+                groups.setdefault(shard, []).append((position, document))
+                count = position + 1
+        except (KeyError, TypeError, ValueError) as e:
+            return Err(e)
+
+        shards = list(groups)
+        result = await _gather(
+            self._tables[shard].insert_multiple([doc for _, doc in groups[shard]])
+            for shard in shards
+        )
+        if isinstance(result, Err):
+            return result
+
+        doc_ids: List[Hashable] = [None] * count
+        for shard, ids in zip(shards, result.ok()):
+            for (position, _), doc_id in zip(groups[shard], ids):
+                doc_ids[position] = self.__global(shard, doc_id)
+        return Ok(doc_ids)
+
+    async def all(self) -> Result[List[Document], Exception]:
+        """Return all documents of every shard."""
+
+        shards = list(range(len(self._tables)))
+        result = await self.__fan_out(shards, lambda table: table.all())
+        return result.map(lambda batches: self.__merge(shards, batches))
+
+    async def search(self, cond: QueryLike) -> Result[List[Document], Exception]:
+        """Return documents matching the given query, from every shard."""
+
+        shards = self.__candidates(cond)
+        result = await self.__fan_out(shards, lambda table: table.search(cond))
+        return result.map(lambda batches: self.__merge(shards, batches))
+
+    async def __iterate(
+        self, cond: Optional[QueryLike], batch_size: int
+    ) -> AsyncIterator[Result[List[Document], Exception]]:
+        for shard in self.__candidates(cond):
+            table = self._tables[shard]
+            batches = (
+                table.iter_all(batch_size)
+                if cond is None
+                else table.iter_search(cond, batch_size)
+            )
+            async for batch in batches:
+                if isinstance(batch, Err):
+                    yield batch
+                    return
+                yield Ok([self.__document(shard, document) for document in batch.ok()])
+
+    def iter_all(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Result[List[Document], Exception]]:
+        """Iterate over all documents in batches, one shard after another."""
+        return self.__iterate(None, batch_size)
+
+    def iter_search(
+        self, cond: QueryLike, batch_size: int = 500
+    ) -> AsyncIterator[Result[List[Document], Exception]]:
+        """Iterate over matching documents in batches, one shard after another."""
+        return self.__iterate(cond, batch_size)
+
+    async def get(
+        self,
+        cond: Optional[QueryLike] = None,
+        doc_id: Optional[Hashable] = None,
+        doc_ids: Optional[List[Hashable]] = None,
+    ) -> Result[Optional[Union[Document, List[Document]]], Exception]:
+        """Get a document by query, `doc_id`, or list of IDs.
+
+        A query matching several documents returns the one with the lowest ID.
+        """
+
+        if doc_id is not None:
+            shard, local = self.__split(doc_id)
+            found = await self._tables[shard].get(doc_id=local)
+            return found.map(
+                lambda document: (
+                    None
+                    if document is None
+                    else self.__document(shard, cast(Document, document))
+                )
+            )
+
+        if doc_ids is not None:
+            groups = self.__group(doc_ids)
+            shards = list(groups)
+            batches = await _gather(
+                self._tables[shard].get(doc_ids=groups[shard]) for shard in shards
+            )
+            if isinstance(batches, Err):
+                return batches
+            documents = {
+                document.doc_id: document
+                for document in self.__merge(
+                    shards, cast(List[List[Document]], batches.ok())
+                )
+            }
+            return Ok([documents[doc_id] for doc_id in doc_ids if doc_id in documents])
+
+        if cond is not None:
+            shards = self.__candidates(cond)
+            firsts = await self.__fan_out(shards, lambda table: table.get(cond))
+            if isinstance(firsts, Err):
+                return firsts
+            matches = [
+                (shard, cast(Document, document))
+                for shard, document in zip(shards, firsts.ok())
+                if document is not None
+            ]
+            documents = self.__merge(
+                [shard for shard, _ in matches], [[doc] for _, doc in matches]
+            )
+            return Ok(documents[0] if documents else None)
+
+        return Err(RuntimeError("You have to pass either cond or doc_id or doc_ids"))
+
+    async def contains(
+        self, cond: Optional[QueryLike] = None, doc_id: Optional[Hashable] = None
+    ) -> Result[bool, Exception]:
+        """Check if a document exists by query or `doc_id`."""
+
+        if doc_id is not None:
+            shard, local = self.__split(doc_id)
+            return await self._tables[shard].contains(doc_id=local)
+        shards = self.__candidates(cond)
+        result = await self.__fan_out(shards, lambda table: table.contains(cond))
+        return result.map(any)
+
+    async def update(
+        self,
+        fields: Union[Mapping, Callable[[Mapping], None]],
+        cond: Optional[QueryLike] = None,
+        doc_ids: Optional[Iterable[Hashable]] = None,
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Update documents by query or `doc_ids`.
+
+        Documents stay on their shard, so updates must not change the shard key.
+        """
+
+        if doc_ids is not None:
+            return await self.__by_ids(
+                doc_ids, lambda table, ids: table.update(fields, doc_ids=ids)
+            )
+        return await self.__by_query(cond, lambda table: table.update(fields, cond))
+
+    async def update_multiple(
+        self,
+        updates: Iterable[Tuple[Union[Mapping, Callable[[Mapping], None]], QueryLike]],
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Update multiple document-query pairs on every shard."""
+
+        updates = list(updates)
+        return await self.__by_query(None, lambda table: table.update_multiple(updates))
+
+    async def upsert(
+        self, document: Mapping, cond: Optional[QueryLike] = None
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Update if match found, insert otherwise.
+
+        With a shard key in `document`, or an explicit document ID, the upsert
+        runs on that document's shard. Otherwise matches are updated on every
+        shard and the document is inserted if there were none, which is not
+        atomic against concurrent writers.
+        """
+
+        routed = isinstance(document, Document) or (
+            self._shard_key is not None and self._shard_key in document
+        )
+        if routed:
+            shard, document = self.__place(document)
+            result = await self._tables[shard].upsert(document, cond)
+            return result.map(
+                lambda ids: [self.__global(shard, doc_id) for doc_id in ids]
+            )
+
+        if cond is None:
+            return Err(
+                ValueError("If you don't specify a doc_id, you must specify a cond")
+            )
+        result = await self.update(document, cond)
+        if result.is_err() or result.ok():
+            return result
+        return (await self.insert(document)).map(lambda doc_id: [doc_id])
+
+    async def remove(
+        self,
+        cond: Optional[QueryLike] = None,
+        doc_ids: Optional[Iterable[Hashable]] = None,
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Remove documents by query or `doc_ids`."""
+
+        if doc_ids is not None:
+            return await self.__by_ids(
+                doc_ids, lambda table, ids: table.remove(doc_ids=ids)
+            )
+        return await self.__by_query(cond, lambda table: table.remove(cond))
+
+    async def truncate(self) -> Result[None, Exception]:
+        """Remove all documents from every shard."""
+        result = await self.__fan_out(
+            list(range(len(self._tables))), lambda table: table.truncate()
+        )
+        return result.map(lambda _: None)
+
+    async def count(self, cond: QueryLike) -> Result[int, Exception]:
+        """Return the number of documents matching the query."""
+        shards = self.__candidates(cond)
+        result = await self.__fan_out(shards, lambda table: table.count(cond))
+        return result.map(sum)
+
+    async def select(
+        self, fields: Union[str, Iterable[str]], cond: Optional[QueryLike] = None
+    ) -> Result[List[Document], Exception]:
+        """Return only `fields` of the documents, projected on every shard."""
+
+        fields = (fields,) if isinstance(fields, str) else tuple(fields)
+        shards = self.__candidates(cond)
+        result = await self.__fan_out(shards, lambda table: table.select(fields, cond))
+        return result.map(lambda batches: self.__merge(shards, batches))
+
+    async def count_by(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Dict[Any, int], Exception]:
+        """Count the documents per value of `field`, adding up the shards' counts."""
+
+        result = await self.__fan_out(
+            self.__candidates(cond), lambda table: table.count_by(field, cond)
+        )
+        if isinstance(result, Err):
+            return result
+        counts: Dict[Any, int] = {}
+        for part in result.ok():
+            for value, count in part.items():
+                counts[value] = counts.get(value, 0) + count
+        return Ok(counts)
+
+    async def sum(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Any, Exception]:
+        """Return the sum of `field`, adding up the shards' sums."""
+        result = await self.__fan_out(
+            self.__candidates(cond), lambda table: table.sum(field, cond)
+        )
+        return result.map(sum)
+
+    async def min(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Any, Exception]:
+        """Return the smallest value of `field` across the shards."""
+        result = await self.__fan_out(
+            self.__candidates(cond), lambda table: table.min(field, cond)
+        )
+        return result.map(
+            lambda parts: min((v for v in parts if v is not None), default=None)
+        )
+
+    async def max(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Any, Exception]:
+        """Return the largest value of `field` across the shards."""
+        result = await self.__fan_out(
+            self.__candidates(cond), lambda table: table.max(field, cond)
+        )
+        return result.map(
+            lambda parts: max((v for v in parts if v is not None), default=None)
+        )
+
+    async def distinct(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[List[Any], Exception]:
+        """Return the distinct values of `field`, one shard after another."""
+
+        result = await self.__fan_out(
+            self.__candidates(cond), lambda table: table.distinct(field, cond)
+        )
+        if isinstance(result, Err):
+            return result
+        values: List[Any] = []
+        for part in result.ok():
+            values.extend(value for value in part if value not in values)
+        return Ok(values)
+
+    async def create_index(
+        self, field: str, *, kind: str = "hash"
+    ) -> Result[None, Exception]:
+        """Index a field on every shard."""
+        result = await self.__fan_out(
+            list(range(len(self._tables))),
+            lambda table: table.create_index(field, kind=kind),
+        )
+        return result.map(lambda _: None)
+
+    async def drop_index(self, field: str) -> Result[None, Exception]:
+        """Remove the index on a field from every shard."""
+        result = await self.__fan_out(
+            list(range(len(self._tables))), lambda table: table.drop_index(field)
+        )
+        return result.map(lambda _: None)
+
+    async def clear_cache(self) -> Result[None, Exception]:
+        """Clear the query caches of every shard."""
+        result = await self.__fan_out(
+            list(range(len(self._tables))), lambda table: table.clear_cache()
+        )
+        return result.map(lambda _: None)
+
+
+class ShardedAIOBridge:
+    """
+    Partition a database across several TinyDB files.
+
+    Opens one `AIOBridge` per path, all with the same options, and exposes the
+    API of `AIOBridge` on top of them through `ShardedTable`. Each shard has
+    its own lock and file, so writes to different shards run in parallel and
+    only rewrite their own file.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[Union[str, None]],
+        *,
+        shard_key: Optional[str] = None,
+        **kwargs,
+    ):
+        """Initialize ShardedAIOBridge.
+
+        Args:
+            paths (Sequence[Union[str, None]]): Path of every shard. The number and
+                order of shards must stay the same for the lifetime of the data.
+            shard_key (str, optional): Field whose value picks a document's shard.
+                Documents are spread round-robin without one.
+            **kwargs: Passed to every `AIOBridge`.
+        """
+
+        if not paths:
+            raise ValueError("A sharded bridge needs at least one path")
+        self._bridges = [AIOBridge(path, **kwargs) for path in paths]
+        self._shard_key = shard_key
+        self._tables: Dict[str, ShardedTable] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await asyncio.gather(
+            *[
+                bridge.__aexit__(exc_type, exc_value, traceback)
+                for bridge in self._bridges
+            ]
+        )
+
+    @property
+    def shards(self) -> List[AIOBridge]:
+        """Return the bridge of every shard."""
+        return list(self._bridges)
+
+    async def _default(self) -> Result[ShardedTable, Exception]:
+        """Return the default table of every shard, opening the databases first."""
+
+        name = self._bridges[0]._default_table
+        table = self._tables.get(name)
+        if table is None:
+            result = await _gather(bridge._default() for bridge in self._bridges)
+            if isinstance(result, Err):
+                return result
+            table = self._tables.setdefault(
+                name, ShardedTable(result.ok(), self._shard_key)
+            )
+        return Ok(table)
+
+    async def __on_default(
+        self, call: Callable[[ShardedTable], Awaitable[Result[T, Exception]]]
+    ) -> Result[T, Exception]:
+        """Call a method of the default table."""
+
+        table = await self._default()
+        if isinstance(table, Err):
+            return table
+        return await call(table.ok())
+
+    async def __iterate_default(
+        self,
+        iterate: Callable[
+            [ShardedTable], AsyncIterator[Result[List[Document], Exception]]
+        ],
+    ) -> AsyncIterator[Result[List[Document], Exception]]:
+        """Iterate over the default table."""
+
+        table = await self._default()
+        if isinstance(table, Err):
+            yield table
+            return
+        async for batch in iterate(table.ok()):
+            yield batch
+
+    # DB level methods
+    async def table(self, name: str, **kwargs) -> Result[ShardedTable, Exception]:
+        """Access or create a table by name on every shard."""
+
+        table = self._tables.get(name)
+        if table is not None:
+            return Ok(table)
+        result = await _gather(bridge.table(name, **kwargs) for bridge in self._bridges)
+        if isinstance(result, Err):
+            return result
+        table = self._tables.setdefault(
+            name, ShardedTable(result.ok(), self._shard_key)
+        )
+        return Ok(table)
+
+    async def tables(self) -> Result[Set[str], Exception]:
+        """Return the set of table names found on any shard."""
+        result = await _gather(bridge.tables() for bridge in self._bridges)
+        return result.map(lambda names: set().union(*names))
+
+    async def drop_tables(self) -> Result[None, Exception]:
+        """Remove all tables from every shard."""
+        result = await _gather(bridge.drop_tables() for bridge in self._bridges)
+        return result.map(lambda _: None)
+
+    async def drop_table(self, name: str) -> Result[None, Exception]:
+        """Remove a specific table by name from every shard."""
+        result = await _gather(bridge.drop_table(name) for bridge in self._bridges)
+        return result.map(lambda _: None)
+
+    async def close(self) -> Result[None, Exception]:
+        """Close every shard."""
+        result = await _gather(bridge.close() for bridge in self._bridges)
+        return result.map(lambda _: None)
+
+    # Table level methods, applied to the default table
+    async def insert(self, document: Mapping) -> Result[Hashable, Exception]:
+        """Insert a single document."""
+        return await self.__on_default(lambda table: table.insert(document))
+
+    async def insert_multiple(
+        self, documents: Iterable[Mapping]
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Insert multiple documents."""
+        return await self.__on_default(lambda table: table.insert_multiple(documents))
+
+    async def all(self) -> Result[List[Document], Exception]:
+        """Return all documents in the table."""
+        return await self.__on_default(lambda table: table.all())
+
+    async def search(self, cond: QueryLike) -> Result[List[Document], Exception]:
+        """Return documents matching the given query."""
+        return await self.__on_default(lambda table: table.search(cond))
+
+    def iter_all(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Result[List[Document], Exception]]:
+        """Iterate over all documents in batches of up to `batch_size`."""
+        return self.__iterate_default(lambda table: table.iter_all(batch_size))
+
+    def iter_search(
+        self, cond: QueryLike, batch_size: int = 500
+    ) -> AsyncIterator[Result[List[Document], Exception]]:
+        """Iterate over documents matching the query in batches of up to `batch_size`."""
+        return self.__iterate_default(lambda table: table.iter_search(cond, batch_size))
+
+    async def get(
+        self,
+        cond: Optional[QueryLike] = None,
+        doc_id: Optional[Hashable] = None,
+        doc_ids: Optional[List[Hashable]] = None,
+    ) -> Result[Optional[Union[Document, List[Document]]], Exception]:
+        """Get a document by query, `doc_id`, or list of IDs."""
+        return await self.__on_default(lambda table: table.get(cond, doc_id, doc_ids))
+
+    async def contains(
+        self, cond: Optional[QueryLike] = None, doc_id: Optional[Hashable] = None
+    ) -> Result[bool, Exception]:
+        """Check if a document exists by query or `doc_id`."""
+        return await self.__on_default(lambda table: table.contains(cond, doc_id))
+
+    async def update(
+        self,
+        fields: Union[Mapping, Callable[[Mapping], None]],
+        cond: Optional[QueryLike] = None,
+        doc_ids: Optional[Iterable[Hashable]] = None,
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Update documents by query or `doc_ids`."""
+        return await self.__on_default(
+            lambda table: table.update(fields, cond, doc_ids)
+        )
+
+    async def update_multiple(
+        self,
+        updates: Iterable[Tuple[Union[Mapping, Callable[[Mapping], None]], QueryLike]],
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Update multiple document-query pairs."""
+        return await self.__on_default(lambda table: table.update_multiple(updates))
+
+    async def upsert(
+        self, document: Mapping, cond: Optional[QueryLike] = None
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Update if match found, insert otherwise."""
+        return await self.__on_default(lambda table: table.upsert(document, cond))
+
+    async def remove(
+        self,
+        cond: Optional[QueryLike] = None,
+        doc_ids: Optional[Iterable[Hashable]] = None,
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Remove documents by query or `doc_ids`."""
+        return await self.__on_default(lambda table: table.remove(cond, doc_ids))
+
+    async def truncate(self) -> Result[None, Exception]:
+        """Remove all documents from the table."""
+        return await self.__on_default(lambda table: table.truncate())
+
+    async def count(self, cond: QueryLike) -> Result[int, Exception]:
+        """Return the number of documents matching the query."""
+        return await self.__on_default(lambda table: table.count(cond))
+
+    async def select(
+        self, fields: Union[str, Iterable[str]], cond: Optional[QueryLike] = None
+    ) -> Result[List[Document], Exception]:
+        """Return only `fields` of the documents, see `ShardedTable.select`."""
+        return await self.__on_default(lambda table: table.select(fields, cond))
+
+    async def count_by(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Dict[Any, int], Exception]:
+        """Count the documents per value of `field`."""
+        return await self.__on_default(lambda table: table.count_by(field, cond))
+
+    async def sum(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Any, Exception]:
+        """Return the sum of `field`."""
+        return await self.__on_default(lambda table: table.sum(field, cond))
+
+    async def min(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Any, Exception]:
+        """Return the smallest value of `field`."""
+        return await self.__on_default(lambda table: table.min(field, cond))
+
+    async def max(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Any, Exception]:
+        """Return the largest value of `field`."""
+        return await self.__on_default(lambda table: table.max(field, cond))
+
+    async def distinct(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[List[Any], Exception]:
+        """Return the distinct values of `field`."""
+        return await self.__on_default(lambda table: table.distinct(field, cond))
+
+    async def create_index(
+        self, field: str, *, kind: str = "hash"
+    ) -> Result[None, Exception]:
+        """Index a field on every shard."""
+        return await self.__on_default(
+            lambda table: table.create_index(field, kind=kind)
+        )
+
+    async def drop_index(self, field: str) -> Result[None, Exception]:
+        """Remove the index on a field."""
+        return await self.__on_default(lambda table: table.drop_index(field))
+
+    async def clear_cache(self) -> Result[None, Exception]:
+        """Clear the query cache."""
+        return await self.__on_default(lambda table: table.clear_cache())
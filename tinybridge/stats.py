@@ -0,0 +1,237 @@
+# Operation statistics and tracing hooks
+
+import bisect
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class Histogram:
+    """Latency histogram with fixed, roughly logarithmic bucket bounds (seconds)."""
+
+    BOUNDS = (
+        0.0001,
+        0.00025,
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    )
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Record a single measurement."""
+        self.buckets[bisect.bisect_left(self.BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Return the upper bound of the bucket holding the `q` quantile."""
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.BOUNDS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+
+class MethodStats:
+    """Counters and latency histograms of a single bridge method."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.expired = 0
+        self.lock_wait = Histogram()
+        self.queue = Histogram()
+        self.execution = Histogram()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "expired": self.expired,
+            "lock_wait": self.lock_wait.as_dict(),
+            "queue": self.queue.as_dict(),
+            "execution": self.execution.as_dict(),
+        }
+
+
+@dataclass
+class OperationRecord:
+    """
+    Timings of a single bridge operation, passed to hooks once it completes.
+
+    `lock_wait` is the time spent waiting for the bridge's locks, `queue` the
+    time between handing the operation to the executor and a thread picking it
+    up, and `execution` the time spent running it. Phases that were never
+    reached, or had not finished when the operation timed out, are None.
+    `outcome` is one of "ok", "error", "timeout", "rejected", "expired" (timed
+    out while waiting for the locks) or "cancelled".
+    """
+
+    method: str
+    table: Optional[str] = None
+    lock_wait: Optional[float] = None
+    queue: Optional[float] = None
+    execution: Optional[float] = None
+    outcome: Optional[str] = None
+    error: Optional[Exception] = None
+    _started: float = field(default=0.0, repr=False)
+    _submitted: float = field(default=0.0, repr=False)
+    _finished: bool = field(default=False, repr=False)
+
+
+class PathStats:
+    """
+    Statistics of every operation run on a database path.
+
+    Shared by all bridges on the same path and available as `AIOBridge.stats`.
+    Worker threads report their timings directly, so operations that timed out
+    still contribute their execution time once their thread finishes.
+    """
+
+    def __init__(self):
+        self.methods: Dict[str, MethodStats] = {}
+        self.waiting = 0
+        self.running = 0
+        self._hooks: List[Callable[[OperationRecord], None]] = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Callable[[OperationRecord], None]):
+        """Call `hook` on the event loop with the record of every finished operation."""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[OperationRecord], None]):
+        """Stop calling a hook added with `add_hook`."""
+        self._hooks.remove(hook)
+
+    def reset(self):
+        """Forget every counter and histogram collected so far."""
+        with self._lock:
+            self.methods = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current statistics as plain data."""
+        with self._lock:
+            return {
+                "waiting": self.waiting,
+                "running": self.running,
+                "methods": {
+                    name: stats.as_dict() for name, stats in self.methods.items()
+                },
+            }
+
+    def _method(self, name: str) -> MethodStats:
+        stats = self.methods.get(name)
+        if stats is None:
+            stats = self.methods[name] = MethodStats()
+        return stats
+
+    def begin(self, method: str, table: Optional[str] = None) -> OperationRecord:
+        """Start recording an operation."""
+        return OperationRecord(method, table)
+
+    def acquiring(self, record: OperationRecord):
+        """Mark an operation as waiting for its locks."""
+        self.waiting += 1
+        record._started = time.perf_counter()
+
+    def acquired(self, record: OperationRecord):
+        """Mark an operation as holding its locks, about to be offloaded."""
+        now = time.perf_counter()
+        self.waiting -= 1
+        self.running += 1
+        record.lock_wait = now - record._started
+        record._submitted = now
+
+    def timed(self, record: OperationRecord, fn: Callable[[], T]) -> T:
+        """Run `fn` in the worker thread, measuring queue and execution time."""
+
+        started = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                record.queue = started - record._submitted
+                record.execution = finished - started
+                if record._finished:
+                    # The operation was given up on; report the late timings.
+                    stats = self._method(record.method)
+                    stats.queue.observe(record.queue)
+                    stats.execution.observe(record.execution)
+
+    def finish(self, record: OperationRecord):
+        """Account for a completed operation and run the hooks."""
+
+        if record.lock_wait is not None:
+            self.running -= 1
+        elif record._started:
+            self.waiting -= 1
+        if record.outcome is None:
+            record.outcome = "cancelled"
+
+        with self._lock:
+            record._finished = True
+            stats = self._method(record.method)
+            stats.calls += 1
+            if record.outcome == "error":
+                stats.errors += 1
+            elif record.outcome == "timeout":
+                stats.timeouts += 1
+            elif record.outcome == "rejected":
+                stats.rejected += 1
+            elif record.outcome == "expired":
+                stats.expired += 1
+            if record.lock_wait is not None:
+                stats.lock_wait.observe(record.lock_wait)
+            if record.execution is not None:
+                stats.queue.observe(record.queue)
+                stats.execution.observe(record.execution)
+
+        for hook in list(self._hooks):
+            try:
+                hook(record)
+            except Exception:
+                logger.exception("tinybridge stats hook %r failed", hook)
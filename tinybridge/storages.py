@@ -0,0 +1,648 @@
+# Storages tuned for use behind AIOBridge
+
+import copy
+import io
+import json
+import mmap
+import os
+import pickle
+import re
+import struct
+import threading
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from tinydb.storages import Storage, touch
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None  # type: ignore[assignment]
+
+_MISSING = object()
+
+Codec = Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]
+
+
+def _codec(backend: Optional[str]) -> Tuple[str, Codec]:
+    """Return the name and (dumps, loads) functions of a JSON backend."""
+
+    if backend is None:
+        backend = "orjson" if orjson else "msgspec" if msgspec else "json"
+    if backend == "orjson" and orjson is not None:
+        return backend, _fallback(orjson.dumps, orjson.loads, ValueError)
+    if backend == "msgspec" and msgspec is not None:
+        return backend, _fallback(
+            msgspec.json.encode, msgspec.json.decode, msgspec.DecodeError
+        )
+    if backend == "json":
+        return backend, (_json_dumps, json.loads)
+    raise ValueError(f"JSON backend {backend!r} is not available")
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj).encode()
+
+
+# A big-endian float64 with all exponent bits set (NaN or an infinity), after
+# msgpack's or pickle's float64 marker. UTF-8 text never contains the msgpack one.
+_MSGPACK_NON_FINITE = re.compile(rb"\xcb[\x7f\xff][\xf0-\xff]")
+_PICKLE_NON_FINITE = re.compile(rb"G[\x7f\xff][\xf0-\xff]")
+
+
+def _non_finite(obj: Any) -> bool:
+    """
+    Tell whether `obj` may hold a NaN or an infinity.
+
+    Encoding to a binary format that keeps floats as IEEE 754 doubles is far
+    faster than walking the values in Python. Matches within other data only
+    cost a needless fallback.
+    """
+
+    try:
+        if msgspec is not None:
+            return _MSGPACK_NON_FINITE.search(msgspec.msgpack.encode(obj)) is not None
+        return _PICKLE_NON_FINITE.search(pickle.dumps(obj, protocol=4)) is not None
+    except Exception:
+        return True
+
+
+def _fallback(
+    dumps: Callable[[Any], bytes],
+    loads: Callable[[bytes], Any],
+    decode_error: Type[Exception],
+) -> Codec:
+    """
+    Make a fast codec store exactly what `JSONStorage` would.
+
+    Values the fast encoders reject (non-string keys, integers beyond 64 bits)
+    or turn into `null` (NaN and infinities) are encoded by the standard
+    library instead, and its output is decoded by it as well.
+    """
+
+    def encode(obj: Any) -> bytes:
+        try:
+            encoded = dumps(obj)
+        except (TypeError, ValueError, OverflowError):
+            return _json_dumps(obj)
+        if b"null" in encoded and _non_finite(obj):
+            return _json_dumps(obj)
+        return encoded
+
+    def decode(content: bytes) -> Any:
+        try:
+            return loads(content)
+        except decode_error:
+            return json.loads(content)
+
+    return encode, decode
+
+
+class _CopyOnAccess(dict):
+    """Tables mapping that deep-copies a table the first time it is looked up."""
+
+    def __init__(self, tables):
+        super().__init__(tables)
+        self._copied = set()
+
+    def __getitem__(self, name):
+        table = super().__getitem__(name)
+        if name not in self._copied:
+            self._copied.add(name)
+            table = copy.deepcopy(table)
+            super().__setitem__(name, table)
+        return table
+
+    def __setitem__(self, name, table):
+        self._copied.add(name)
+        super().__setitem__(name, table)
+
+
+def _snapshot(document: Mapping) -> Dict[str, Any]:
+    """Copy a document deeply enough that in-place updates don't leak into it."""
+    return {
+        key: copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        for key, value in document.items()
+    }
+
+
+class AppendLogStorage(Storage):
+    """
+    Store the data as a JSON snapshot plus an append-only log of changes.
+
+    The snapshot at `path` has the same format as TinyDB's `JSONStorage`. Every
+    write appends one JSON line with the documents that changed to `<path>.log`
+    instead of rewriting the whole file, so the I/O of a write is proportional
+    to the change rather than to the database size. The log is replayed when the
+    storage is opened and folded into a new snapshot by a background thread
+    once it grows past `compact_threshold` bytes.
+
+    The whole database is kept in memory. Reads hand out copies of the tables
+    TinyDB looks up, so a failed update never alters the stored state. Changes
+    are found by comparing the tables TinyDB wrote back against the last written
+    documents, so no re-reading or re-encoding of untouched documents is needed.
+    The storage is meant for a single process.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        create_dirs: bool = False,
+        encoding: Optional[str] = None,
+        compact_threshold: int = 4 * 1024 * 1024,
+        sync: bool = True,
+        **kwargs,
+    ):
+        """
+        Create a new instance.
+
+        :param path: Where to store the JSON snapshot.
+        :param compact_threshold: Log size in bytes that triggers a compaction.
+        :param sync: `fsync` every write, like `JSONStorage` does.
+        :param kwargs: Passed to `json.dumps`.
+        """
+
+        super().__init__()
+
+        self.path = path
+        self.log_path = f"{path}.log"
+        self.compact_threshold = compact_threshold
+        self._encoding = encoding
+        self._sync = sync
+        self.kwargs = kwargs
+
+        touch(path, create_dirs=create_dirs)
+        self._lock = threading.Lock()
+        self._compaction: Optional[threading.Thread] = None
+
+        self._data: Dict[str, Dict[str, Any]] = self.__load()
+        # The tables of the last write. TinyDB only ever gets copies of them,
+        # so a table it writes back unchanged in identity was not touched.
+        self._tables = dict(self._data)
+        # Private copies of the last written documents, used to find changes
+        # and as a consistent source for compaction.
+        self._shadow = {
+            name: {doc_id: _snapshot(doc) for doc_id, doc in table.items()}
+            for name, table in self._data.items()
+        }
+        self._log = open(self.log_path, "a", encoding=encoding)
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        # TinyDB updates documents in place, even when the update then fails.
+        return _CopyOnAccess(self._data)
+
+    def write(self, data: Dict[str, Dict[str, Any]]):
+        with self._lock:
+            entries = self.__diff(data)
+            self._data = dict(data)
+            if not entries:
+                return
+
+            self._log.write(
+                "".join(json.dumps(entry, **self.kwargs) + "\n" for entry in entries)
+            )
+            self._log.flush()
+            if self._sync:
+                os.fsync(self._log.fileno())
+
+            if self._log.tell() >= self.compact_threshold and self._compaction is None:
+                self._compaction = threading.Thread(
+                    target=self.compact, name="tinybridge-compaction", daemon=True
+                )
+                self._compaction.start()
+
+    def compact(self):
+        """Fold the log into a new snapshot."""
+
+        with self._lock:
+            state = {name: dict(table) for name, table in self._shadow.items()}
+            offset = self._log.tell()
+
+        try:
+            self.__replace(self.path, json.dumps(state, **self.kwargs))
+
+            # Keep whatever was appended while the snapshot was written. Log
+            # entries hold absolute document states, so replaying entries that
+            # are already part of the snapshot is harmless after a crash.
+            with self._lock:
+                self._log.flush()
+                with open(self.log_path, "r", encoding=self._encoding) as log:
+                    log.seek(offset)
+                    tail = log.read()
+                self._log.close()
+                self.__replace(self.log_path, tail)
+                self._log = open(self.log_path, "a", encoding=self._encoding)
+        finally:
+            self._compaction = None
+
+    def close(self):
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+        self._log.close()
+
+    def __load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the snapshot and replay the log on top of it."""
+
+        with open(self.path, "r", encoding=self._encoding) as file:
+            content = file.read()
+        data = json.loads(content) if content else {}
+
+        if not os.path.exists(self.log_path):
+            return data
+
+        valid = 0
+        with open(self.log_path, "r", encoding=self._encoding) as log:
+            for line in log:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn write from a crash; everything after it is lost.
+                    break
+                self.__apply(data, entry)
+                valid += len(line.encode(self._encoding or "utf-8"))
+
+        if valid != os.path.getsize(self.log_path):
+            with open(self.log_path, "r+b") as log:
+                log.truncate(valid)
+        return data
+
+    @staticmethod
+    def __apply(data: Dict[str, Dict[str, Any]], entry: Mapping[str, Any]):
+        name = entry["t"]
+        if entry.get("drop"):
+            data.pop(name, None)
+            return
+        table = data.setdefault(name, {})
+        for doc_id in entry.get("del", ()):
+            table.pop(doc_id, None)
+        table.update(entry.get("set", {}))
+
+    def __diff(self, data: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return log entries turning the last written state into `data`."""
+
+        entries = []
+        for name in list(self._tables):
+            if name not in data:
+                entries.append({"t": name, "drop": True})
+                del self._tables[name]
+                del self._shadow[name]
+
+        for name, table in data.items():
+            if self._tables.get(name) is table:
+                continue
+            created = name not in self._tables
+            self._tables[name] = table
+            shadow = self._shadow.setdefault(name, {})
+
+            changed = {}
+            for doc_id, document in table.items():
+                if shadow.get(doc_id, _MISSING) != document:
+                    changed[doc_id] = document
+                    shadow[doc_id] = _snapshot(document)
+            deleted = [doc_id for doc_id in shadow if doc_id not in table]
+            for doc_id in deleted:
+                del shadow[doc_id]
+
+            if changed or deleted or created:
+                entry: Dict[str, Any] = {"t": name}
+                if deleted:
+                    entry["del"] = deleted
+                if changed or not deleted:
+                    entry["set"] = changed
+                entries.append(entry)
+        return entries
+
+    def __replace(self, path: str, content: str):
+        """Atomically replace the file at `path` with `content`."""
+
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding=self._encoding) as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+
+
+class FastJSONStorage(Storage):
+    """
+    Store the data in a JSON file, like `JSONStorage`, with less work per write.
+
+    Encoding uses `orjson` or `msgspec` when installed and falls back to the
+    standard library. The file content is kept in memory together with the
+    encoded bytes of every table, and since TinyDB replaces the table dict it
+    modifies, a write only re-encodes the tables whose identity changed. Every
+    read decodes a fresh copy from memory, as TinyDB changes documents in place
+    and a change that fails part way must not stick. The file is read again
+    whenever its size or modification time changes, so writes from other
+    storages or processes are picked up.
+
+    The file is always UTF-8 encoded.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        create_dirs: bool = False,
+        access_mode: str = "r+",
+        backend: Optional[str] = None,
+    ):
+        """
+        Create a new instance.
+
+        :param path: Where to store the JSON data.
+        :param access_mode: mode in which the file is opened (r, r+)
+        :param backend: "orjson", "msgspec" or "json"; the fastest available
+            one by default.
+        """
+
+        super().__init__()
+
+        self.backend, (self._dumps, self._loads) = _codec(backend)
+        self._mode = access_mode
+        if any(character in access_mode for character in ("+", "w", "a")):
+            touch(path, create_dirs=create_dirs)
+        self._handle = open(path, mode="rb+" if "+" in access_mode else "rb")
+
+        self._content = b""
+        self._stat: Optional[Tuple[int, int]] = None
+        # Table name -> (table object last handed out, encoded table if known).
+        self._encoded: Dict[str, Tuple[Dict[str, Any], Optional[bytes]]] = {}
+
+    def read(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        stat = self.__stat()
+        if stat != self._stat:
+            self._handle.seek(0)
+            self._content = self._handle.read()
+            self._encoded = {}
+            self._stat = stat
+        if not self._content:
+            return None
+
+        data = self._loads(self._content)
+        for name, table in data.items():
+            cached = self._encoded.get(name)
+            self._encoded[name] = (table, cached[1] if cached else None)
+        return data
+
+    def write(self, data: Dict[str, Dict[str, Any]]):
+        encoded: Dict[str, Tuple[Dict[str, Any], Optional[bytes]]] = {}
+        parts = []
+        for name, table in data.items():
+            cached = self._encoded.get(name)
+            if cached and cached[0] is table and cached[1] is not None:
+                chunk = cached[1]
+            else:
+                chunk = self._dumps(table)
+            encoded[name] = (table, chunk)
+            parts.append(self._dumps(name) + b":" + chunk)
+        content = b"{" + b",".join(parts) + b"}"
+
+        try:
+            self._handle.seek(0)
+            self._handle.write(content)
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+            self._handle.truncate()
+        except BaseException as e:
+            # The file may have been written in part; read it again instead
+            # of trusting the content kept in memory.
+            self._stat = None
+            if isinstance(e, io.UnsupportedOperation):
+                raise IOError(
+                    f'Cannot write to the database. Access mode is "{self._mode}"'
+                ) from e
+            raise
+
+        self._content = content
+        self._encoded = encoded
+        self._stat = self.__stat()
+
+    def close(self):
+        self._handle.close()
+
+    def __stat(self) -> Tuple[int, int]:
+        stat = os.fstat(self._handle.fileno())
+        return stat.st_size, stat.st_mtime_ns
+
+
+# Header of an `MMapStorage` file: magic, directory offset and directory length.
+_MMAP_HEADER = struct.Struct("<8sQQ")
+_MMAP_MAGIC = b"TBMMAP1\n"
+_MMAP_OFFSETS = struct.Struct("<QQ")
+
+
+class _MappedTable(Mapping):
+    """
+    Read-only table whose documents are decoded from a memory map on access.
+
+    The document IDs are decoded on first use, each document the first time
+    it is looked up, and the `capacity` most recently used decoded documents
+    are kept for later lookups.
+    """
+
+    def __init__(
+        self,
+        buffer: mmap.mmap,
+        loads: Callable[[bytes], Any],
+        offsets: int,
+        count: int,
+        ids: Tuple[int, int],
+        capacity: int,
+    ):
+        self._buffer = buffer
+        self._loads = loads
+        self._offsets = offsets
+        self._count = count
+        self._ids_span = ids
+        self._ids: Optional[Dict[str, int]] = None
+        self._capacity = capacity
+        self._documents: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __index(self) -> Dict[str, int]:
+        if self._ids is None:
+            with self._lock:
+                if self._ids is None:
+                    start, length = self._ids_span
+                    ids = self._loads(self._buffer[start : start + length])
+                    self._ids = {doc_id: index for index, doc_id in enumerate(ids)}
+        return self._ids
+
+    def __getitem__(self, doc_id: str) -> Any:
+        with self._lock:
+            document = self._documents.get(doc_id, _MISSING)
+            if document is not _MISSING:
+                self._documents.move_to_end(doc_id)
+                return document
+
+        index = self.__index()[doc_id]
+        start, end = _MMAP_OFFSETS.unpack_from(self._buffer, self._offsets + 8 * index)
+        document = self._loads(self._buffer[start:end])
+        with self._lock:
+            self._documents[doc_id] = document
+            if len(self._documents) > self._capacity:
+                self._documents.popitem(last=False)
+        return document
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self.__index()
+
+    def discard(self):
+        """Forget the decoded documents, so they are decoded again when used."""
+        with self._lock:
+            self._documents = OrderedDict()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__index())
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class MMapStorage(Storage):
+    """
+    Read-only storage that decodes documents lazily from a memory-mapped file.
+
+    `path` is a regular TinyDB JSON file. Next to it, at `<path>.mmap` unless
+    `index_path` says otherwise, the storage keeps a companion file holding
+    every document encoded on its own plus an offset table, and maps it into
+    memory. Opening only reads a small directory of tables; document IDs are
+    decoded when a table is first used and documents when they are first
+    looked up, so memory use follows the working set rather than the size of
+    the database. Up to `cache_size` decoded documents per table are kept for
+    later lookups. Scans such as `search` still decode every document they visit.
+
+    The companion file is built from `path` on first use and rebuilt whenever
+    `path` changes, which parses the JSON file once. Use `MMapStorage.build`
+    to prepare it ahead of time. Every write raises `IOError`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        index_path: Optional[str] = None,
+        backend: Optional[str] = None,
+        cache_size: int = 1000,
+    ):
+        """
+        Create a new instance.
+
+        :param path: The JSON file the data comes from.
+        :param index_path: Where to keep the companion file.
+        :param backend: "orjson", "msgspec" or "json"; the fastest available
+            one by default.
+        :param cache_size: Decoded documents kept per table.
+        """
+
+        super().__init__()
+
+        self.path = path
+        self.index_path = index_path or f"{path}.mmap"
+        self.backend, (self._dumps, self._loads) = _codec(backend)
+
+        if self.__stale():
+            self.build(path, self.index_path, backend=self.backend)
+
+        self._handle = open(self.index_path, "rb")
+        self._buffer = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        directory = self.__directory(self._buffer)
+        self._tables = {
+            name: _MappedTable(
+                self._buffer, self._loads, offsets, count, (start, length), cache_size
+            )
+            for name, (offsets, count, start, length) in directory["tables"].items()
+        }
+
+    @classmethod
+    def build(
+        cls, path: str, index_path: Optional[str] = None, backend: Optional[str] = None
+    ):
+        """Write the companion file of the JSON file at `path`."""
+
+        _, (dumps, loads) = _codec(backend)
+        index_path = index_path or f"{path}.mmap"
+        stat = os.stat(path)
+        with open(path, "rb") as file:
+            content = file.read()
+        data = loads(content) if content.strip() else {}
+
+        temporary = f"{index_path}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(_MMAP_HEADER.pack(_MMAP_MAGIC, 0, 0))
+            tables = {}
+            for name, table in data.items():
+                positions = []
+                for document in table.values():
+                    positions.append(file.tell())
+                    file.write(dumps(document))
+                positions.append(file.tell())
+
+                offsets = file.tell()
+                file.write(struct.pack(f"<{len(positions)}Q", *positions))
+                ids = dumps(list(table))
+                tables[name] = [offsets, len(table), file.tell(), len(ids)]
+                file.write(ids)
+
+            directory = dumps(
+                {"source": [stat.st_size, stat.st_mtime_ns], "tables": tables}
+            )
+            position = file.tell()
+            file.write(directory)
+            file.seek(0)
+            file.write(_MMAP_HEADER.pack(_MMAP_MAGIC, position, len(directory)))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, index_path)
+
+    # Tables are read-only mappings, which is all TinyDB needs of them.
+    def read(self) -> Optional[Dict[str, Mapping[str, Any]]]:  # type: ignore[override]
+        # TinyDB puts the tables it changed into the dict returned here.
+        return dict(self._tables)
+
+    def write(self, data: Dict[str, Dict[str, Any]]):
+        # The documents were already changed in place by TinyDB.
+        for table in self._tables.values():
+            table.discard()
+        raise IOError("Cannot write to the database. MMapStorage is read-only")
+
+    def close(self):
+        self._tables = {}
+        self._buffer.close()
+        self._handle.close()
+
+    def __stale(self) -> bool:
+        """Tell whether the companion file is missing or older than `path`."""
+
+        try:
+            with open(self.index_path, "rb") as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    directory = self.__directory(buffer)
+        except (OSError, ValueError):
+            return True
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return directory["source"] != [stat.st_size, stat.st_mtime_ns]
+
+    def __directory(self, buffer: mmap.mmap) -> Dict[str, Any]:
+        magic, position, length = _MMAP_HEADER.unpack_from(buffer)
+        if magic != _MMAP_MAGIC or not length:
+            raise ValueError(f"{self.index_path} is not an MMapStorage file")
+        return self._loads(buffer[position : position + length])
@@ -0,0 +1,746 @@
+# AIOTable implementation
+
+import functools
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from result import Err, Ok, Result
+from tinydb.queries import QueryLike
+from tinydb.table import Document, Table
+
+from .batch import READS
+from .cache import MISSING, ResultCache
+from .changes import Change, ChangeFeed, Op, Subscription
+from .indexes import TableIndexes
+from .ndjson import NDJSONWriter, Source, Target, loaders
+from .planner import plan
+from .utils import WriteBuffer
+
+T = TypeVar("T")
+
+# Called with the method name, for statistics, and the operation to run.
+Runner = Callable[[str, Callable[[], T]], Awaitable[Result[T, Exception]]]
+
+
+class _TableOperations:
+    """
+    `Result`-returning operations on a single TinyDB table.
+
+    Shared by `AIOTable` and `Transaction`, which differ in how they give
+    access to other tables.
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        indexes: Dict[str, TableIndexes],
+        *,
+        read: Runner,
+        write: Runner,
+        commit: Runner,
+        cache: Optional[ResultCache] = None,
+        feed: Optional[ChangeFeed] = None,
+    ):
+        """Initialize the table operations.
+
+        Args:
+            table (Table): The TinyDB table to wrap.
+            indexes (Dict[str, TableIndexes]): Index registry of the bridge's path.
+            read (Callable): Runs a read-only operation on this table.
+            write (Callable): Runs an operation needing exclusive table access.
+            commit (Callable): Runs a mutation, honouring group commit.
+            cache (ResultCache, optional): Cache consulted by read methods before
+                they are dispatched to a thread.
+            feed (ChangeFeed, optional): Feed that mutations are published to.
+        """
+        self._table = table
+        self._indexes = indexes
+        self.__read = read
+        self.__write = write
+        self.__commit = commit
+        self._cache = cache
+        self._feed = feed
+
+    @property
+    def name(self) -> str:
+        """Return the table name."""
+        return self._table.name
+
+    async def __query(
+        self, method: str, op: Callable[..., T], *args, **kwargs
+    ) -> Result[T, Exception]:
+        return await self.__read(method, functools.partial(op, *args, **kwargs))
+
+    async def __cached(
+        self, method: str, op: Callable[..., T], *args
+    ) -> Result[T, Exception]:
+        """Run a read, answering it from the result cache when possible."""
+
+        cache = self._cache
+        key = None if cache is None else cache.key(self.name, method, args)
+        if cache is None or key is None:
+            return await self.__query(method, op, *args)
+
+        value = cache.get(key)
+        if value is not MISSING:
+            return Ok(value)
+
+        token = cache.token(self.name)
+        result = await self.__query(method, op, *args)
+        if result.is_ok():
+            cache.put(key, token, result.ok())
+        return result
+
+    async def __mutate(
+        self, method: str, op: Callable[..., T], *args, **kwargs
+    ) -> Result[T, Exception]:
+        changes: List[Change] = []
+        if self._feed is not None and self._feed.watching(self.name):
+            op = functools.partial(self.__tracked, method, changes, op)
+        result = await self.__commit(method, functools.partial(op, *args, **kwargs))
+        if self._feed is not None and result.is_ok():
+            for change in changes:
+                self._feed.publish(change)
+        return result
+
+    def __tracked(
+        self,
+        method: str,
+        changes: List[Change],
+        op: Callable[..., T],
+        *args,
+        **kwargs,
+    ) -> T:
+        """Run a mutation and record the change it made for the feed."""
+
+        table = self._table
+        with WriteBuffer(table.storage) as buffer:
+            before = (buffer.read() or {}).get(self.name, {})
+            result = op(*args, **kwargs)
+            buffer.commit()
+
+        if result is None:
+            doc_ids = list(before)
+        else:
+            doc_ids = result if isinstance(result, list) else [result]
+        # TinyDB replaces the table dict it changes, so `before` is intact.
+        removed = method in ("remove", "truncate")
+        documents = before if removed else (buffer.data or {}).get(self.name, {})
+        if not doc_ids:
+            return result
+        doc_ids = [table.document_id_class(doc_id) for doc_id in doc_ids]
+        changes.append(
+            Change(
+                self.name,
+                # Only the mutations named in `Op` are tracked.
+                cast(Op, method),
+                doc_ids,
+                {doc_id: dict(documents[str(doc_id)]) for doc_id in doc_ids},
+            )
+        )
+        return result
+
+    def __indexed(self, op: Callable[..., T], *args) -> T:
+        """Run a mutation that returns document IDs and re-index those."""
+
+        indexes = self._indexes.get(self.name)
+        if not indexes:
+            return op(*args)
+
+        with WriteBuffer(self._table.storage) as buffer:
+            result = op(*args)
+            buffer.commit()
+
+        doc_ids = result if isinstance(result, list) else [result]
+        documents = (buffer.data or {}).get(self.name, {})
+        indexes.refresh([str(doc_id) for doc_id in doc_ids], documents)
+        return result
+
+    def __truncate(self):
+        """Truncate the table and empty its indexes."""
+
+        self._table.truncate()
+        indexes = self._indexes.get(self.name)
+        if indexes:
+            indexes.clear()
+
+    def __lookup(self, cond: QueryLike, limit: Optional[int] = None):
+        """
+        Find documents matching `cond` through the table's indexes.
+
+        Returns None if the table has no index usable for the query, in which
+        case the caller falls back to TinyDB's full scan. Matches are returned
+        in ascending document ID order.
+        """
+
+        indexes = self._indexes.get(self.name)
+        if not indexes:
+            return None
+
+        table = self._table
+        documents = table._read_table()
+        candidates = indexes.candidates(cond, documents)
+        if candidates is None:
+            return None
+
+        matches = []
+        for doc_id in sorted(candidates, key=table.document_id_class):
+            document = documents.get(doc_id)
+            if document is not None and cond(document):
+                matches.append(
+                    table.document_class(document, table.document_id_class(doc_id))
+                )
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    def __search(self, cond: QueryLike) -> List[Document]:
+        cond = plan(cond)
+        matches = self.__lookup(cond)
+        return self._table.search(cond) if matches is None else matches
+
+    def __get(self, cond, doc_id, doc_ids):
+        cond = plan(cond)
+        if cond is not None and doc_id is None and doc_ids is None:
+            matches = self.__lookup(cond, limit=1)
+            if matches is not None:
+                return matches[0] if matches else None
+        return self._table.get(cond, doc_id, doc_ids)
+
+    def __contains(self, cond, doc_id) -> bool:
+        cond = plan(cond)
+        if cond is not None and doc_id is None:
+            matches = self.__lookup(cond, limit=1)
+            if matches is not None:
+                return bool(matches)
+        return self._table.contains(cond, doc_id)
+
+    def __count(self, cond: QueryLike) -> int:
+        return len(self.__search(cond))
+
+    def __items(self, cond: Optional[QueryLike]) -> Iterable[Tuple[str, Mapping]]:
+        """Return the stored documents `cond` may match, narrowed by indexes."""
+
+        table = self._table
+        documents = table._read_table()
+        indexes = self._indexes.get(self.name)
+        if cond is not None and indexes:
+            candidates = indexes.candidates(cond, documents)
+            if candidates is not None:
+                return [
+                    (doc_id, documents[doc_id])
+                    for doc_id in sorted(candidates, key=table.document_id_class)
+                    if doc_id in documents
+                ]
+        return documents.items()
+
+    def __snapshot(self, cond: Optional[QueryLike]) -> List[str]:
+        """Capture the IDs of the documents an iteration will go through."""
+        return [doc_id for doc_id, _ in self.__items(cond)]
+
+    def __matching(self, cond: Optional[QueryLike]) -> Iterator[Tuple[str, Mapping]]:
+        """Yield the stored documents matching `cond`, without copying them."""
+
+        cond = plan(cond)
+        for doc_id, document in self.__items(cond):
+            if cond is None or cond(document):
+                yield doc_id, document
+
+    def __values(self, field: str, cond: Optional[QueryLike]) -> Iterator[Any]:
+        """Yield `field` of the matching documents that have it."""
+
+        for _, document in self.__matching(cond):
+            if field in document:
+                yield document[field]
+
+    def __select(
+        self, fields: Tuple[str, ...], cond: Optional[QueryLike]
+    ) -> List[Document]:
+        table = self._table
+        return [
+            table.document_class(
+                {field: document[field] for field in fields if field in document},
+                table.document_id_class(doc_id),
+            )
+            for doc_id, document in self.__matching(cond)
+        ]
+
+    def __count_by(self, field: str, cond: Optional[QueryLike]) -> Dict[Any, int]:
+        counts: Dict[Any, int] = {}
+        for value in self.__values(field, cond):
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    def __sum(self, field: str, cond: Optional[QueryLike]) -> Any:
+        return sum(self.__values(field, cond))
+
+    def __min(self, field: str, cond: Optional[QueryLike]) -> Any:
+        return min(self.__values(field, cond), default=None)
+
+    def __max(self, field: str, cond: Optional[QueryLike]) -> Any:
+        return max(self.__values(field, cond), default=None)
+
+    def __distinct(self, field: str, cond: Optional[QueryLike]) -> List[Any]:
+        seen = set()
+        values = []
+        for value in self.__values(field, cond):
+            try:
+                if value in seen:
+                    continue
+                seen.add(value)
+            except TypeError:
+                # Lists and objects cannot be hashed, compare them one by one.
+                if value in values:
+                    continue
+            values.append(value)
+        return values
+
+    def __scan(
+        self,
+        doc_ids: List[str],
+        position: int,
+        cond: Optional[QueryLike],
+        batch_size: int,
+    ) -> Tuple[List[Document], int]:
+        """Collect up to `batch_size` matches from `doc_ids`, starting at `position`."""
+
+        table = self._table
+        documents = table._read_table()
+        batch: List[Document] = []
+        while position < len(doc_ids) and len(batch) < batch_size:
+            doc_id = doc_ids[position]
+            position += 1
+            # Documents removed since the iteration started are skipped.
+            document = documents.get(doc_id)
+            if document is not None and (cond is None or cond(document)):
+                batch.append(
+                    table.document_class(document, table.document_id_class(doc_id))
+                )
+        return batch, position
+
+    async def __iterate(
+        self, cond: Optional[QueryLike], batch_size: int
+    ) -> AsyncIterator[Result[List[Document], Exception]]:
+        """Yield batches of documents from a snapshot of the table."""
+
+        method = "iter_all" if cond is None else "iter_search"
+        cond = plan(cond)
+        snapshot = await self.__query(method, self.__snapshot, cond)
+        if isinstance(snapshot, Err):
+            yield snapshot
+            return
+
+        doc_ids, position = snapshot.ok(), 0
+        while position < len(doc_ids):
+            result = await self.__query(
+                method, self.__scan, doc_ids, position, cond, batch_size
+            )
+            if isinstance(result, Err):
+                yield result
+                return
+            batch, position = result.ok()
+            if batch:
+                yield Ok(batch)
+
+    def __import(
+        self, load: Callable[[], List[Mapping]], id_field: Optional[str]
+    ) -> List[int]:
+        """Parse the next chunk of an import and insert it, returning the new IDs."""
+
+        table = self._table
+        documents = load()
+        if id_field is not None:
+            documents = [
+                (
+                    table.document_class(
+                        {
+                            key: value
+                            for key, value in document.items()
+                            if key != id_field
+                        },
+                        table.document_id_class(document[id_field]),
+                    )
+                    if id_field in document
+                    else document
+                )
+                for document in documents
+            ]
+        if not documents:
+            return []
+
+        doc_ids = self.__indexed(table.insert_multiple, documents)
+        if id_field is not None:
+            # TinyDB does not move its next ID past explicitly given ones.
+            table._next_id = None
+        return doc_ids
+
+    def __export_snapshot(
+        self, writer: NDJSONWriter, cond: Optional[QueryLike]
+    ) -> List[str]:
+        writer.open()
+        return self.__snapshot(cond)
+
+    def __export(
+        self,
+        writer: NDJSONWriter,
+        doc_ids: List[str],
+        position: int,
+        cond: Optional[QueryLike],
+        chunk_size: int,
+        id_field: Optional[str],
+    ) -> Tuple[int, int]:
+        """Write the next chunk of an export, returning its size and the new position."""
+
+        batch, position = self.__scan(doc_ids, position, cond, chunk_size)
+        documents: Sequence[Mapping] = batch
+        if id_field is not None:
+            documents = [{**document, id_field: document.doc_id} for document in batch]
+        writer.write(documents)
+        return len(batch), position
+
+    def _operation(
+        self, method: str, changes: Optional[List[Change]] = None
+    ) -> Callable[..., object]:
+        """Return the thread-side implementation of a table-level method.
+
+        Mutations record their change into `changes` if the table is watched.
+        """
+
+        table = self._table
+        operations: Dict[str, Callable[..., object]] = {
+            "insert": functools.partial(self.__indexed, table.insert),
+            "insert_multiple": functools.partial(self.__indexed, table.insert_multiple),
+            "update": functools.partial(self.__indexed, table.update),
+            "update_multiple": functools.partial(self.__indexed, table.update_multiple),
+            "upsert": functools.partial(self.__indexed, table.upsert),
+            "remove": functools.partial(self.__indexed, table.remove),
+            "truncate": self.__truncate,
+            "all": table.all,
+            "search": self.__search,
+            "get": self.__get,
+            "contains": self.__contains,
+            "count": self.__count,
+            "select": self.__select,
+            "count_by": self.__count_by,
+            "sum": self.__sum,
+            "min": self.__min,
+            "max": self.__max,
+            "distinct": self.__distinct,
+        }
+        op = operations[method]
+        watched = self._feed is not None and self._feed.watching(self.name)
+        if changes is not None and watched and method not in READS:
+            op = functools.partial(self.__tracked, method, changes, op)
+        return op
+
+    def __create_index(self, field: str, kind: str):
+        indexes = self._indexes.setdefault(self.name, TableIndexes())
+        indexes.create(field, kind, self._table._read_table())
+
+    def __drop_index(self, field: str):
+        self._indexes[self.name].drop(field)
+
+    async def insert(self, document: Mapping) -> Result[Hashable, Exception]:
+        """Insert a single document."""
+        return await self.__mutate(
+            "insert", self.__indexed, self._table.insert, document
+        )
+
+    async def insert_multiple(
+        self, documents: Iterable[Mapping]
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Insert multiple documents."""
+        return await self.__mutate(
+            "insert_multiple", self.__indexed, self._table.insert_multiple, documents
+        )
+
+    async def all(self) -> Result[List[Document], Exception]:
+        """Return all documents in the table."""
+        return await self.__cached("all", self._table.all)
+
+    async def search(self, cond: QueryLike) -> Result[List[Document], Exception]:
+        """Return documents matching the given query."""
+        return await self.__cached("search", self.__search, cond)
+
+    def iter_all(
+        self, batch_size: int = 500
+    ) -> AsyncIterator[Result[List[Document], Exception]]:
+        """Iterate over all documents in batches of up to `batch_size`."""
+        return self.__iterate(None, batch_size)
+
+    def iter_search(
+        self, cond: QueryLike, batch_size: int = 500
+    ) -> AsyncIterator[Result[List[Document], Exception]]:
+        """Iterate over documents matching the query in batches of up to `batch_size`.
+
+        The IDs of the documents to visit are captured when iteration starts, so
+        documents inserted afterwards are not seen. Each batch is read, matched
+        and copied in its own thread hop, so documents removed in the meantime
+        are skipped and updated ones are seen in their state at that time.
+        Iteration stops after the first `Err`.
+        """
+        return self.__iterate(cond, batch_size)
+
+    async def import_ndjson(
+        self,
+        source: Source,
+        chunk_size: int = 1000,
+        *,
+        id_field: Optional[str] = None,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Result[int, Exception]:
+        """Insert documents from NDJSON, `chunk_size` at a time.
+
+        `source` is a path, an open text file, or an async iterable of documents
+        or NDJSON lines. Each chunk is parsed and inserted in one thread hop and
+        written to the storage on its own, so memory stays bounded by the chunk
+        size; run the import in a transaction to write once, at the end. Blank
+        lines are skipped. `id_field` names a field holding document IDs, which
+        is removed from the documents. `progress` is called with the number of
+        documents imported so far after every chunk.
+
+        Returns the number of imported documents, or the `Err` of the first
+        failing chunk, in which case earlier chunks stay inserted.
+        """
+
+        total = 0
+        chunks = loaders(source, chunk_size)
+        try:
+            async for load in chunks:
+                result = await self.__mutate(
+                    "import_ndjson", self.__import, load, id_field
+                )
+                if isinstance(result, Err):
+                    return result
+                total += len(result.ok())
+                if progress is not None and result.ok():
+                    progress(total)
+        finally:
+            await chunks.aclose()
+        return Ok(total)
+
+    async def export_ndjson(
+        self,
+        target: Target,
+        cond: Optional[QueryLike] = None,
+        *,
+        chunk_size: int = 1000,
+        id_field: Optional[str] = None,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Result[int, Exception]:
+        """Write the table's documents, or those matching `cond`, as NDJSON.
+
+        `target` is a path or an open text file. Documents are matched, encoded
+        and written `chunk_size` at a time in their own thread hops, with the
+        same consistency as `iter_search`. `id_field` adds each document's ID
+        under that field. `progress` is called with the number of documents
+        exported so far after every chunk. Returns the number of documents.
+        """
+
+        cond = plan(cond)
+        writer = NDJSONWriter(target)
+        try:
+            snapshot = await self.__query(
+                "export_ndjson", self.__export_snapshot, writer, cond
+            )
+            if isinstance(snapshot, Err):
+                return snapshot
+
+            doc_ids, position, total = snapshot.ok(), 0, 0
+            while position < len(doc_ids):
+                result = await self.__query(
+                    "export_ndjson",
+                    self.__export,
+                    writer,
+                    doc_ids,
+                    position,
+                    cond,
+                    chunk_size,
+                    id_field,
+                )
+                if isinstance(result, Err):
+                    return result
+                count, position = result.ok()
+                total += count
+                if progress is not None and count:
+                    progress(total)
+            return Ok(total)
+        finally:
+            writer.close()
+
+    async def get(
+        self,
+        cond: Optional[QueryLike] = None,
+        doc_id: Optional[Hashable] = None,
+        doc_ids: Optional[List[Hashable]] = None,
+    ) -> Result[Optional[Union[Document, List[Document]]], Exception]:
+        """Get a document by query, `doc_id`, or list of IDs."""
+        return await self.__cached("get", self.__get, cond, doc_id, doc_ids)
+
+    async def contains(
+        self, cond: Optional[QueryLike] = None, doc_id: Optional[Hashable] = None
+    ) -> Result[bool, Exception]:
+        """Check if a document exists by query or `doc_id`."""
+        return await self.__cached("contains", self.__contains, cond, doc_id)
+
+    async def update(
+        self,
+        fields: Union[Mapping, Callable[[Mapping], None]],
+        cond: Optional[QueryLike] = None,
+        doc_ids: Optional[Iterable[Hashable]] = None,
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Update documents by query or `doc_ids`."""
+        return await self.__mutate(
+            "update", self.__indexed, self._table.update, fields, plan(cond), doc_ids
+        )
+
+    async def update_multiple(
+        self,
+        updates: Iterable[Tuple[Union[Mapping, Callable[[Mapping], None]], QueryLike]],
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Update multiple document-query pairs."""
+        updates = [(fields, plan(cond)) for fields, cond in updates]
+        return await self.__mutate(
+            "update_multiple", self.__indexed, self._table.update_multiple, updates
+        )
+
+    async def upsert(
+        self, document: Mapping, cond: Optional[QueryLike] = None
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Update if match found, insert otherwise."""
+        return await self.__mutate(
+            "upsert", self.__indexed, self._table.upsert, document, plan(cond)
+        )
+
+    async def remove(
+        self,
+        cond: Optional[QueryLike] = None,
+        doc_ids: Optional[Iterable[Hashable]] = None,
+    ) -> Result[Sequence[Hashable], Exception]:
+        """Remove documents by query or `doc_ids`."""
+        return await self.__mutate(
+            "remove", self.__indexed, self._table.remove, plan(cond), doc_ids
+        )
+
+    async def truncate(self) -> Result[None, Exception]:
+        """Remove all documents from the table."""
+        return await self.__mutate("truncate", self.__truncate)
+
+    async def count(self, cond: QueryLike) -> Result[int, Exception]:
+        """Return the number of documents matching the query."""
+        return await self.__cached("count", self.__count, cond)
+
+    async def select(
+        self, fields: Union[str, Iterable[str]], cond: Optional[QueryLike] = None
+    ) -> Result[List[Document], Exception]:
+        """Return only `fields` of all documents, or of those matching `cond`.
+
+        Documents keep their IDs and the listed fields they have. The projection
+        is done in the worker thread, so only those fields are copied.
+        """
+        fields = (fields,) if isinstance(fields, str) else tuple(fields)
+        return await self.__cached("select", self.__select, fields, cond)
+
+    async def count_by(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Dict[Any, int], Exception]:
+        """Count the documents, or those matching `cond`, per value of `field`.
+
+        Documents without the field are left out. Like the other aggregates it
+        runs in the worker thread and only returns its result.
+        """
+        return await self.__cached("count_by", self.__count_by, field, cond)
+
+    async def sum(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Any, Exception]:
+        """Return the sum of `field` over the documents that have it, 0 if none."""
+        return await self.__cached("sum", self.__sum, field, cond)
+
+    async def min(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Any, Exception]:
+        """Return the smallest value of `field`, None if no document has it."""
+        return await self.__cached("min", self.__min, field, cond)
+
+    async def max(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[Any, Exception]:
+        """Return the largest value of `field`, None if no document has it."""
+        return await self.__cached("max", self.__max, field, cond)
+
+    async def distinct(
+        self, field: str, cond: Optional[QueryLike] = None
+    ) -> Result[List[Any], Exception]:
+        """Return the distinct values of `field`, in the order they are stored."""
+        return await self.__cached("distinct", self.__distinct, field, cond)
+
+    async def create_index(
+        self, field: str, *, kind: str = "hash"
+    ) -> Result[None, Exception]:
+        """Index a field for `search`, `get`, `contains` and `count`.
+
+        `kind="hash"` answers equality queries, `kind="sorted"` also answers
+        range queries. Indexes are shared by all bridges on the same path and
+        kept up to date by the bridge's mutation methods.
+        """
+        return await self.__write(
+            "create_index", functools.partial(self.__create_index, field, kind)
+        )
+
+    async def drop_index(self, field: str) -> Result[None, Exception]:
+        """Remove the index on a field."""
+        return await self.__write(
+            "drop_index", functools.partial(self.__drop_index, field)
+        )
+
+    async def clear_cache(self) -> Result[None, Exception]:
+        """Clear the query cache and the bridge's result cache for this table."""
+        return await self.__write("clear_cache", self._table.clear_cache)
+
+    def subscribe(
+        self, cond: Optional[QueryLike] = None, *, maxsize: int = 100
+    ) -> Subscription:
+        """Receive the changes made to this table through bridges on its path.
+
+        Every `insert`, `insert_multiple`, `update`, `update_multiple`, `upsert`,
+        `remove`, `truncate` and `import_ndjson` is published as a `Change` once
+        it has been written; those of a transaction once it commits. With `cond`,
+        only changes to matching documents are delivered: their new state is
+        matched, or their last one for removals. Up to `maxsize` changes are
+        queued, see `Subscription`.
+        """
+        if self._feed is None:
+            raise RuntimeError(f"Table {self.name!r} does not publish changes")
+        return self._feed.subscribe(self.name, plan(cond), maxsize)
+
+
+class AIOTable(_TableOperations):
+    """
+    Async-safe proxy for a single TinyDB table.
+
+    Returned by `AIOBridge.table`, and used by the bridge itself for its default
+    table. Every method runs the TinyDB operation through the owning bridge, so
+    it shares the bridge's locks, executor and timeouts, and returns a `Result`.
+    """
+
+    @property
+    def table(self) -> Table:
+        """Return the underlying `Table` instance."""
+        return self._table
@@ -0,0 +1,91 @@
+# Transaction implementation
+
+import asyncio
+from typing import Callable, Dict, Optional, TypeVar
+
+from result import Err, Ok, Result
+from tinydb import TinyDB
+
+from .changes import ChangeFeed
+from .indexes import TableIndexes
+from .table import AIOTable, Runner, _TableOperations
+
+T = TypeVar("T")
+
+
+class Transaction(_TableOperations):
+    """
+    Table API of a running `AIOBridge.transaction`.
+
+    Methods act on the default table, `table` gives access to the others. All
+    operations see the transaction's own writes, which are staged in memory and
+    reach the storage in a single write when the `async with` block ends without
+    an exception. Raising, or calling `rollback`, discards them instead.
+
+    Operations run one at a time, in the order they were called. Once one of
+    them times out the transaction is rolled back, and every later operation
+    returns the same error.
+    """
+
+    def __init__(
+        self,
+        db: TinyDB,
+        indexes: Dict[str, TableIndexes],
+        run: Runner,
+        feed: Optional[ChangeFeed] = None,
+    ):
+        """Initialize Transaction.
+
+        Args:
+            db (TinyDB): The bridge's TinyDB instance.
+            indexes (Dict[str, TableIndexes]): Index registry of the bridge's path.
+            run (Callable): Runs an operation against the staged state.
+            feed (ChangeFeed, optional): Feed holding changes back until commit.
+        """
+        super().__init__(
+            db.table(db.default_table_name),
+            indexes,
+            read=self.__run,
+            write=self.__run,
+            commit=self.__run,
+            feed=feed,
+        )
+        self._db = db
+        self.__runner = run
+        self.__gate = asyncio.Lock()
+        self.__error: Optional[Exception] = None
+        self.__rollback = False
+        self.__tables: Dict[str, AIOTable] = {}
+
+    async def __run(self, method: str, fn: Callable[[], T]) -> Result[T, Exception]:
+        async with self.__gate:
+            if self.__error is not None:
+                return Err(self.__error)
+            result = await self.__runner(method, fn)
+            if result.is_err() and isinstance(result.err(), asyncio.TimeoutError):
+                self.__error = result.err()
+            return result
+
+    @property
+    def rolled_back(self) -> bool:
+        """Whether the staged writes will be discarded."""
+        return self.__rollback or self.__error is not None
+
+    async def table(self, name: str, **kwargs) -> Result[AIOTable, Exception]:
+        """Access or create a table by name, within the transaction."""
+
+        table = self.__tables.get(name)
+        if table is None:
+            table = self.__tables[name] = AIOTable(
+                self._db.table(name, **kwargs),
+                self._indexes,
+                read=self.__run,
+                write=self.__run,
+                commit=self.__run,
+                feed=self._feed,
+            )
+        return Ok(table)
+
+    def rollback(self):
+        """Discard the staged writes when the transaction ends."""
+        self.__rollback = True
@@ -0,0 +1,193 @@
+# Internal helpers shared by the bridge and its table proxies
+
+import threading
+from typing import cast
+
+from tinydb import TinyDB
+from tinydb.middlewares import CachingMiddleware
+from tinydb.storages import MemoryStorage, Storage
+from tinydb.table import Table
+from tinydb.utils import LRUCache
+
+from .storages import AppendLogStorage, _CopyOnAccess
+
+
+class LockedLRUCache(LRUCache):
+    """TinyDB query cache that tolerates lookups from parallel reader threads."""
+
+    def __init__(self, capacity=None):
+        super().__init__(capacity)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            return super().get(key, default)
+
+    def set(self, key, value):
+        with self._lock:
+            super().set(key, value)
+
+    def clear(self):
+        with self._lock:
+            super().clear()
+
+
+def guard_query_cache(table: Table):
+    """Make a table's query cache safe to use from several threads at once."""
+    if not isinstance(table._query_cache, LockedLRUCache):
+        table._query_cache = LockedLRUCache(table._query_cache.capacity)
+
+
+def cache_writes(db: TinyDB):
+    """Put a `CachingMiddleware` in front of the storage, unless it has one."""
+
+    if isinstance(db.storage, CachingMiddleware):
+        return
+    middleware = CachingMiddleware(type(db.storage))
+    middleware.storage = db.storage
+    # Middlewares stand in for storages without deriving from `Storage`.
+    storage = cast(Storage, middleware)
+    db._storage = storage
+    for table in db._tables.values():
+        table._storage = storage
+
+
+def serialize_storage(storage: Storage):
+    """
+    Make a storage safe to use from several threads at once.
+
+    File based storages seek, read and write a single handle, so storage reads
+    and writes are serialized; evaluating queries still happens in parallel.
+    """
+
+    read, write = storage.read, storage.write
+    lock = threading.Lock()
+
+    def locked_read():
+        with lock:
+            return read()
+
+    def locked_write(data):
+        with lock:
+            write(data)
+
+    storage.read = locked_read  # type: ignore[method-assign]
+    storage.write = locked_write  # type: ignore[method-assign]
+
+
+def in_memory(storage: Storage, write: bool) -> bool:
+    """
+    Tell whether an operation on `storage` can complete without disk I/O.
+
+    True for `MemoryStorage`, and for reads from a `CachingMiddleware` whose
+    cache is loaded or from an `AppendLogStorage`, which keeps its data in memory.
+    """
+
+    if isinstance(storage, MemoryStorage):
+        return True
+    if write:
+        return False
+    if isinstance(storage, CachingMiddleware):
+        return storage.cache is not None
+    return isinstance(storage, AppendLogStorage)
+
+
+def reload_db(db: TinyDB):
+    """Drop everything a TinyDB instance caches about its storage."""
+
+    storage = db.storage
+    if isinstance(storage, CachingMiddleware):
+        storage.cache = None
+        storage._cache_modified_count = 0
+    for table in db._tables.values():
+        table.clear_cache()
+        table._next_id = None
+
+
+class WriteBuffer:
+    """
+    Defer storage writes so that several operations end up in one flush.
+
+    While active, the storage's `read`/`write` methods are shadowed on the
+    instance: the first read is served from the storage and cached, every
+    following read returns the cached state and writes only replace it.
+    `commit` performs the single real write. Must only be used from the
+    thread that holds the write lock; readers of other tables running at the
+    same time are served the buffered state.
+    """
+
+    def __init__(self, storage: Storage):
+        self._storage = storage
+        self._lock = threading.Lock()
+        self._data = None
+        self._loaded = False
+        self._dirty = False
+
+    def __enter__(self):
+        self._saved = {
+            name: self._storage.__dict__.get(name) for name in ("read", "write")
+        }
+        self._read = self._storage.read
+        self._write = self._storage.write
+        self._storage.read = self.read
+        self._storage.write = self.write
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for name, method in self._saved.items():
+            if method is None:
+                del self._storage.__dict__[name]
+            else:
+                self._storage.__dict__[name] = method
+
+    def read(self):
+        with self._lock:
+            if not self._loaded:
+                self._data = self._read()
+                self._loaded = True
+            return self._data
+
+    def write(self, data):
+        with self._lock:
+            self._data = data
+            self._loaded = True
+            self._dirty = True
+
+    @property
+    def data(self):
+        """The buffered database state, or None if nothing was read yet."""
+        return self._data
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the storage has been read, so reads no longer touch it."""
+        return self._loaded
+
+    def commit(self):
+        """Write the buffered state to the storage, if anything changed."""
+        if self._dirty:
+            self._write(self._data)
+            self._dirty = False
+
+
+class StagingBuffer(WriteBuffer):
+    """
+    A `WriteBuffer` whose changes can be thrown away.
+
+    Storages that keep their data in memory hand out the live tables, which
+    TinyDB updates in place. Tables are therefore copied when first looked up,
+    so that nothing reaches the storage unless `commit` is called.
+    """
+
+    def read(self):
+        with self._lock:
+            if not self._loaded:
+                data = self._read()
+                self._data = None if data is None else _CopyOnAccess(data)
+                self._loaded = True
+            return self._data
+
+    def commit(self):
+        if self._dirty:
+            self._write(dict(self._data))
+            self._dirty = False